@@ -1,3 +1,4 @@
+import os
 import threading
 import time
 import sys
@@ -6,6 +7,12 @@ from collections import deque
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
+from urllib.parse import urlencode
+
+from nexo_analytics import ANALYTICS_DB_FILE, HEART_RATE, HRV, BiometricAnalytics
+from nexo_ecg_filter import DEFAULT_CHAIN, EcgFilter
+from nexo_ecg_store import EcgSampleStore
+from nexo_stream import ECG_APP_STREAM_PORT, BiometricStreamServer, origin_of
 
 # Plotting
 import matplotlib
@@ -28,6 +35,17 @@ SAMPLE_INTERVAL = 0.01
 BUFFER_SECONDS = 10
 REMINDER_INTERVAL_SEC = 20 * 60
 APP_LINK = "https://6000-firebase-studio-1758901258057.cluster-cz5nqyh5nreq6ua6gaqd7okl7o.cloudworkstations.dev/dashboard"
+STREAM_PORT = ECG_APP_STREAM_PORT   # live ECG/BPM/HRV for the dashboard (nexo_stream.py); None = off
+STREAM_ALLOWED_ORIGINS = [origin_of(APP_LINK)]   # browser pages allowed to read the stream
+HRV_BEATS = 30          # RR intervals used for the HRV (RMSSD)
+SESSION_DIR = "ecg_sessions"   # every session is kept on disk (nexo_ecg_store.py)
+MIN_VIEW_SECONDS = 1
+ZOOM_STEP = 1.5
+ECG_SAMPLE_RATE = None         # Hz of the Arduino sketch; None = measured from the samples
+FILTER_CHAIN = DEFAULT_CHAIN   # high-pass / notch / low-pass, see nexo_ecg_filter.py; () = raw ADC
+FILTER_BLOCK = 8               # samples filtered together
+FILTER_OFFSET = 512            # the filtered signal is centred on ADC mid-scale
+ANALYTICS_DB = ANALYTICS_DB_FILE   # BPM/HRV history shared with Nexo (nexo_analytics.py); None = off
 # --------------------------
 
 class SerialReader(threading.Thread):
@@ -90,6 +108,10 @@ class ECGApp:
         self.timestamps = deque(maxlen=self.maxlen)
         self.values = deque(maxlen=self.maxlen)
         self.peak_timestamps = deque()
+        self.ecg_filter = EcgFilter(ECG_SAMPLE_RATE, FILTER_CHAIN)
+        self.analytics = BiometricAnalytics(ANALYTICS_DB) if ANALYTICS_DB else None
+        self._block_values = []
+        self._block_times = []
 
         # Serial port UI
         top = ttk.Frame(root, padding=8)
@@ -126,6 +148,26 @@ class ECGApp:
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         self.canvas = canvas
 
+        # Whole session on disk; the plot shows a window of it (pan/zoom)
+        self.store = EcgSampleStore(os.path.join(SESSION_DIR, time.strftime("%Y%m%d-%H%M%S")))
+        self.view_span = BUFFER_SECONDS
+        self.view_end = None            # None = follow the newest sample
+        self._drag = None
+        canvas.mpl_connect("scroll_event", self.on_scroll)
+        canvas.mpl_connect("button_press_event", self.on_press)
+        canvas.mpl_connect("motion_notify_event", self.on_drag)
+        canvas.mpl_connect("button_release_event", lambda event: setattr(self, "_drag", None))
+
+        nav = ttk.Frame(root, padding=(8, 0))
+        nav.pack(fill=tk.X)
+        ttk.Button(nav, text="<<", width=4, command=lambda: self.pan(-0.5)).pack(side=tk.LEFT)
+        ttk.Button(nav, text=">>", width=4, command=lambda: self.pan(0.5)).pack(side=tk.LEFT, padx=4)
+        ttk.Button(nav, text="Zoom +", command=lambda: self.zoom(1 / ZOOM_STEP)).pack(side=tk.LEFT, padx=4)
+        ttk.Button(nav, text="Zoom -", command=lambda: self.zoom(ZOOM_STEP)).pack(side=tk.LEFT)
+        ttk.Button(nav, text="Live", command=self.go_live).pack(side=tk.LEFT, padx=4)
+        self.view_var = tk.StringVar(value="Live")
+        ttk.Label(nav, textvariable=self.view_var).pack(side=tk.LEFT, padx=8)
+
         # Link UI
         link_frame = ttk.Frame(root, padding=8)
         link_frame.pack(fill=tk.X)
@@ -138,6 +180,12 @@ class ECGApp:
         ttk.Button(root, text="Stop", command=self.stop_app).pack(side=tk.RIGHT, padx=8, pady=4)
 
         self.reader = None
+        self.stream = None
+        if STREAM_PORT:
+            self.stream = BiometricStreamServer(port=STREAM_PORT, allowed_origins=STREAM_ALLOWED_ORIGINS)
+            if not self.stream.start():
+                self.status_var.set(f"Streaming off: port {STREAM_PORT} is in use")
+                self.stream = None
         self.update_plot()
         self.schedule_next_reminder(REMINDER_INTERVAL_SEC)
 
@@ -156,10 +204,25 @@ class ECGApp:
             self.status_var.set(f"Running ({port})")
 
     def on_sample(self, sample):
-        ts = time.time()
-        self.timestamps.append(ts)
-        self.values.append(sample)
-        self.detect_peak(ts, sample)
+        self._block_values.append(sample)
+        self._block_times.append(time.time())
+        if len(self._block_values) >= FILTER_BLOCK:
+            self.process_block()
+
+    def process_block(self):
+        """Filters the queued raw samples; peaks, plot and stream all see the filtered signal."""
+        raw, times = self._block_values, self._block_times
+        self._block_values, self._block_times = [], []
+        filtered = self.ecg_filter.process(raw, times)
+        if self.ecg_filter.active:
+            filtered = filtered + FILTER_OFFSET
+        for ts, value in zip(times, np.rint(filtered).astype(int).tolist()):
+            self.timestamps.append(ts)
+            self.values.append(value)
+            self.store.append(value, ts)
+            if self.stream:
+                self.stream.push_sample(value, ts)
+            self.detect_peak(ts, value)
 
     def detect_peak(self, ts, val):
         if len(self.values) < 5:
@@ -173,22 +236,90 @@ class ECGApp:
                 self.peak_timestamps.popleft()
             bpm = len(self.peak_timestamps) * 60 / max(1, self.peak_timestamps[-1]-self.peak_timestamps[0])
             self.bpm_var.set(f"{int(bpm)}")
+            hrv = self.hrv_rmssd_ms()
+            if self.stream:
+                self.stream.publish_status(bpm=int(bpm), hrv_rmssd_ms=hrv)
+            if self.analytics:
+                # sampled to one reading per RECORD_EVERY_SEC by the analytics store
+                self.analytics.record(HEART_RATE, round(bpm, 1), ts=ts)
+                if hrv is not None:
+                    self.analytics.record(HRV, hrv, ts=ts)
             if bpm > 110:
                 self.show_quick_suggestion(reason=f"High heart rate: {int(bpm)} BPM")
 
+    def hrv_rmssd_ms(self):
+        """RMSSD of the last HRV_BEATS RR intervals, in ms (None until there are enough beats)."""
+        peaks = np.array(list(self.peak_timestamps)[-(HRV_BEATS + 1):])
+        if len(peaks) < 4:
+            return None
+        rr = np.diff(peaks)
+        return round(float(np.sqrt(np.mean(np.diff(rr) ** 2)) * 1000), 1)
+
     def update_plot(self):
-        if self.timestamps:
-            t0 = self.timestamps[0]
-            xs = np.array(self.timestamps) - t0
-            ys = np.array(self.values)
-            self.ax.set_xlim(max(0, xs[-1]-BUFFER_SECONDS), max(BUFFER_SECONDS, xs[-1]))
-            self.line.set_data(xs, ys)
+        self.store.flush()
+        if self.store.count:
+            t0 = self.store.start_time
+            end = (self.store.end_time if self.view_end is None else self.view_end) - t0
+            start = end - self.view_span
+            # one (min, max) pair per pixel column, drawn as a vertical zig-zag
+            columns = max(100, int(self.ax.get_window_extent().width))
+            ts, lows, highs = self.store.envelope(start + t0, end + t0, columns)
+            self.ax.set_xlim(max(0, start), max(self.view_span, end))
+            self.line.set_data(np.repeat(ts - t0, 2), np.column_stack((lows, highs)).ravel())
         else:
             self.line.set_data([], [])
         self.canvas.draw_idle()
         if self.running:
             self.root.after(int(SAMPLE_INTERVAL*1000), self.update_plot)
 
+    # --- pan / zoom over the whole session ---
+    def _view_end(self):
+        return self.store.end_time if self.view_end is None else self.view_end
+
+    def _set_view(self, end, span):
+        if not self.store.count:
+            return
+        first, last = self.store.start_time, self.store.end_time
+        self.view_span = min(max(span, MIN_VIEW_SECONDS), max(BUFFER_SECONDS, last - first))
+        end = min(max(end, first + self.view_span), last)
+        self.view_end = None if end >= last else end
+        if self.view_end is None:
+            self.view_var.set("Live")
+        else:
+            self.view_var.set(f"{end - first - self.view_span:.1f}-{end - first:.1f} s (of {last - first:.0f} s)")
+
+    def pan(self, fraction):
+        if self.store.count:
+            self._set_view(self._view_end() + fraction * self.view_span, self.view_span)
+
+    def zoom(self, factor, center=None):
+        """Scales the visible span by factor, keeping the time `center` (session seconds) in place."""
+        if not self.store.count:
+            return
+        end = self._view_end()
+        center = end - self.view_span / 2 if center is None else center + self.store.start_time
+        self._set_view(center + (end - center) * factor, self.view_span * factor)
+
+    def go_live(self):
+        self.view_end = None
+        self.view_span = BUFFER_SECONDS
+        self.view_var.set("Live")
+
+    def on_scroll(self, event):
+        if event.xdata is not None:
+            self.zoom(1 / ZOOM_STEP if event.button == "up" else ZOOM_STEP, center=event.xdata)
+
+    def on_press(self, event):
+        if event.button == 1 and event.xdata is not None and self.store.count:
+            self._drag = (event.x, self._view_end())
+
+    def on_drag(self, event):
+        if self._drag is None or event.x is None:
+            return
+        x0, end0 = self._drag
+        seconds_per_pixel = self.view_span / max(1.0, self.ax.get_window_extent().width)
+        self._set_view(end0 - (event.x - x0) * seconds_per_pixel, self.view_span)
+
     def schedule_next_reminder(self, delay_sec):
         self.root.after(int(delay_sec*1000), self.show_reminder_popup)
 
@@ -209,12 +340,20 @@ class ECGApp:
     def open_link_now(self):
         link = self.link_var.get().strip()
         if link:
+            if self.stream:
+                # tell the dashboard where the live data is
+                link += ("&" if "?" in link else "?") + urlencode({"stream": self.stream.url})
             webbrowser.open(link)
 
     def stop_app(self):
         self.running = False
         if self.reader:
             self.reader.stop()
+        if self.stream:
+            self.stream.stop()
+        self.store.close()
+        if self.analytics:
+            self.analytics.close()
         self.root.quit()
 
 
@@ -0,0 +1,129 @@
+"""
+nexo_analytics: ingest cost and query latency over weeks of biometric history.
+
+Fills a temporary database with --days of history ending today: one blink
+rate + stress level per minute (as the video loop records them) and heart
+rate / HRV readings every second from the ECG (sampled down by
+RECORD_EVERY_SEC). Then times the questions Nexo gets asked:
+
+ yesterday  : summary() of yesterday's day rollups
+ week_hours : series() of the hourly blink rate over the last 7 days
+ context    : history_context("how stressed was I yesterday") - the whole
+              '[Biometric history]' line the LLM gets
+ json_scan  : the old way - load a stress_detection_log.json holding the
+              same minutes and filter yesterday's events in Python
+
+Run:  python benchmarks/bench_analytics.py [--days 30]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_analytics import HEART_RATE, HRV, BiometricAnalytics
+
+
+def timed(fn, repeat=200):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return round((time.perf_counter() - start) / repeat * 1000, 4), result
+
+
+def stress_for(blink_rate):
+    if blink_rate < 12:
+        return "High Stress"
+    if blink_rate > 25:
+        return "Moderate Stress"
+    return "Normal"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--ecg-hours-per-day", type=float, default=2.0,
+                        help="hours per day the ECG monitor is running")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    today = date.today()
+    first = datetime.combine(today - timedelta(days=args.days - 1), datetime.min.time()).timestamp()
+    minutes = args.days * 1440
+
+    workdir = tempfile.mkdtemp(prefix="nexo-analytics-")
+    try:
+        analytics = BiometricAnalytics(os.path.join(workdir, "analytics.db"))
+        json_events = []
+        minute_sec = ecg_sec = 0.0
+        ecg_calls = ecg_stored = 0
+        ecg_seconds = int(args.ecg_hours_per_day * 3600)
+        for m in range(minutes):
+            ts = first + m * 60
+            blink_rate = max(0, int(rng.gauss(18, 6)))
+            level = stress_for(blink_rate)
+            start = time.perf_counter()
+            analytics.record_minute(level, blink_rate, ts=ts)
+            minute_sec += time.perf_counter() - start
+            json_events.append({"timestamp": datetime.fromtimestamp(ts).isoformat(), "stress_level": level,
+                                "blink_rate": blink_rate, "date": datetime.fromtimestamp(ts).strftime("%Y-%m-%d")})
+
+            if m % 1440 == 600:     # the ECG session, from 10:00 every day
+                start = time.perf_counter()
+                for s in range(ecg_seconds):
+                    ecg_stored += analytics.record(HEART_RATE, rng.gauss(74, 8), ts=ts + s)
+                    ecg_stored += analytics.record(HRV, rng.gauss(42, 9), ts=ts + s)
+                ecg_calls += 2 * ecg_seconds
+                ecg_sec += time.perf_counter() - start
+
+        json_path = os.path.join(workdir, "stress_detection_log.json")
+        with open(json_path, "w") as f:
+            json.dump({"stress_events": json_events}, f, indent=4)
+
+        yesterday = today - timedelta(days=1)
+        week_start = today - timedelta(days=6)
+
+        def json_scan():
+            with open(json_path) as f:
+                events = json.load(f)["stress_events"]
+            day = yesterday.isoformat()
+            picked = [e for e in events if e["date"] == day]
+            return len(picked)
+
+        yesterday_ms, summary = timed(lambda: analytics.summary(yesterday, yesterday))
+        week_ms, series = timed(lambda: analytics.series("blink_rate", week_start, today))
+        context_ms, context = timed(lambda: analytics.history_context("how stressed was I yesterday"))
+        scan_ms, _ = timed(json_scan, repeat=3)
+        analytics.close()
+        disk_mb = sum(os.path.getsize(os.path.join(workdir, f)) for f in os.listdir(workdir)
+                      if f.startswith("analytics")) / 2 ** 20
+
+        report = {
+            "days": args.days,
+            "minutes_recorded": minutes,
+            "ecg_readings_offered": ecg_calls,
+            "ecg_readings_stored": ecg_stored,
+            "record_minute_us": round(minute_sec / minutes * 1e6, 1),
+            "record_ecg_us": round(ecg_sec / max(1, ecg_calls) * 1e6, 2),
+            "db_mb": round(disk_mb, 1),
+            "json_mb": round(os.path.getsize(json_path) / 2 ** 20, 1),
+            "query_ms": {
+                "yesterday": yesterday_ms,
+                "week_hours": week_ms,
+                "context": context_ms,
+                "json_scan": scan_ms,
+            },
+            "week_hour_buckets": len(series),
+            "yesterday_minutes": sum(v["count"] for k, v in summary.items() if k.startswith("stress:")),
+            "context": context,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(report, indent=4))
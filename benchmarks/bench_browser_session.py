@@ -0,0 +1,98 @@
+"""
+Cold-start vs warm BrowserSession benchmark (headless Chromium, local pages).
+
+ cold : what execute_pc_command used to do - launch webdriver.Chrome on
+        "open", driver.quit() on "close browser", repeat.
+ warm : nexo_browser.BrowserSession - prelaunched once, then open_url/hide
+        cycles on the same driver.
+
+Needs selenium and a Chrome/Chromium install (Selenium Manager finds the
+driver). Pages are served from a temporary directory by http.server.
+
+Run:  python benchmarks/bench_browser_session.py [--cycles 5] [--driver PATH]
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from nexo_browser import BrowserSession
+
+PAGE = "<html><head><title>Nexo bench</title></head><body><button id='play'>Play</button></body></html>"
+
+
+def start_static_server(directory):
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=directory)
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def cold_cycles(url, cycles, driver_path):
+    timings = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        service = Service(executable_path=driver_path) if driver_path else Service()
+        driver = webdriver.Chrome(service=service, options=options)
+        driver.get(url)
+        timings.append(time.perf_counter() - start)
+        driver.quit()
+    return timings
+
+
+def warm_cycles(url, cycles, driver_path, profile_dir):
+    session = BrowserSession(driver_path, profile_dir=profile_dir, headless=True)
+    start = time.perf_counter()
+    session.prelaunch().result()
+    prelaunch_sec = time.perf_counter() - start
+
+    timings = []
+    for _ in range(cycles):
+        start = time.perf_counter()
+        session.open_url(url).result()
+        timings.append(time.perf_counter() - start)
+        session.hide().result()
+    session.shutdown()
+    return prelaunch_sec, timings
+
+
+def summary(timings):
+    return {"mean_ms": round(1000 * sum(timings) / len(timings), 1),
+            "max_ms": round(1000 * max(timings), 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--driver", default=None, help="chromedriver path (default: Selenium Manager)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site_dir, tempfile.TemporaryDirectory() as profile_dir:
+        with open(os.path.join(site_dir, "index.html"), "w") as f:
+            f.write(PAGE)
+        server = start_static_server(site_dir)
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+        cold = cold_cycles(url, args.cycles, args.driver)
+        prelaunch_sec, warm = warm_cycles(url, args.cycles, args.driver, profile_dir)
+        server.shutdown()
+
+    print(json.dumps({
+        "cycles": args.cycles,
+        "cold_open": summary(cold),
+        "warm_prelaunch_ms": round(1000 * prelaunch_sec, 1),
+        "warm_open": summary(warm),
+    }, indent=4))
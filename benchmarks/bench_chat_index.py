@@ -0,0 +1,173 @@
+"""
+nexo_chat_index: indexing cost and query latency over a long chat history.
+
+Builds a synthetic history of --messages messages (user questions and Nexo
+replies on recurring topics, Zipf-distributed words), indexes it in one sync() and then times:
+
+ sync_turn     : indexing one new turn (2 messages), as save_chat_history does
+ reopen        : opening the index again (stored vectors -> IVF lists)
+ keyword       : FTS5 BM25 top-k
+ vector_ivf    : IVF top-k (--nprobe lists)
+ vector_exact  : brute force over every vector, for comparison
+ recall        : keyword + vector + fusion + fetching the turns (what nexo_brain pays)
+
+Queries are a few words picked from a random older user message;
+'found_rate' is how often that message's turn comes back from recall(), and
+'ivf_recall_at_10' how many of the exact top 10 the IVF search also returns.
+'prompt_chars' compares sending the whole history with the recent window
+plus the recalled turns.
+
+Run:  python benchmarks/bench_chat_index.py [--messages 100000] [--queries 300] [--k 3]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from nexo_chat_index import IVF_NPROBE, ChatIndex, recent_window_start
+from nexo_prompt import build_recall_context
+
+OPENERS = ["can you tell me about", "what do you know about", "explain", "remind me what you said about",
+           "give me an example of", "why does", "how do I get better at", "teach me"]
+SYLLABLES = "ka lo mi ne ru sa ti vo ze pa bel dor fin gar hul jen kor lum mar nis por quil ras sen tor vim".split()
+
+
+def make_vocabulary(size, rng):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words)
+
+
+def synthetic_history(n, rng, vocabulary=20_000, topics=2_000):
+    """User questions and replies; words are Zipf distributed like real text, topics recur."""
+    words = make_vocabulary(vocabulary, rng)
+    rng.shuffle(words)
+    cum_weights, total = [], 0.0
+    for rank in range(1, len(words) + 1):
+        total += 1.0 / rank
+        cum_weights.append(total)
+    topic_names = [" ".join(rng.sample(words[len(words) // 4:], 2)) for _ in range(topics)]
+    history = []
+    while len(history) < n:
+        topic = rng.choice(topic_names)
+        question = f"{rng.choice(OPENERS)} {topic} " + " ".join(rng.choices(words, cum_weights=cum_weights, k=6))
+        answer = f"{topic.capitalize()}: " + " ".join(rng.choices(words, cum_weights=cum_weights, k=25)) + "."
+        history.append({"role": "user", "parts": [{"text": question}]})
+        history.append({"role": "model", "parts": [{"text": answer}]})
+    return history[:n]
+
+
+def percentiles(samples_ms):
+    samples_ms = sorted(samples_ms)
+    return {"p50": round(samples_ms[len(samples_ms) // 2], 3),
+            "p99": round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))], 3)}
+
+
+def timed_each(fn, queries):
+    times, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(fn(query))
+        times.append((time.perf_counter() - start) * 1000)
+    return percentiles(times), results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--recent", type=int, default=20)
+    parser.add_argument("--nprobe", type=int, default=IVF_NPROBE)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    history = synthetic_history(args.messages + 2 * 100, rng)
+    base, extra_turns = history[:args.messages], history[args.messages:]
+
+    workdir = tempfile.mkdtemp(prefix="nexo-chat-index-")
+    path = os.path.join(workdir, "chat_index.db")
+    try:
+        index = ChatIndex(path)
+        start = time.perf_counter()
+        index.sync(base)
+        bulk_sec = time.perf_counter() - start
+
+        turn_ms = []
+        grown = list(base)
+        for i in range(0, len(extra_turns), 2):
+            grown.extend(extra_turns[i:i + 2])
+            start = time.perf_counter()
+            index.sync(grown)
+            turn_ms.append((time.perf_counter() - start) * 1000)
+        index.close()
+
+        start = time.perf_counter()
+        index = ChatIndex(path)
+        reopen_sec = time.perf_counter() - start
+        index.ivf.nprobe = args.nprobe
+
+        before = recent_window_start(len(grown), args.recent)
+        sources = [rng.randrange(0, before, 2) for _ in range(args.queries)]
+        queries = []
+        for source in sources:
+            words = grown[source]['parts'][0]['text'].split()[-8:]     # topic + question words
+            queries.append(" ".join(rng.sample(words, 4)))
+
+        keyword, _ = timed_each(lambda q: index.keyword_search(q, args.k, before), queries)
+        vector_ivf, ivf_hits = timed_each(lambda q: index.ivf.search(index.embed(q), 10, before), queries)
+
+        ivf = index.ivf
+        all_vectors = ivf.vectors(slice(0, ivf.size))
+
+        def exact(q):
+            scores = all_vectors @ np.asarray(index.embed(q), dtype=np.float32)
+            scores[ivf.ids[:ivf.size] > before] = -np.inf
+            top = np.argpartition(scores, -10)[-10:]
+            return [int(ivf.ids[i]) for i in top[np.argsort(-scores[top])]]
+
+        vector_exact, exact_hits = timed_each(exact, queries)
+        recall, recalled = timed_each(lambda q: index.recall(q, args.k, before), queries)
+
+        overlap = [len({i for i, _ in got} & set(want)) / len(want) for got, want in zip(ivf_hits, exact_hits)]
+        source_texts = [grown[s]['parts'][0]['text'] for s in sources]
+        found = [any(m['parts'][0]['text'] == text for m in turns) for text, turns in zip(source_texts, recalled)]
+        full_chars = sum(len(m['parts'][0]['text']) for m in grown)
+        window_chars = sum(len(m['parts'][0]['text']) for m in grown[before:])
+        recalled_chars = sum(len(build_recall_context(turns)) for turns in recalled) / len(recalled)
+
+        report = {
+            "messages": len(grown),
+            "ivf_lists": ivf.nlist,
+            "ivf_nprobe": ivf.nprobe,
+            "bulk_index_sec": round(bulk_sec, 2),
+            "bulk_index_us_per_message": round(bulk_sec / len(base) * 1e6, 1),
+            "sync_turn_ms": percentiles(turn_ms),
+            "reopen_sec": round(reopen_sec, 3),
+            "db_mb": round(sum(os.path.getsize(os.path.join(workdir, f)) for f in os.listdir(workdir)) / 2 ** 20, 1),
+            "query_ms": {
+                "keyword": keyword,
+                "vector_ivf": vector_ivf,
+                "vector_exact": vector_exact,
+                "recall": recall,
+            },
+            "ivf_recall_at_10": round(sum(overlap) / len(overlap), 3),
+            "found_rate": round(sum(found) / len(found), 3),
+            "prompt_chars": {
+                "whole_history": full_chars,
+                "recent_window_plus_recalled": round(window_chars + recalled_chars),
+            },
+        }
+        index.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,313 @@
+"""
+End-to-end benchmark of the real Nexo loops with simulated devices (fakes.py).
+
+ ecg    : ecg_data_reader_thread reading a synthetic ECG from a pty
+          -> samples/s and line latency (emitter write -> handle_ecg_line)
+ video  : main_video_and_car_loop on a video file (or synthetic face frames),
+          headless, with a pty Arduino car; presses 'f' to follow a target
+          -> displayed fps, frame interval, car commands received
+ voice  : voice_assistant_loop with a WAV microphone, scripted transcripts,
+          silent TTS and a stub Ollama server
+          -> time to first listen (greeting + mic calibration), per-turn
+             latency (transcript -> spoken reply), LLM calls, cache hits
+ ecgapp : ECGFEELU's ECGApp (Tk window withdrawn) fed by the synthetic ECG
+          -> samples/s, on_sample cost, plot redraw cost, detected BPM
+          (needs a display; on a server use `xvfb-run`)
+
+Every scenario runs in its own process from a temporary working directory
+(chat history and response cache files land there). A scenario whose
+dependencies are missing reports "skipped" instead of failing the suite.
+
+Run:  python benchmarks/bench_e2e.py [--seconds 10] [--ecg-hz 250] [--video clip.mp4]
+                                     [--only ecg,voice] [--output results.json]
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, REPO_DIR)
+
+SCENARIOS = ("ecg", "video", "voice", "ecgapp")
+
+VOICE_SCRIPT = [
+    "what is a good way to calm down",
+    "tell me something nice",
+    "what is a good way to calm down",    # answered from the response cache
+    "open youtube",
+    "goodbye nexo",
+]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * q))], 3) if values else None
+
+
+def import_nexo():
+    """Imports test.py (the assistant) with the state store reset."""
+    nexo = importlib.import_module("test")
+    from nexo_state import BiometricStateStore
+    nexo.STATE = BiometricStateStore()
+    return nexo
+
+
+# --- scenarios (run in a child process) ---
+
+def run_ecg(args):
+    from fakes import SyntheticEcgEmitter
+    nexo = import_nexo()
+    emitter = SyntheticEcgEmitter(args.ecg_hz)
+    nexo.ECG_SERIAL_PORT = emitter.port
+
+    latencies = []
+    handle = nexo.handle_ecg_line
+
+    def measured(line):
+        received = time.monotonic()
+        handle(line)
+        try:
+            latency = emitter.latency_ms(int(line.split(b",")[1]), received)
+        except (IndexError, ValueError):
+            return
+        if latency is not None:
+            latencies.append(latency)
+
+    nexo.handle_ecg_line = measured
+    if not nexo.init_ecg_serial():
+        return {"error": "could not open the ECG pty"}
+    reader = threading.Thread(target=nexo.ecg_data_reader_thread, daemon=True)
+    reader.start()
+    emitter.start()
+    time.sleep(args.seconds)
+    nexo.STATE.request_shutdown()
+    emitter.close()
+    reader.join(timeout=2)
+
+    return {
+        "target_hz": args.ecg_hz,
+        "samples_sent": len(emitter.sent_at),
+        "samples_handled": len(latencies),
+        "throughput_hz": round(len(latencies) / args.seconds, 1),
+        "latency_ms_p50": percentile(latencies, 0.5),
+        "latency_ms_p99": percentile(latencies, 0.99),
+        "latency_ms_max": percentile(latencies, 1.0),
+    }
+
+
+def run_video(args):
+    import cv2
+    import numpy as np
+    from fakes import HeadlessCv2, PtyArduinoCar, VideoFileCamera
+    nexo = import_nexo()
+
+    camera = VideoFileCamera(cv2, np, args.video, fps=args.fps)
+    height, width = camera.frames[0].shape[:2]
+    roi = tuple(int(v) for v in args.roi.split(",")) if args.roi else (width // 2 - 90, height // 2 - 105, 180, 210)
+    headless = HeadlessCv2(cv2, keys={int(args.fps * 2): "f"}, roi=roi)
+    car = PtyArduinoCar()
+    nexo.cv2 = headless
+    nexo.open_camera = lambda: camera
+    nexo.CAR_SERIAL_PORT = car.port
+
+    start = time.monotonic()
+    threading.Timer(args.seconds, nexo.STATE.request_shutdown).start()
+    nexo.main_video_and_car_loop()
+    car.close()
+
+    shown = headless.shown
+    intervals = [(b - a) * 1000 for a, b in zip(shown, shown[1:])]
+    loop_sec = (shown[-1] - shown[0]) if len(shown) > 1 else 0.0
+    moves = [command for _, command in car.commands if command.startswith("M,")]
+    return {
+        "source": args.video or "synthetic",
+        "camera_fps": args.fps,
+        "startup_sec": round(shown[0] - start, 3) if shown else None,
+        "frames_shown": len(shown),
+        "display_fps": round((len(shown) - 1) / loop_sec, 1) if loop_sec else None,
+        "frame_interval_ms_p50": percentile(intervals, 0.5),
+        "frame_interval_ms_p95": percentile(intervals, 0.95),
+        "car_commands": len(car.commands),
+        "car_move_commands": len(moves),
+        "car_last_commands": [command for _, command in car.commands[-3:]],
+    }
+
+
+def run_voice(args):
+    import speech_recognition as sr
+    from fakes import FakeBrowser, SilentTTS, StubLLMServer, WavMicrophone, write_tone_wav
+    nexo = import_nexo()
+
+    wav = write_tone_wav(os.path.join(os.getcwd(), "utterance.wav"), silence=1.2)
+    mic = WavMicrophone(sr, wav, VOICE_SCRIPT)
+    tts = SilentTTS()
+    llm = StubLLMServer(latency_sec=args.llm_latency)
+    browser = FakeBrowser()
+    nexo.sr = mic
+    nexo.pyttsx3 = tts
+    nexo.BROWSER_SESSION = browser
+    nexo.USE_OLLAMA = True
+    nexo.OLLAMA_API_URL = llm.url
+    # Partial transcripts would consume the scripted ones (see bench_speculative_llm.py)
+    nexo.SPECULATOR = None
+
+    start = time.monotonic()
+    loop_started = time.perf_counter() - nexo.STARTUP_PROFILE.t0
+    nexo.voice_assistant_loop()
+    total = time.monotonic() - start
+    first_listen = nexo.STARTUP_PROFILE.elapsed("first_listen")
+    llm.close()
+
+    turns = []
+    for heard_at, text in mic.recognized:
+        replies = [(t, said) for t, said in tts.spoken if t >= heard_at]
+        latency = (replies[0][0] - heard_at) * 1000 if replies else None
+        turns.append({"heard": text, "reply_latency_ms": None if latency is None else round(latency, 1)})
+    return {
+        "first_listen_ms": None if first_listen is None else round((first_listen - loop_started) * 1000, 1),
+        "turns": turns,
+        "llm_requests": len(llm.requests),
+        "llm_stub_latency_ms": args.llm_latency * 1000,
+        "urls_opened": browser.opened,
+        "total_sec": round(total, 2),
+    }
+
+
+def run_ecgapp(args):
+    if sys.platform.startswith("linux") and not os.environ.get("DISPLAY"):
+        return {"skipped": "no display (run under xvfb-run)"}
+    import tkinter as tk
+    import ECGFEELU
+    from fakes import SyntheticEcgEmitter
+
+    emitter = SyntheticEcgEmitter(args.ecg_hz, heart_rate=args.heart_rate)
+    root = tk.Tk()
+    root.withdraw()
+    app = ECGFEELU.ECGApp(root)
+
+    sample_us, plot_ms, suggestions = [], [], []
+    on_sample, update_plot = app.on_sample, app.update_plot
+
+    def timed_sample(sample):
+        start = time.perf_counter()
+        on_sample(sample)
+        sample_us.append((time.perf_counter() - start) * 1e6)
+
+    def timed_plot():
+        start = time.perf_counter()
+        update_plot()
+        plot_ms.append((time.perf_counter() - start) * 1000)
+
+    app.on_sample = timed_sample
+    app.update_plot = timed_plot
+    app.show_quick_suggestion = lambda reason="": suggestions.append(reason)
+    app.port_var.set(emitter.port)
+    app.toggle_connect()
+    emitter.start()
+    root.after(int(args.seconds * 1000), app.stop_app)
+    root.mainloop()
+    emitter.close()
+    root.destroy()
+
+    return {
+        "target_hz": args.ecg_hz,
+        "samples_sent": len(emitter.sent_at),
+        "samples_ingested": len(sample_us),
+        "throughput_hz": round(len(sample_us) / args.seconds, 1),
+        "on_sample_us_p50": percentile(sample_us, 0.5),
+        "on_sample_us_p99": percentile(sample_us, 0.99),
+        "plot_updates": len(plot_ms),
+        "plot_ms_p50": percentile(plot_ms, 0.5),
+        "plot_ms_p95": percentile(plot_ms, 0.95),
+        "true_bpm": args.heart_rate,
+        "shown_bpm": app.bpm_var.get(),
+        "high_bpm_suggestions": len(suggestions),
+    }
+
+
+RUNNERS = {"ecg": run_ecg, "video": run_video, "voice": run_voice, "ecgapp": run_ecgapp}
+
+
+def run_child(args):
+    os.chdir(args.workdir)
+    try:
+        result = RUNNERS[args.scenario](args)
+    except ImportError as e:
+        result = {"skipped": f"missing dependency: {e.name or e}"}
+    with open(args.result_file, "w") as f:
+        json.dump(result, f)
+
+
+def run_suite(args, passthrough):
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seconds": args.seconds,
+        },
+    }
+    scenarios = args.only.split(",") if args.only else SCENARIOS
+    for scenario in scenarios:
+        with tempfile.TemporaryDirectory(prefix=f"nexo-e2e-{scenario}-") as workdir:
+            result_file = os.path.join(workdir, "result.json")
+            command = [sys.executable, os.path.abspath(__file__), "--scenario", scenario,
+                       "--workdir", workdir, "--result-file", result_file] + passthrough
+            start = time.monotonic()
+            try:
+                proc = subprocess.run(command, capture_output=True, text=True, timeout=args.seconds * 3 + 60)
+            except subprocess.TimeoutExpired:
+                report[scenario] = {"error": "timed out"}
+                continue
+            if os.path.exists(result_file):
+                with open(result_file) as f:
+                    report[scenario] = json.load(f)
+            else:
+                report[scenario] = {"error": f"exit code {proc.returncode}", "stderr": proc.stderr[-2000:]}
+            report[scenario]["wall_sec"] = round(time.monotonic() - start, 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--ecg-hz", type=float, default=250.0)
+    parser.add_argument("--heart-rate", type=float, default=72.0)
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--roi", default=None, help="target box x,y,w,h to follow in --video")
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--llm-latency", type=float, default=0.15)
+    parser.add_argument("--only", default=None, help=f"comma separated subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--output", default=None, help="also write the JSON report here")
+    # internal: one scenario in a child process
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_child(args)
+        sys.exit(0)
+
+    passthrough = ["--seconds", str(args.seconds), "--ecg-hz", str(args.ecg_hz),
+                   "--heart-rate", str(args.heart_rate), "--fps", str(args.fps),
+                   "--llm-latency", str(args.llm_latency)]
+    if args.video:
+        passthrough += ["--video", os.path.abspath(args.video)]
+    if args.roi:
+        passthrough += ["--roi", args.roi]
+    report = run_suite(args, passthrough)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
@@ -0,0 +1,102 @@
+"""
+Streaming ECG filter (nexo_ecg_filter.py): throughput, chunking and effect.
+
+throughput : samples/s through the default chain (high-pass, notch,
+             low-pass) on one channel, one core, for several block sizes
+seamless   : max difference between filtering the signal in random-sized
+             chunks and in one call (should be 0)
+peaks      : a synthetic ECG at 72 BPM plus mains hum and baseline wander,
+             run through ECGApp's peak detector raw and filtered
+             -> detected BPM and peak count
+
+Run:  python benchmarks/bench_ecg_filter.py [--hz 500] [--mains 50] [--seconds 60]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import numpy as np
+
+from fakes import ecg_waveform
+from nexo_ecg_filter import DEFAULT_CHAIN, SosStream, design_chain
+
+
+def noisy_ecg(hz, seconds, mains_hz, heart_rate=72.0):
+    rng = np.random.default_rng(0)
+    t = np.arange(int(hz * seconds)) / hz
+    clean = np.array([ecg_waveform(x, heart_rate, noise=3.0) for x in t], dtype=np.float64)
+    hum = 90 * np.sin(2 * np.pi * mains_hz * t)
+    wander = 150 * np.sin(2 * np.pi * 0.15 * t) + 60 * np.sin(2 * np.pi * 0.04 * t + 1.0)
+    return t, np.clip(clean + hum + wander + rng.normal(0, 2, t.size), 0, 1023)
+
+
+def ecgapp_peaks(t, values, maxlen):
+    """ECGApp.detect_peak: mean + 1.2 std over the last `maxlen` samples, 0.3 s refractory."""
+    window = deque(maxlen=maxlen)
+    peaks = []
+    for ts, value in zip(t.tolist(), values.tolist()):
+        window.append(value)
+        if len(window) < 5:
+            continue
+        arr = np.array(window)
+        if value > arr.mean() + 1.2 * arr.std() and (not peaks or ts - peaks[-1] > 0.3):
+            peaks.append(ts)
+    bpm = (len(peaks) - 1) * 60 / (peaks[-1] - peaks[0]) if len(peaks) > 1 else 0.0
+    return len(peaks), round(bpm, 1)
+
+
+def throughput(sos, x, block):
+    stream = SosStream(sos)
+    start = time.perf_counter()
+    for i in range(0, x.size, block):
+        stream.process(x[i:i + block])
+    return x.size / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hz", type=float, default=500.0)
+    parser.add_argument("--mains", type=float, default=50.0)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    args = parser.parse_args()
+
+    chain = tuple((kind, args.mains if kind == "notch" else freq, param) for kind, freq, param in DEFAULT_CHAIN)
+    sos = design_chain(args.hz, chain)
+    t, raw = noisy_ecg(args.hz, args.seconds, args.mains)
+
+    bench_signal = np.tile(raw, max(1, int(2_000_000 / raw.size)))
+    rates = {str(block): round(throughput(sos, bench_signal, block))
+             for block in (1, 8, 64, 512, 4096)}
+
+    whole = SosStream(sos).process(raw)
+    chunked_stream = SosStream(sos)
+    rng = np.random.default_rng(1)
+    pieces, i = [], 0
+    while i < raw.size:
+        n = int(rng.integers(1, 300))
+        pieces.append(chunked_stream.process(raw[i:i + n]))
+        i += n
+    seamless = float(np.max(np.abs(np.concatenate(pieces) - whole)))
+
+    maxlen = int(10 * args.hz)      # ECGApp keeps BUFFER_SECONDS = 10 s
+    raw_count, raw_bpm = ecgapp_peaks(t, raw, maxlen)
+    filtered_count, filtered_bpm = ecgapp_peaks(t, whole + 512, maxlen)
+
+    print(json.dumps({
+        "sample_rate_hz": args.hz,
+        "sections": len(sos),
+        "throughput_samples_per_sec_by_block": rates,
+        "seamless_max_abs_diff": seamless,
+        "peaks": {
+            "true_bpm": 72.0,
+            "raw": {"peaks": raw_count, "bpm": raw_bpm},
+            "filtered": {"peaks": filtered_count, "bpm": filtered_bpm},
+        },
+    }, indent=4))
@@ -0,0 +1,111 @@
+"""
+nexo_ecg_store: ingest cost and envelope query cost over a long session.
+
+Writes --hours of synthetic ECG at --hz into a temporary store the way
+ECGApp does (append() per sample, flush() every GUI tick of --tick-ms), then
+queries windows of 10 s up to the whole session at --columns pixel columns.
+
+"naive" is what update_plot did before: copy every sample in the window into
+arrays and hand them all to the plot, so its real cost is matplotlib drawing
+naive_points lines (seconds for an hour). "pyramid" is store.envelope(),
+which always returns two points per pixel column.
+
+Run:  python benchmarks/bench_ecg_store.py [--hours 1] [--hz 500] [--columns 800]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from nexo_ecg_store import EcgSampleStore
+
+
+def synthetic_ecg(n, hz, rng):
+    t = np.arange(n) / hz
+    phase = (t % (60 / 72)) / (60 / 72)
+    value = 512 + 20 * np.sin(2 * np.pi * 0.3 * t) + 380 * np.exp(-((phase - 0.3) / 0.008) ** 2)
+    return np.clip(value + rng.normal(0, 6, n), 0, 1023).astype(np.int16), t
+
+
+def timed(fn, repeat=20):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--hz", type=float, default=500.0)
+    parser.add_argument("--tick-ms", type=float, default=10.0)
+    parser.add_argument("--columns", type=int, default=800)
+    args = parser.parse_args()
+
+    n = int(args.hours * 3600 * args.hz)
+    values, offsets = synthetic_ecg(n, args.hz, np.random.default_rng(0))
+    t0 = 1_700_000_000.0
+    times = t0 + offsets
+    per_tick = max(1, int(args.hz * args.tick_ms / 1000))
+
+    workdir = tempfile.mkdtemp(prefix="nexo-ecg-store-")
+    try:
+        store = EcgSampleStore(workdir)
+        append_sec = flush_sec = 0.0
+        flush_ms = []
+        value_list, time_list = values.tolist(), times.tolist()
+        for i in range(0, n, per_tick):
+            start = time.perf_counter()
+            for v, ts in zip(value_list[i:i + per_tick], time_list[i:i + per_tick]):
+                store.append(v, ts)
+            mid = time.perf_counter()
+            store.flush()
+            end = time.perf_counter()
+            append_sec += mid - start
+            flush_sec += end - mid
+            flush_ms.append((end - mid) * 1000)
+        store.close()
+        disk_mb = sum(os.path.getsize(os.path.join(workdir, f)) for f in os.listdir(workdir)) / 2 ** 20
+
+        queries = {}
+        duration = times[-1] - times[0]
+        for label, span in (("10s", 10), ("1min", 60), ("10min", 600), ("all", duration)):
+            end = times[-1]
+
+            def naive():
+                i0, i1 = store.index_range(end - span, end)
+                return np.array(times[i0:i1]) - t0, np.array(values[i0:i1])
+
+            naive_ms, (xs, _) = timed(naive)
+            pyramid_ms, (ts, lows, highs) = timed(lambda: store.envelope(end - span, end, args.columns))
+            i0, i1 = store.index_range(end - span, end)
+            queries[label] = {
+                "naive_points": len(xs),
+                "naive_ms": round(naive_ms, 3),
+                "pyramid_points": 2 * len(ts),
+                "pyramid_ms": round(pyramid_ms, 3),
+                "envelope_exact": bool(lows.min() == values[i0:i1].min() and highs.max() == values[i0:i1].max()),
+            }
+
+        flush_ms.sort()
+        report = {
+            "samples": n,
+            "hz": args.hz,
+            "disk_mb": round(disk_mb, 1),
+            "append_us_per_sample": round(append_sec / n * 1e6, 3),
+            "flush_us_per_sample": round(flush_sec / n * 1e6, 3),
+            "flush_ms_p50": round(flush_ms[len(flush_ms) // 2], 3),
+            "flush_ms_max": round(flush_ms[-1], 3),
+            "queries": queries,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,98 @@
+"""
+CLICK lookup benchmark: old XPath union vs nexo_element_resolver.
+
+Pages are loaded from disk (file://) in headless Chromium. Pass saved pages
+with --page (e.g. a saved Spotify search page) together with the names to
+look for; without --page a synthetic heavy page is generated.
+
+For each name we time:
+ xpath          : the old five-way translate() XPath union (find_elements)
+ resolver_cold  : ElementResolver.find with an empty cache (JS index pass)
+ resolver_warm  : ElementResolver.find again on the unchanged page
+
+Run:  python benchmarks/bench_element_resolver.py [--page saved.html --names play,search]
+"""
+import argparse
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+
+from nexo_element_resolver import ElementResolver
+
+
+def legacy_xpath(element_name):
+    lower = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return (f"//button[contains({lower}, '{element_name}')] | "
+            f"//a[contains({lower}, '{element_name}')] | "
+            f"//div[contains({lower}, '{element_name}')] | "
+            f"//*[contains(@aria-label, '{element_name}')] | "
+            f"//*[contains(@id, '{element_name}')]")
+
+
+def synthetic_page(cards=3000):
+    rows = []
+    for i in range(cards):
+        rows.append(f"<div class='card'><div class='title'>Track {i} by Artist {i % 97}</div>"
+                    f"<div class='meta'><span>{i % 60}:{i % 60:02d}</span></div>"
+                    f"<a href='#t{i}'>Open track {i}</a><button aria-label='Like track {i}'>+</button></div>")
+    return ("<html><body><nav><a id='home-link' href='#'>Home</a><button id='search-button'>Search</button>"
+            "<button aria-label='Play'>&#9654;</button></nav><main>" + "".join(rows) + "</main></body></html>")
+
+
+def time_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def bench_page(driver, url, names):
+    driver.get(url)
+    results = []
+    for name in names:
+        xpath_ms, found = time_ms(lambda: driver.find_elements(By.XPATH, legacy_xpath(name.lower())))
+        resolver = ElementResolver()
+        cold_ms, cold = time_ms(lambda: resolver.find(driver, name))
+        warm_ms, _ = time_ms(lambda: resolver.find(driver, name))
+        results.append({
+            "name": name,
+            "xpath_ms": round(xpath_ms, 2),
+            "xpath_matches": len(found),
+            "resolver_cold_ms": round(cold_ms, 2),
+            "resolver_warm_ms": round(warm_ms, 2),
+            "resolver_found": cold is not None,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page", action="append", default=[], help="saved HTML page (repeatable)")
+    parser.add_argument("--names", default="play,search,home,track 1500")
+    args = parser.parse_args()
+    names = [n.strip() for n in args.names.split(",") if n.strip()]
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    report = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            pages = list(args.page)
+            if not pages:
+                synthetic = os.path.join(tmp, "synthetic.html")
+                with open(synthetic, "w") as f:
+                    f.write(synthetic_page())
+                pages.append(synthetic)
+            for page in pages:
+                report[os.path.basename(page)] = bench_page(driver, pathlib.Path(page).resolve().as_uri(), names)
+    finally:
+        driver.quit()
+    print(json.dumps(report, indent=4))
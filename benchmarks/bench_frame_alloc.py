@@ -0,0 +1,106 @@
+"""
+Per-frame allocation churn of the video loop, before and after nexo_frames.py.
+
+"before" repeats the old per-frame work: cap.read() into a new array,
+cv2.flip() into another, cv2.cvtColor() into a third, and four putText()
+calls for the HUD. "after" reads into FrameBuffers, converts with dst=, and
+composites a HudOverlay whose ECG line changes every frame (the worst case).
+
+The camera is faked so that read(image=buf) behaves like cv2.VideoCapture.
+Allocation is measured with tracemalloc (NumPy reports its buffers to it): the
+peak above the steady baseline, per frame.
+
+Run:  python benchmarks/bench_frame_alloc.py [--frames 300]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from nexo_frames import FrameBuffers, HudOverlay
+
+
+class FakeCamera:
+    def __init__(self, shape):
+        self.source = np.random.default_rng(0).integers(0, 255, size=shape, dtype=np.uint8)
+
+    def read(self, image=None):
+        if image is not None and image.shape == self.source.shape:
+            np.copyto(image, self.source)
+            return True, image
+        return True, self.source.copy()
+
+
+def before(cap, i, state):
+    ok, frame = cap.read()
+    frame = cv2.flip(frame, 1)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    roi = gray[100:300, 100:300]
+    cv2.putText(frame, "Status: Normal", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    cv2.putText(frame, "Blink Rate (BPM): 17", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    cv2.putText(frame, "Car: IDLE (Press 'f' to select)", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    cv2.putText(frame, f"ECG Raw: {512 + i % 50}", (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 0), 2)
+    return roi
+
+
+def after(cap, i, state):
+    if not state:
+        shape = cap.source.shape
+        state["buffers"] = FrameBuffers(shape)
+        state["gray"] = np.empty(shape[:2], dtype=np.uint8)
+        state["hud"] = HudOverlay(shape[1])
+    ok, frame = state["buffers"].read(cap)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=state["gray"])
+    roi = gray[100:300, 100:300]
+    hud = state["hud"]
+    hud.set_line("status", "Status: Normal", (10, 30), (0, 255, 0))
+    hud.set_line("blink", "Blink Rate (BPM): 17", (10, 60), (255, 255, 255))
+    hud.set_line("car", "Car: IDLE (Press 'f' to select)", (10, 90), (0, 255, 255))
+    hud.set_line("ecg", f"ECG Raw: {512 + i % 50}", (10, 120), (200, 200, 0))
+    hud.apply(frame)
+    return roi
+
+
+def measure(step, shape, frames):
+    cap = FakeCamera(shape)
+    state = {}
+    step(cap, 0, state)     # warm-up: one-time buffers are not churn
+    tracemalloc.start()
+    churn = []
+    elapsed = 0.0
+    for i in range(1, frames + 1):
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        step(cap, i, state)
+        elapsed += time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        churn.append(peak - baseline)
+    tracemalloc.stop()
+    per_frame = sum(churn) / len(churn)
+    return {
+        "alloc_kb_per_frame": round(per_frame / 1024, 1),
+        "alloc_mb_per_sec_at_30fps": round(per_frame * 30 / 2 ** 20, 2),
+        "ms_per_frame": round(elapsed / frames * 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+
+    report = {}
+    for name, shape in (("720p", (720, 1280, 3)), ("1080p", (1080, 1920, 3))):
+        report[name] = {
+            "before": measure(before, shape, args.frames),
+            "after": measure(after, shape, args.frames),
+        }
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,97 @@
+"""
+How much detection work the frame-rate governor saves over a scripted session.
+
+The session (simulated clock, no camera needed):
+  0-20 s    user at the desk, car IDLE            (face, little motion)
+  20-80 s   user gone, empty room                 (no face, no motion)
+  80-82 s   someone walks in                      (motion)
+  82-100 s  user back at the desk                 (face)
+  100-130 s car FOLLOWING the user                (face, car active)
+
+Each frame the real governor decides; with --video, motion comes from
+MotionDetector on the clip's frames instead of the script.
+
+Run:  python benchmarks/bench_frame_governor.py [--video clip.mp4]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_governor import FrameRateGovernor, MotionDetector
+
+SCRIPT = [
+    # (until_sec, face, motion, car_state)
+    (20.0, True, False, "IDLE"),
+    (80.0, False, False, "IDLE"),
+    (82.0, False, True, "IDLE"),
+    (100.0, True, False, "IDLE"),
+    (130.0, True, False, "FOLLOWING"),
+]
+
+
+class ScriptedMotion:
+    def __init__(self):
+        self.moving = False
+
+    def update(self, frame):
+        return self.moving
+
+
+def load_frames(video_path):
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < 600:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def simulate(frames=None):
+    motion = MotionDetector() if frames else ScriptedMotion()
+    governor = FrameRateGovernor(motion=motion)
+    now = 0.0
+    latency_to_full = None
+    count = 0
+    for until, face, moving, car_state in SCRIPT:
+        while now < until:
+            if not frames:
+                motion.moving = moving
+            frame = frames[count % len(frames)] if frames else None
+            decision = governor.decide(frame, car_state, now=now)
+            if moving and latency_to_full is None and decision.mode == "full":
+                latency_to_full = now - 80.0
+            if face and decision.detect:
+                governor.face_seen(now)
+            count += 1
+            fps, _ = governor.modes[decision.mode]
+            now += 1.0 / fps
+
+    total = sum(governor.frames.values())
+    detections = sum(governor.detections.values())
+    full_fps, _ = governor.modes["full"]
+    baseline = now * full_fps
+    return {
+        "session_sec": round(now, 1),
+        "frames_captured": total,
+        "detections": detections,
+        "baseline_detections_at_full_rate": int(baseline),
+        "detections_saved_percent": round(100.0 * (1 - detections / baseline), 1),
+        "frames_per_mode": dict(governor.frames),
+        "mode_switches": [f"{t:.2f} s: {old} -> {new} ({reason})" for t, old, new, reason in governor.switches],
+        "seconds_to_full_rate_after_motion": None if latency_to_full is None else round(latency_to_full, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=None)
+    args = parser.parse_args()
+    frames = load_frames(args.video) if args.video else None
+    print(json.dumps(simulate(frames), indent=4))
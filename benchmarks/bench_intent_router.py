@@ -0,0 +1,101 @@
+"""
+Routing accuracy and latency of nexo_intent.route_intent.
+
+Each labelled utterance maps to the expected 'ACTION: ...' string, or None
+when it should be sent to the LLM. Routing runs with a browser window open,
+so the click commands (and their false positives) are in play.
+
+Run:  python benchmarks/bench_intent_router.py [--repeat 200] [--no-tfidf]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_intent import route_intent
+
+LABELLED_UTTERANCES = [
+    ("open YouTube", "ACTION: OPEN YOUTUBE"),
+    ("Hey Nexo, can you open youtube please?", "ACTION: OPEN YOUTUBE"),
+    ("go to youtube", "ACTION: OPEN YOUTUBE"),
+    ("I want to watch YouTube", "ACTION: OPEN YOUTUBE"),
+    ("open google", "ACTION: OPEN GOOGLE"),
+    ("could you launch Google for me", "ACTION: OPEN GOOGLE"),
+    ("open notepad", "ACTION: OPEN NOTEPAD"),
+    ("please open the text editor", "ACTION: OPEN NOTEPAD"),
+    ("close browser", "ACTION: CLOSE BROWSER"),
+    ("close the browser", "ACTION: CLOSE BROWSER"),
+    ("Nexo close chrome", "ACTION: CLOSE BROWSER"),
+    ("play nature sounds", "ACTION: SPOTIFY_NATURE"),
+    ("put on some relaxing nature music", "ACTION: SPOTIFY_NATURE"),
+    ("play Bohemian Rhapsody by Queen on Spotify", "ACTION: SPOTIFY_PLAY bohemian rhapsody by queen"),
+    ("play the song shape of you", "ACTION: SPOTIFY_PLAY shape of you"),
+    ("click search", "ACTION: CLICK search"),
+    ("click on the play button", "ACTION: CLICK play"),
+    ("press the accept all button", "ACTION: CLICK accept all"),
+    ("stop listening", "ACTION: CLOSE ASSISTANT"),
+    ("close assistant", "ACTION: CLOSE ASSISTANT"),
+    ("how stressed am I", None),
+    ("what is my heart rate", None),
+    ("give me a breathing exercise", None),
+    ("explain photosynthesis to me", None),
+    ("tell me a joke", None),
+    ("why is the sky blue", None),
+    ("let's play a game", None),
+    ("I feel tired today", None),
+    ("what can you do", None),
+    ("how do I open a bank account", None),
+    ("close your eyes and relax with me", None),
+    ("what's the weather like", None),
+    ("tap water or bottled water which is better", None),
+    ("press releases are boring", None),
+    ("click bait headlines are really annoying these days", None),
+]
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run(repeat, use_tfidf):
+    route_intent("warm up", use_tfidf=use_tfidf, browser_open=True)
+
+    correct = 0
+    misses = []
+    for utterance, expected in LABELLED_UTTERANCES:
+        got = route_intent(utterance, use_tfidf=use_tfidf, browser_open=True)
+        if got == expected:
+            correct += 1
+        else:
+            misses.append({"utterance": utterance, "expected": expected, "got": got})
+
+    timings_us = []
+    for _ in range(repeat):
+        for utterance, _ in LABELLED_UTTERANCES:
+            start = time.perf_counter()
+            route_intent(utterance, use_tfidf=use_tfidf, browser_open=True)
+            timings_us.append((time.perf_counter() - start) * 1e6)
+    timings_us.sort()
+
+    return {
+        "utterances": len(LABELLED_UTTERANCES),
+        "tfidf_fallback": use_tfidf,
+        "accuracy_percent": round(100.0 * correct / len(LABELLED_UTTERANCES), 1),
+        "latency_us_mean": round(sum(timings_us) / len(timings_us), 2),
+        "latency_us_p50": round(percentile(timings_us, 50), 2),
+        "latency_us_p95": round(percentile(timings_us, 95), 2),
+        "latency_us_max": round(timings_us[-1], 2),
+        "misses": misses,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--no-tfidf", action="store_true")
+    args = parser.parse_args()
+    print(json.dumps(run(args.repeat, not args.no_tfidf), indent=4))
@@ -0,0 +1,64 @@
+"""
+Cost of nexo_metrics instrumentation per call, disabled vs enabled.
+
+Times an empty `with nexo_metrics.span(...)` block and nexo_metrics.inc()
+against a bare loop, then shows what the Prometheus endpoint serves.
+
+Run:  python benchmarks/bench_metrics_overhead.py [--calls 200000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nexo_metrics
+
+
+def ns_per_call(fn, calls):
+    start = time.perf_counter_ns()
+    fn(calls)
+    return (time.perf_counter_ns() - start) / calls
+
+
+def bare(calls):
+    for _ in range(calls):
+        pass
+
+
+def spans(calls):
+    for _ in range(calls):
+        with nexo_metrics.span("detection"):
+            pass
+
+
+def counters(calls):
+    for _ in range(calls):
+        nexo_metrics.inc("frames_processed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--port", type=int, default=9464)
+    args = parser.parse_args()
+
+    baseline = ns_per_call(bare, args.calls)
+    report = {"disabled": {"span_ns": round(ns_per_call(spans, args.calls) - baseline, 1),
+                           "inc_ns": round(ns_per_call(counters, args.calls) - baseline, 1)}}
+
+    trace_path = os.path.join(tempfile.mkdtemp(), "trace.json")
+    registry = nexo_metrics.enable(trace_path=trace_path, http_port=args.port)
+    report["enabled"] = {"span_ns": round(ns_per_call(spans, args.calls) - baseline, 1),
+                         "inc_ns": round(ns_per_call(counters, args.calls) - baseline, 1)}
+    report["stages"] = registry.snapshot()["stages"]
+
+    with urllib.request.urlopen(f"http://127.0.0.1:{args.port}/metrics") as response:
+        report["prometheus_sample"] = response.read().decode().splitlines()[:6]
+    registry.write_trace(trace_path)
+    report["trace_file"] = trace_path
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,172 @@
+"""
+nexo_ollama: model warm-up, keep-alive pings and priority scheduling against
+a stub Ollama server (benchmarks/fakes.py StubOllamaServer) that takes
+--load-sec to load the model, unloads it keep_alive after its last request,
+generates one request at a time and streams --token-ms per token.
+
+ cold_start : first reply of the session. 'direct' sends the question to
+              the unloaded model; 'manager' starts OllamaModelManager at
+              startup and the question arrives --first-question-sec later.
+ idle_gap   : a question after --idle-sec of silence, with keep_alive
+              shorter than the gap. 'direct' finds the model unloaded again;
+              'manager' kept it loaded with pings.
+ contention : user questions every --user-every-sec while background jobs
+              (--bg-tokens tokens each, e.g. summaries) keep the slot busy.
+              'fifo' runs everything in arrival order (all one priority);
+              'priority' runs the user turns first and preempts the
+              background job holding the slot (it is queued again and
+              starts over, so background throughput drops; with questions
+              closer together than one background job, none finishes).
+
+Run:  python benchmarks/bench_ollama_scheduler.py [--load-sec 2] [--token-ms 20]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import StubOllamaServer
+from nexo_ollama import PRIORITY_BACKGROUND, PRIORITY_USER, OllamaModelManager
+
+MODEL = "stub:latest"
+
+
+def chat(url, tokens, keep_alive, token=None):
+    """Streamed /api/chat; returns the reply text, or None once `token` is set."""
+    body = json.dumps({"model": MODEL, "messages": [{"role": "user", "content": "hi"}], "stream": True,
+                       "keep_alive": keep_alive, "options": {"num_predict": tokens}}).encode()
+    request = urllib.request.Request(f"{url}/api/chat", data=body, headers={"Content-Type": "application/json"})
+    parts = []
+    with urllib.request.urlopen(request, timeout=120) as response:
+        for line in response:
+            if token is not None and token.is_set():
+                return None
+            part = json.loads(line)
+            parts.append(part.get("message", {}).get("content", ""))
+            if part.get("done"):
+                break
+    return "".join(parts)
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+def percentiles(samples_ms):
+    samples_ms = sorted(samples_ms)
+    return {"p50": round(samples_ms[len(samples_ms) // 2], 1),
+            "p99": round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.99))], 1),
+            "max": round(samples_ms[-1], 1)}
+
+
+def cold_start(args):
+    stub = StubOllamaServer(load_sec=args.load_sec, token_sec=args.token_ms / 1000)
+    direct = timed_ms(lambda: chat(stub.url, args.user_tokens, "30m"))
+    stub.close()
+
+    stub = StubOllamaServer(load_sec=args.load_sec, token_sec=args.token_ms / 1000)
+    manager = OllamaModelManager(stub.url, MODEL, keep_alive="30m")
+    manager.start()
+    time.sleep(args.first_question_sec)
+    managed = timed_ms(lambda: manager.run(lambda token: chat(stub.url, args.user_tokens, "30m", token)))
+    manager.stop()
+    stub.close()
+    return {"direct_ms": direct, "manager_ms": managed, "preload_ms": manager.stats["preload_ms"]}
+
+
+def idle_gap(args):
+    keep_alive = f"{args.idle_sec / 2:g}s"
+    result = {"keep_alive": keep_alive}
+    for mode in ("direct", "manager"):
+        stub = StubOllamaServer(load_sec=args.load_sec, token_sec=args.token_ms / 1000)
+        manager = None
+        if mode == "manager":
+            manager = OllamaModelManager(stub.url, MODEL, keep_alive=keep_alive)
+            manager.start()
+            manager.ready.wait()
+        else:
+            chat(stub.url, 1, keep_alive)
+        time.sleep(args.idle_sec)
+        if manager is None:
+            ms = timed_ms(lambda: chat(stub.url, args.user_tokens, keep_alive))
+        else:
+            ms = timed_ms(lambda: manager.run(lambda token: chat(stub.url, args.user_tokens, keep_alive, token)))
+            result["pings"] = manager.stats["pings"]
+            manager.stop()
+        result[f"{mode}_ms"] = ms
+        result[f"{mode}_loads"] = stub.loads
+        stub.close()
+    return result
+
+
+def contention(args, priority):
+    stub = StubOllamaServer(load_sec=0.0, token_sec=args.token_ms / 1000)
+    manager = OllamaModelManager(stub.url, MODEL, keep_alive="30m")
+    manager.start()
+    manager.ready.wait()
+    stop = threading.Event()
+    background_done = []
+
+    def background_feeder():
+        # Keeps two background jobs queued at all times
+        pending = []
+        while not stop.is_set():
+            pending = [f for f in pending if not f.done()]
+            while len(pending) < 2:
+                future = manager.submit(lambda token: chat(stub.url, args.bg_tokens, "30m", token),
+                                        PRIORITY_BACKGROUND if priority else PRIORITY_USER,
+                                        requeue=True, name="summary")
+                future.add_done_callback(lambda f: background_done.append(f.result() is not None)
+                                         if not f.cancelled() else None)
+                pending.append(future)
+            time.sleep(0.01)
+
+    feeder = threading.Thread(target=background_feeder, daemon=True)
+    feeder.start()
+    time.sleep(args.user_every_sec)
+    user_ms = []
+    for _ in range(args.user_turns):
+        user_ms.append(timed_ms(lambda: manager.run(
+            lambda token: chat(stub.url, args.user_tokens, "30m", token), PRIORITY_USER, name="user")))
+        time.sleep(args.user_every_sec)
+    stop.set()
+    feeder.join()
+    manager.stop()
+    result = {"user_reply_ms": percentiles(user_ms), "background_completed": sum(background_done),
+              "preempted": manager.stats["preempted"], "requeued": manager.stats["requeued"],
+              "server_aborted": stub.aborted}
+    stub.close()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--load-sec", type=float, default=2.0)
+    parser.add_argument("--token-ms", type=float, default=20.0)
+    parser.add_argument("--user-tokens", type=int, default=20)
+    parser.add_argument("--bg-tokens", type=int, default=100)
+    parser.add_argument("--first-question-sec", type=float, default=3.0,
+                        help="startup + the user speaking before the first question reaches the LLM")
+    parser.add_argument("--idle-sec", type=float, default=4.0)
+    parser.add_argument("--user-turns", type=int, default=10)
+    parser.add_argument("--user-every-sec", type=float, default=3.0)
+    args = parser.parse_args()
+
+    report = {
+        "reply_ms_at_full_speed": args.user_tokens * args.token_ms,
+        "cold_start": cold_start(args),
+        "idle_gap": idle_gap(args),
+        "contention": {
+            "fifo": contention(args, priority=False),
+            "priority": contention(args, priority=True),
+        },
+    }
+    print(json.dumps(report, indent=4))
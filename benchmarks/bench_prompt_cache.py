@@ -0,0 +1,107 @@
+"""
+Prefill benchmark: old prompt layout vs nexo_prompt layout.
+
+Uses a stub LLM server that behaves like Ollama's prompt cache: it remembers
+the tokens of the previous request and only has to "prefill" the tokens after
+the longest common prefix. Latency is simulated from that token count, so no
+real model is needed.
+
+Run:  python benchmarks/bench_prompt_cache.py [--turns 20] [--ms-per-token 0.8]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_prompt import NEXO_SYSTEM_PROMPT, build_ollama_messages
+
+
+class PrefixCacheStub:
+    """Pretends to be an LLM server with a single-slot prompt (KV) cache."""
+
+    def __init__(self, ms_per_token):
+        self.ms_per_token = ms_per_token
+        self.cached_tokens = []
+
+    def prefill(self, tokens):
+        common = 0
+        for old, new in zip(self.cached_tokens, tokens):
+            if old != new:
+                break
+            common += 1
+        self.cached_tokens = tokens
+        evaluated = len(tokens) - common
+        return evaluated, evaluated * self.ms_per_token
+
+
+def tokenize(messages):
+    """Very rough tokenizer: one token per whitespace separated word."""
+    tokens = []
+    for message in messages:
+        tokens.append(f"<{message['role']}>")
+        tokens.extend(message['content'].split())
+    return tokens
+
+
+def legacy_messages(chat_history, stress_level, heart_rate, ecg_raw):
+    """The layout test.py used before: biometrics in the middle of the system prompt."""
+    rules_at = NEXO_SYSTEM_PROMPT.index("**Rules:**")
+    system_prompt = (NEXO_SYSTEM_PROMPT[:rules_at]
+                     + f"The user's current stress level, determined by real-time blink analysis, is: **{stress_level}**.\n"
+                     + f"    The user's current Heart Rate (Beats Per Minute) is: **{heart_rate}**.\n"
+                     + f"    The raw data from the ECG is: **{ecg_raw}**.\n    "
+                     + NEXO_SYSTEM_PROMPT[rules_at:])
+    messages = [{"role": "system", "content": system_prompt}]
+    for message in chat_history:
+        role = "user" if message['role'] == 'user' else 'assistant'
+        messages.append({"role": role, "content": message['parts'][0]['text']})
+    return messages
+
+
+def run(turns, ms_per_token, seed=0):
+    rng = random.Random(seed)
+    stress_levels = ["Normal", "Moderate Stress", "High Stress"]
+    legacy_stub = PrefixCacheStub(ms_per_token)
+    new_stub = PrefixCacheStub(ms_per_token)
+    chat_history = []
+    totals = {"legacy": [0, 0.0], "nexo_prompt": [0, 0.0]}
+
+    for turn in range(turns):
+        chat_history.append({"role": "user", "parts": [{"text": f"question number {turn} about breathing and focus " * 3}]})
+        stress = rng.choice(stress_levels)
+        heart_rate = rng.randint(60, 110)
+        ecg_raw = str(rng.randint(300, 700))
+
+        tokens, ms = legacy_stub.prefill(tokenize(legacy_messages(chat_history, stress, heart_rate, ecg_raw)))
+        totals["legacy"][0] += tokens
+        totals["legacy"][1] += ms
+
+        tokens, ms = new_stub.prefill(tokenize(build_ollama_messages(chat_history, stress, heart_rate, ecg_raw)))
+        totals["nexo_prompt"][0] += tokens
+        totals["nexo_prompt"][1] += ms
+
+        chat_history.append({"role": "model", "parts": [{"text": f"answer number {turn}, take a slow deep breath " * 4}]})
+
+    legacy_ms = totals["legacy"][1]
+    new_ms = totals["nexo_prompt"][1]
+    return {
+        "turns": turns,
+        "ms_per_token": ms_per_token,
+        "legacy_prefill_tokens": totals["legacy"][0],
+        "legacy_prefill_ms": round(legacy_ms, 1),
+        "nexo_prompt_prefill_tokens": totals["nexo_prompt"][0],
+        "nexo_prompt_prefill_ms": round(new_ms, 1),
+        "prefill_ms_saved": round(legacy_ms - new_ms, 1),
+        "prefill_saved_percent": round(100.0 * (legacy_ms - new_ms) / legacy_ms, 1) if legacy_ms else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--ms-per-token", type=float, default=0.8)
+    args = parser.parse_args()
+    print(json.dumps(run(args.turns, args.ms_per_token), indent=4))
@@ -0,0 +1,90 @@
+"""
+Shutdown latency of nexo_runtime.Supervisor with Nexo-like fake subsystems.
+
+ voice : blocked in a 5 s "listen()" on a daemon thread (can't be interrupted)
+ ecg   : async reader awaiting lines every 4 ms
+ llm   : a 3 s "HTTP call" on a daemon thread
+ video : blocking frame loop that notices the stop flag within one frame,
+         then cleans up for --cleanup-ms (camera release, motor thread join,
+         the standby waitKey, "S" to the car) on its daemon thread
+
+Shutdown is requested at a random moment. The video task has a grace period
+(test.py VIDEO_STOP_GRACE_SEC), so its real thread must have finished its
+cleanup before run() returns ('video_cleanup_completed'); everything else
+is cancelled within the 100 ms budget ('cancel_ms').
+
+Run:  python benchmarks/bench_runtime_shutdown.py [--runs 20] [--cleanup-ms 400]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_runtime import Supervisor, RESTART_NEVER
+
+
+async def one_run(run_seconds, cleanup_sec, grace_sec):
+    supervisor = Supervisor()
+    running = threading.Event()
+    running.set()
+    cleaned = threading.Event()
+
+    async def voice():
+        while True:
+            await supervisor.run_blocking(time.sleep, 5.0)
+
+    async def ecg():
+        while True:
+            await asyncio.sleep(0.004)
+
+    async def llm():
+        while True:
+            await supervisor.run_blocking(time.sleep, 3.0)
+
+    def frame_loop():
+        try:
+            while running.is_set():
+                time.sleep(0.033)
+        finally:
+            time.sleep(cleanup_sec)
+            cleaned.set()
+
+    async def video():
+        await supervisor.run_blocking(frame_loop)
+
+    supervisor.add("voice", voice)
+    supervisor.add("ecg", ecg)
+    supervisor.add("llm", llm)
+    supervisor.add("video", video, restart=RESTART_NEVER, critical=True, grace_sec=grace_sec)
+
+    asyncio.get_running_loop().call_later(run_seconds, supervisor.request_stop)
+    await supervisor.run(on_stop=running.clear)
+    return supervisor, cleaned.is_set()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--cleanup-ms", type=float, default=400.0)
+    parser.add_argument("--grace-sec", type=float, default=3.0)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    runs = [asyncio.run(one_run(rng.uniform(0.05, 0.3), args.cleanup_ms / 1000, args.grace_sec))
+            for _ in range(args.runs)]
+    latencies = sorted(supervisor.shutdown_latency_ms for supervisor, _ in runs)
+    cancels = sorted(supervisor.cancel_ms for supervisor, _ in runs)
+    print(json.dumps({
+        "runs": args.runs,
+        "shutdown_ms_p50": round(latencies[len(latencies) // 2], 1),
+        "shutdown_ms_max": round(latencies[-1], 1),
+        "cancel_ms_max": round(cancels[-1], 1),
+        "cancel_under_100ms": all(cancel < 100 for cancel in cancels),
+        "video_cleanup_completed": all(cleaned for _, cleaned in runs),
+    }, indent=4))
@@ -0,0 +1,168 @@
+"""
+Speculative LLM calls on partial transcripts vs the sequential voice turn.
+
+Each utterance is replayed as a stream of partial transcripts (one per audio
+chunk, a new word every --word-ms), followed by the end-of-speech silence and
+the final STT request, after which the final transcript is known. The LLM is a
+stub that answers after --llm-ms unless its cancel event is set.
+
+ sequential  : final transcript -> LLM -> reply (what test.py did before)
+ speculative : nexo_speculative.Speculator fed with the partials; the reply is
+               taken from the in-flight request when the final text matches
+
+The utterance mix is seeded: "clean" (final = last stable partial), "pause"
+(the user stops mid-sentence long enough to trigger a wasted request, then
+continues) and "revised" (the final STT adds a word no partial had: a miss).
+
+All durations are multiplied by --time-scale to keep the run short; the
+reported milliseconds are scaled back to real time.
+
+Run:  python benchmarks/bench_speculative_llm.py [--utterances 24] [--llm-ms 800]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_speculative import STABLE_SEC, Speculator
+
+SENTENCES = [
+    "what is a good way to calm down",
+    "tell me something interesting about the ocean",
+    "how do i make a cup of green tea",
+    "can you explain how a heart beats",
+    "give me a short breathing exercise",
+    "why is the sky blue during the day",
+    "what should i eat before an exam",
+    "teach me a fun fact about space",
+]
+CASES = ("clean", "clean", "clean", "pause", "revised")
+
+
+class StubLLM:
+    """Replies after `latency_sec`; a set cancel event aborts the request."""
+
+    def __init__(self, latency_sec):
+        self.latency_sec = latency_sec
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.aborted = 0
+
+    def __call__(self, text, cancel):
+        if cancel.wait(self.latency_sec):
+            with self.lock:
+                self.aborted += 1
+            return None
+        with self.lock:
+            self.completed += 1
+        return f"reply to: {text}"
+
+
+def timeline(sentence, case, args, rng):
+    """[(offset_sec, partial)] for every chunk, and (final_offset, final_text)."""
+    words = sentence.split()
+    final = sentence
+    if case == "revised":
+        final = f"{sentence} {rng.choice(['please', 'today', 'now'])}"
+    pause_after = len(words) // 2 if case == "pause" else None
+    chunk, word = args.chunk_ms / 1000, args.word_ms / 1000
+    events, t, heard = [], 0.0, 0
+    while heard < len(words):
+        next_word_at = t + word
+        if pause_after is not None and heard == pause_after:
+            next_word_at += args.pause_ms / 1000
+            pause_after = None
+        while t < next_word_at:
+            if heard:
+                events.append((t, " ".join(words[:heard])))
+            t += chunk
+        heard += 1
+    end_of_speech = t + args.endpoint_ms / 1000
+    while t < end_of_speech:
+        events.append((t, " ".join(words)))
+        t += chunk
+    return events, (end_of_speech + args.stt_ms / 1000, final)
+
+
+def replay(events, final, scale, speculator=None):
+    start = time.monotonic()
+    for offset, partial in events:
+        delay = start + offset * scale - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if speculator is not None:
+            speculator.on_partial(partial)
+    delay = start + final[0] * scale - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    return time.monotonic()
+
+
+def run(args):
+    scale = args.time_scale
+    rng = random.Random(args.seed)
+    utterances = [(rng.choice(SENTENCES), rng.choice(CASES)) for _ in range(args.utterances)]
+
+    sequential_llm = StubLLM(args.llm_ms / 1000 * scale)
+    sequential = []
+    for sentence, case in utterances:
+        events, final = timeline(sentence, case, args, random.Random(sentence))
+        final_at = replay(events, final, scale)
+        sequential_llm(final[1], threading.Event())
+        sequential.append((time.monotonic() - final_at) / scale * 1000)
+
+    speculative_llm = StubLLM(args.llm_ms / 1000 * scale)
+    speculator = Speculator(speculative_llm, stable_sec=args.stable_ms / 1000 * scale)
+    speculative, by_case = [], {}
+    for sentence, case in utterances:
+        events, final = timeline(sentence, case, args, random.Random(sentence))
+        final_at = replay(events, final, scale, speculator)
+        speculator.finalize(final[1])
+        reply = speculator.take()
+        if reply is None:
+            reply = speculative_llm(final[1], threading.Event())
+        latency = (time.monotonic() - final_at) / scale * 1000
+        speculative.append(latency)
+        by_case.setdefault(case, []).append(latency)
+    speculator.shutdown()
+
+    report = speculator.report()
+    report["saved_ms_mean"] = round(report["saved_ms_mean"] / scale, 1)
+    report["saved_ms_p50"] = round(report["saved_ms_p50"] / scale, 1)
+    return {
+        "utterances": args.utterances,
+        "llm_ms": args.llm_ms,
+        "stable_ms": args.stable_ms,
+        "sequential": {
+            "reply_latency_ms_mean": round(sum(sequential) / len(sequential), 1),
+            "llm_calls": sequential_llm.completed,
+        },
+        "speculative": {
+            "reply_latency_ms_mean": round(sum(speculative) / len(speculative), 1),
+            "reply_latency_ms_by_case": {case: round(sum(v) / len(v), 1) for case, v in sorted(by_case.items())},
+            "llm_calls_completed": speculative_llm.completed,
+            "llm_calls_aborted": speculative_llm.aborted,
+            **report,
+        },
+        "latency_saved_ms_mean": round((sum(sequential) - sum(speculative)) / len(speculative), 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=24)
+    parser.add_argument("--llm-ms", type=float, default=800.0)
+    parser.add_argument("--word-ms", type=float, default=280.0)
+    parser.add_argument("--chunk-ms", type=float, default=64.0, help="audio chunk = one partial update")
+    parser.add_argument("--pause-ms", type=float, default=700.0, help="mid-sentence pause in 'pause' utterances")
+    parser.add_argument("--endpoint-ms", type=float, default=800.0, help="silence before the phrase ends")
+    parser.add_argument("--stt-ms", type=float, default=350.0, help="final STT request")
+    parser.add_argument("--stable-ms", type=float, default=STABLE_SEC * 1000)
+    parser.add_argument("--time-scale", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=1)
+    print(json.dumps(run(parser.parse_args()), indent=4))
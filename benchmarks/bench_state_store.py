@@ -0,0 +1,141 @@
+"""
+Contention benchmark for nexo_state.BiometricStateStore.
+
+One writer publishes (heart_rate, stress_level) pairs that always belong
+together; many reader threads read them back. Compared against the old style
+of separate module globals and against globals behind a lock.
+
+ globals  : two bare globals written one after the other (old test.py)
+ locked   : the same two values behind a threading.Lock
+ snapshot : BiometricStateStore (lock-free reads of one immutable snapshot)
+
+'torn_reads' counts reads where the two values came from different writes.
+'wake_latency_us' is publish -> wait_for_update() return for one subscriber.
+
+Run:  python benchmarks/bench_state_store.py [--readers 16] [--seconds 1.0]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nexo_state import BiometricStateStore
+
+
+class GlobalsState:
+    def __init__(self):
+        self.heart_rate = 0
+        self.marker = 0
+
+    def write(self, i):
+        self.heart_rate = i
+        self.marker = i
+
+    def read(self):
+        return self.heart_rate, self.marker
+
+
+class LockedState(GlobalsState):
+    def __init__(self):
+        super().__init__()
+        self.lock = threading.Lock()
+
+    def write(self, i):
+        with self.lock:
+            self.heart_rate = i
+            self.marker = i
+
+    def read(self):
+        with self.lock:
+            return self.heart_rate, self.marker
+
+
+class SnapshotState:
+    def __init__(self):
+        self.store = BiometricStateStore()
+
+    def write(self, i):
+        self.store.publish(heart_rate=i, blink_rate=i)
+
+    def read(self):
+        snap = self.store.snapshot
+        return snap.heart_rate, snap.blink_rate
+
+
+def run_case(state, readers, seconds):
+    stop = threading.Event()
+    counts = [0] * readers
+    torn = [0] * readers
+    writes = [0]
+
+    def writer():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            state.write(i)
+        writes[0] = i
+
+    def reader(slot):
+        n = bad = 0
+        while not stop.is_set():
+            a, b = state.read()
+            if a != b:
+                bad += 1
+            n += 1
+        counts[slot] = n
+        torn[slot] = bad
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {
+        "reads_per_sec": int(sum(counts) / seconds),
+        "writes_per_sec": int(writes[0] / seconds),
+        "torn_reads": sum(torn),
+    }
+
+
+def wake_latency(samples=200):
+    store = BiometricStateStore()
+    latencies = []
+    ready = threading.Event()
+
+    def subscriber():
+        version = store.snapshot.version
+        ready.set()
+        for _ in range(samples):
+            snap = store.wait_for_update(version, timeout=1.0)
+            latencies.append((time.perf_counter() - snap.heart_rate) * 1e6)
+            version = snap.version
+
+    t = threading.Thread(target=subscriber)
+    t.start()
+    ready.wait()
+    for _ in range(samples):
+        # heart_rate abused as a send timestamp for this measurement only
+        store.publish(heart_rate=time.perf_counter())
+        time.sleep(0.001)
+    t.join()
+    latencies.sort()
+    return {"p50": round(latencies[len(latencies) // 2], 1), "p99": round(latencies[int(len(latencies) * 0.99)], 1)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    report = {"readers": args.readers}
+    for name, state in (("globals", GlobalsState()), ("locked", LockedState()), ("snapshot", SnapshotState())):
+        report[name] = run_case(state, args.readers, args.seconds)
+    report["wake_latency_us"] = wake_latency()
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,201 @@
+"""
+Load test for nexo_stream.BiometricStreamServer.
+
+Starts the server, feeds it a synthetic ECG (fakes.ecg_waveform) at --hz and
+connects --clients WebSocket viewers and --sse SSE viewers. WebSocket viewers
+ack every block. --slow of them only read --slow-bps bytes/s, so the server
+has to decimate and then drop blocks for them, while the rest must keep
+receiving every sample.
+
+Reported per group (fast / slow / sse): samples received per second (at the
+source rate, i.e. decimated samples count for `decimation` each), blocks,
+block latency (last sample in the block -> received) and the decimation
+levels seen, plus the server's compression ratio and wire bytes per sample.
+
+Run:  python benchmarks/bench_stream_server.py [--clients 48] [--slow 6] [--sse 8] [--seconds 10]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from fakes import ecg_waveform
+from nexo_stream import BiometricStreamServer, decode_block
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * q))], 1) if values else None
+
+
+class ViewerStats:
+    def __init__(self):
+        self.samples = 0           # at the source rate
+        self.blocks = 0
+        self.bytes = 0
+        self.latency_ms = []
+        self.decimations = set()
+        self.status_messages = 0
+        self.last_seq = None
+
+    def on_block(self, data, received_at):
+        block = decode_block(data)
+        self.last_seq = block["seq"]
+        self.blocks += 1
+        self.samples += len(block["values"]) * block["decimation"]
+        self.decimations.add(block["decimation"])
+        last_sample_at = block["t0"] + block["dt"] * (len(block["values"]) - 1)
+        self.latency_ms.append((received_at - last_sample_at) * 1000)
+
+
+def masked_text_frame(payload):
+    mask = os.urandom(4)
+    return bytes([0x81, 0x80 | len(payload)]) + mask + bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+
+
+async def websocket_viewer(port, seconds, stats, slow_bps=None):
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write((f"GET /ws HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode())
+    if b" 101 " not in await reader.readline():
+        raise RuntimeError("websocket handshake failed")
+    while await reader.readline() not in (b"\r\n", b""):
+        pass
+
+    deadline = loop.time() + seconds
+    try:
+        while loop.time() < deadline:
+            header = await asyncio.wait_for(reader.readexactly(2), deadline - loop.time())
+            length = header[1] & 0x7F
+            if length == 126:
+                length = int.from_bytes(await reader.readexactly(2), "big")
+            elif length == 127:
+                length = int.from_bytes(await reader.readexactly(8), "big")
+            payload = await reader.readexactly(length)
+            stats.bytes += 2 + length
+            if header[0] & 0x0F == 0x2:
+                stats.on_block(payload, time.time())
+                if slow_bps:
+                    await asyncio.sleep((2 + length) / slow_bps)
+                writer.write(masked_text_frame(json.dumps({"ack": stats.last_seq}).encode()))
+            else:
+                stats.status_messages += 1
+    except asyncio.TimeoutError:
+        pass
+    writer.write(bytes([0x88, 0x82]) + os.urandom(4) + b"\x03\xe8")    # masked close
+    writer.close()
+
+
+async def sse_viewer(port, seconds, stats):
+    loop = asyncio.get_running_loop()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nAccept: text/event-stream\r\n\r\n".encode())
+    while await reader.readline() not in (b"\r\n", b""):
+        pass
+    deadline = loop.time() + seconds
+    event = None
+    try:
+        while loop.time() < deadline:
+            line = await asyncio.wait_for(reader.readline(), deadline - loop.time())
+            stats.bytes += len(line)
+            if line.startswith(b"event: "):
+                event = line[7:].strip()
+            elif line.startswith(b"data: "):
+                if event == b"ecg":
+                    stats.on_block(base64.b64decode(line[6:].strip()), time.time())
+                else:
+                    stats.status_messages += 1
+    except asyncio.TimeoutError:
+        pass
+    writer.close()
+
+
+def feed(server, hz, stop):
+    """Pushes synthetic ECG samples at `hz` with their nominal timestamps."""
+    rng = random.Random(0)
+    start = time.time()
+    sent = 0
+    while not stop.is_set():
+        due = int((time.time() - start) * hz)
+        for i in range(sent, due):
+            server.push_sample(ecg_waveform(i / hz, rng=rng), start + i / hz)
+        sent = due
+        if sent // int(hz) != (sent - 1) // int(hz):
+            server.publish_status(bpm=72, hrv_rmssd_ms=round(rng.uniform(30, 50), 1), stress_level="Normal")
+        time.sleep(0.002)
+
+
+def summary(group, seconds):
+    if not group:
+        return None
+    return {
+        "viewers": len(group),
+        "samples_per_sec_min": round(min(s.samples for s in group) / seconds, 1),
+        "samples_per_sec_mean": round(sum(s.samples for s in group) / len(group) / seconds, 1),
+        "blocks_mean": round(sum(s.blocks for s in group) / len(group), 1),
+        "wire_bytes_per_sec_mean": round(sum(s.bytes for s in group) / len(group) / seconds),
+        "latency_ms_p50": percentile([v for s in group for v in s.latency_ms], 0.5),
+        "latency_ms_p99": percentile([v for s in group for v in s.latency_ms], 0.99),
+        "decimations_seen": sorted({d for s in group for d in s.decimations}),
+        "status_messages_mean": round(sum(s.status_messages for s in group) / len(group), 1),
+    }
+
+
+async def run_viewers(args, port):
+    fast = [ViewerStats() for _ in range(args.clients - args.slow)]
+    slow = [ViewerStats() for _ in range(args.slow)]
+    sse = [ViewerStats() for _ in range(args.sse)]
+    await asyncio.gather(
+        *(websocket_viewer(port, args.seconds, s) for s in fast),
+        *(websocket_viewer(port, args.seconds, s, slow_bps=args.slow_bps) for s in slow),
+        *(sse_viewer(port, args.seconds, s) for s in sse),
+    )
+    return fast, slow, sse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=48)
+    parser.add_argument("--slow", type=int, default=6)
+    parser.add_argument("--slow-bps", type=float, default=300.0)
+    parser.add_argument("--sse", type=int, default=8)
+    parser.add_argument("--hz", type=float, default=1000.0)
+    parser.add_argument("--seconds", type=float, default=15.0)
+    args = parser.parse_args()
+
+    server = BiometricStreamServer(port=0)
+    if not server.start():
+        sys.exit(f"could not start the server: {server.error}")
+    stop = threading.Event()
+    feeder = threading.Thread(target=feed, args=(server, args.hz, stop), daemon=True)
+    feeder.start()
+
+    fast, slow, sse = asyncio.run(run_viewers(args, server.port))
+    server_stats = server.stats()
+    stop.set()
+    server.stop()
+
+    encoded_per_sample = server.bytes_encoded / server.samples if server.samples else None
+    print(json.dumps({
+        "source_hz": args.hz,
+        "seconds": args.seconds,
+        "fast_websocket": summary(fast, args.seconds),
+        "slow_websocket": summary(slow, args.seconds),
+        "sse": summary(sse, args.seconds),
+        "server": {
+            **server_stats,
+            "encoded_bytes_per_sample": round(encoded_per_sample, 2) if encoded_per_sample else None,
+            "text_bytes_per_sample": 4.0,     # "512\n" on the serial line
+        },
+    }, indent=4))
@@ -0,0 +1,163 @@
+"""
+Tracker cost per frame and steering-command jitter (nexo_tracking.py).
+
+1. Every tracker (CSRT, KCF, MOSSE, KCF + CSRT re-check) runs over the same
+   frames: ms/frame, and mean IoU against the ground truth for synthetic frames.
+2. The clip is replayed at camera speed through KCF + re-check. Steering is
+   driven (a) once per tracked frame, like the old loop, and (b) by the
+   fixed-rate MotorControlLoop. Both report the jitter of their command
+   intervals.
+
+Frames come from --video (give the target with --bbox x,y,w,h), otherwise a
+synthetic textured target moving over a noisy background is used.
+
+Run:  python benchmarks/bench_tracking.py [--video clip.mp4 --bbox 300,200,120,160] [--seconds 10]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from nexo_tracking import (HybridTracker, BBoxPredictor, PIDController, MotorControlLoop,
+                           create_tracker, iou)
+
+
+def synthetic_clip(count=300, shape=(480, 640, 3)):
+    rng = np.random.default_rng(0)
+    texture = rng.integers(0, 255, size=(120, 90, 3), dtype=np.uint8)
+    frames, truth = [], []
+    for i in range(count):
+        frame = rng.integers(0, 50, size=shape, dtype=np.uint8)
+        x = int(275 + 200 * np.sin(i / 25.0))
+        y = int(180 + 40 * np.sin(i / 40.0))
+        frame[y:y + 120, x:x + 90] = texture
+        frames.append(frame)
+        truth.append((x, y, 90, 120))
+    return frames, truth
+
+
+def load_clip(path, limit=600):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * q))], 3) if values else None
+
+
+def tracker_cost(frames, bbox, truth, kind, verify_every):
+    try:
+        create_tracker(kind)
+    except RuntimeError as e:
+        return {"error": str(e)}
+    tracker = HybridTracker(kind, verify_every)
+    tracker.init(frames[0], bbox)
+    times_ms, overlaps, lost = [], [], 0
+    for i, frame in enumerate(frames[1:], start=1):
+        start = time.perf_counter()
+        ok, box = tracker.update(frame)
+        times_ms.append((time.perf_counter() - start) * 1000)
+        if not ok:
+            lost += 1
+        elif truth:
+            overlaps.append(iou(box, truth[i]))
+    report = {
+        "ms_per_frame_p50": percentile(times_ms, 0.5),
+        "ms_per_frame_p95": percentile(times_ms, 0.95),
+        "lost_frames": lost,
+        "csrt_corrections": tracker.corrections,
+    }
+    if truth:
+        report["mean_iou"] = round(sum(overlaps) / max(1, len(overlaps)), 3)
+    return report
+
+
+def interval_jitter(stamps, period):
+    intervals = [(b - a) * 1000 for a, b in zip(stamps, stamps[1:])]
+    deviations = [abs(interval - period * 1000) for interval in intervals]
+    return {
+        "commands": len(stamps),
+        "interval_ms_p50": percentile(intervals, 0.5),
+        "jitter_ms_p50": percentile(deviations, 0.5),
+        "jitter_ms_p99": percentile(deviations, 0.99),
+    }
+
+
+def control_jitter(frames, bbox, seconds, camera_fps=30.0):
+    tracker = HybridTracker("KCF")
+    tracker.init(frames[0], bbox)
+    frame_center_x = frames[0].shape[1] // 2
+
+    loop_stamps = []
+    predictor = BBoxPredictor()
+    motor = MotorControlLoop(predictor, lambda command: loop_stamps.append(time.monotonic()),
+                             frame_center_x, 150, PIDController(0.5, 0.0, 0.02), dead_zone=0)
+    motor.start()
+    motor.follow()
+
+    frame_stamps = []
+    end = time.monotonic() + seconds
+    i = 0
+    next_frame = time.monotonic()
+    while time.monotonic() < end:
+        next_frame += 1.0 / camera_fps
+        frame = frames[i % len(frames)]
+        captured = time.monotonic()
+        ok, box = tracker.update(frame)
+        if ok:
+            predictor.update(box, captured)
+            frame_stamps.append(time.monotonic())   # the old loop sent a command here
+        i += 1
+        delay = next_frame - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    motor.stop()
+
+    return {
+        "frame_tied": interval_jitter(frame_stamps, 1.0 / camera_fps),
+        "control_thread": interval_jitter(loop_stamps, motor.period),
+        "control_tick_late_ms_p99": percentile(motor.lateness_ms, 0.99),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", default=None)
+    parser.add_argument("--bbox", default=None, help="initial target box x,y,w,h (with --video)")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    if args.video:
+        if not args.bbox:
+            parser.error("--bbox is required with --video")
+        frames, truth = load_clip(args.video), None
+        bbox = tuple(int(v) for v in args.bbox.split(","))
+    else:
+        frames, truth = synthetic_clip()
+        bbox = truth[0]
+
+    report = {
+        "frames": len(frames),
+        "trackers": {
+            "CSRT": tracker_cost(frames, bbox, truth, "CSRT", 0),
+            "KCF": tracker_cost(frames, bbox, truth, "KCF", 0),
+            "MOSSE": tracker_cost(frames, bbox, truth, "MOSSE", 0),
+            "KCF+CSRT_verify": tracker_cost(frames, bbox, truth, "KCF", 15),
+        },
+        "control": control_jitter(frames, bbox, args.seconds),
+    }
+    print(json.dumps(report, indent=4))
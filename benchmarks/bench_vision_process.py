@@ -0,0 +1,107 @@
+"""
+ECG-thread sample jitter with the vision pipeline in-process vs in its own process.
+
+A fake ECG reader thread wakes up at --ecg-hz (like ecg_data_reader_thread
+polling the serial port) and records how late each wake-up is, while the main
+thread pushes frames through nexo_vision as fast as it can. Frames come from
+--video if given, otherwise synthetic 720p frames with a drawn "face".
+
+Run:  python benchmarks/bench_vision_process.py [--seconds 10] [--ecg-hz 250] [--video clip.mp4]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+
+from nexo_vision import InProcessVision, ProcessVision
+
+PIPELINE_ARGS = dict(base_speed=150, kp_turn=0.5, dead_zone=30, blink_consec_frames=2)
+
+
+def frame_source(video_path, shape=(720, 1280, 3)):
+    if video_path:
+        cap = cv2.VideoCapture(video_path)
+        frames = []
+        while len(frames) < 300:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            frames.append(frame)
+        cap.release()
+        if frames:
+            return frames
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(30):
+        frame = rng.integers(0, 60, size=shape, dtype=np.uint8)
+        cx = 400 + 10 * i
+        cv2.ellipse(frame, (cx, 360), (120, 160), 0, 0, 360, (170, 190, 220), -1)
+        cv2.circle(frame, (cx - 45, 320), 14, (40, 40, 40), -1)
+        cv2.circle(frame, (cx + 45, 320), 14, (40, 40, 40), -1)
+        frames.append(frame)
+    return frames
+
+
+def ecg_jitter_thread(hz, stop, lateness_ms):
+    period = 1.0 / hz
+    next_tick = time.perf_counter() + period
+    while not stop.is_set():
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        lateness_ms.append((time.perf_counter() - next_tick) * 1000)
+        next_tick += period
+
+
+def run_case(vision, frames, seconds, hz):
+    stop = threading.Event()
+    lateness_ms = []
+    ecg = threading.Thread(target=ecg_jitter_thread, args=(hz, stop, lateness_ms))
+    ecg.start()
+
+    processed = submitted = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        vision.submit(frames[submitted % len(frames)])
+        submitted += 1
+        processed += len(vision.poll())
+    stop.set()
+    ecg.join()
+    vision.close()
+
+    lateness_ms.sort()
+    n = len(lateness_ms)
+    return {
+        "frames_submitted": submitted,
+        "frames_processed": processed,
+        "frames_dropped": vision.dropped_frames,
+        "ecg_samples": n,
+        "ecg_expected": int(seconds * hz),
+        "ecg_late_ms_p50": round(lateness_ms[n // 2], 3),
+        "ecg_late_ms_p99": round(lateness_ms[int(n * 0.99)], 3),
+        "ecg_late_ms_max": round(lateness_ms[-1], 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--ecg-hz", type=float, default=250.0)
+    parser.add_argument("--video", default=None)
+    args = parser.parse_args()
+
+    frames = frame_source(args.video)
+    shape = frames[0].shape
+    report = {
+        "frame_shape": list(shape),
+        "in_process": run_case(InProcessVision(shape, **PIPELINE_ARGS), frames, args.seconds, args.ecg_hz),
+        "out_of_process": run_case(ProcessVision(shape, **PIPELINE_ARGS), frames, args.seconds, args.ecg_hz),
+    }
+    print(json.dumps(report, indent=4))
@@ -0,0 +1,505 @@
+"""
+Simulated devices for running Nexo without any hardware (see bench_e2e.py).
+
+ PtyArduinoCar       - a pseudo-terminal that pyserial opens like a COM port;
+                       records every command line the car would receive.
+ SyntheticEcgEmitter - a pseudo-terminal streaming ADC samples ("value,seq")
+                       of a synthetic ECG at a configurable rate and heart rate.
+ VideoFileCamera     - cv2.VideoCapture stand-in that plays a video file (or
+                       synthetic frames) at camera speed, with read(image=).
+ HeadlessCv2         - wraps cv2: imshow is a no-op, waitKey sleeps and plays
+                       back scripted key presses, selectROI returns a set box.
+ WavMicrophone       - speech_recognition stand-in: the microphone is a WAV
+                       file and recognize_google() returns scripted text.
+ SilentTTS           - pyttsx3 stand-in that records what would be spoken.
+ FakeBrowser         - BrowserSession stand-in that records opened URLs.
+ StubLLMServer       - local HTTP server answering Ollama (/api/chat,
+                       /api/tags) and Gemini (:generateContent) requests.
+ StubOllamaServer    - Ollama with a model lifecycle: load latency, keep_alive
+                       expiry, OLLAMA_NUM_PARALLEL slots and streamed tokens.
+
+pty needs Linux or macOS.
+"""
+import http.server
+import json
+import math
+import os
+import random
+import struct
+import threading
+import time
+import wave
+from concurrent.futures import Future
+
+
+def _open_pty():
+    import tty
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    return master, slave, os.ttyname(slave)
+
+
+class PtyArduinoCar:
+    """The car's serial port. Commands arrive as lines, e.g. "M,150,150"."""
+
+    def __init__(self):
+        self._master, self._slave, self.port = _open_pty()
+        self.commands = []      # (time.monotonic(), command)
+        self._running = True
+        self._thread = threading.Thread(target=self._read, name="fake-car", daemon=True)
+        self._thread.start()
+
+    def _read(self):
+        buffer = b""
+        while self._running:
+            try:
+                chunk = os.read(self._master, 1024)
+            except OSError:
+                break
+            if not chunk:
+                break
+            buffer += chunk
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                self.commands.append((time.monotonic(), line.decode(errors="replace").strip()))
+
+    def close(self):
+        self._running = False
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def ecg_waveform(t, heart_rate=72.0, noise=6.0, rng=random):
+    """Synthetic 10-bit ECG: baseline wander, P wave, sharp QRS, T wave."""
+    beat = 60.0 / heart_rate
+    phase = (t % beat) / beat
+    value = 512 + 20 * math.sin(2 * math.pi * 0.3 * t)
+    value += 25 * math.exp(-((phase - 0.15) / 0.03) ** 2)     # P
+    value += 380 * math.exp(-((phase - 0.30) / 0.008) ** 2)   # R
+    value -= 60 * math.exp(-((phase - 0.33) / 0.01) ** 2)     # S
+    value += 70 * math.exp(-((phase - 0.55) / 0.05) ** 2)     # T
+    value += rng.gauss(0, noise)
+    return int(max(0, min(1023, value)))
+
+
+class SyntheticEcgEmitter:
+    """Streams "value,seq" lines at `hz` into a pty; send times are kept for latency."""
+
+    def __init__(self, hz=250.0, heart_rate=72.0, with_seq=True):
+        self._master, self._slave, self.port = _open_pty()
+        self.hz = hz
+        self.heart_rate = heart_rate
+        self.with_seq = with_seq
+        self.sent_at = []        # index = seq
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="fake-ecg", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        rng = random.Random(0)
+        period = 1.0 / self.hz
+        start = next_tick = time.monotonic()
+        seq = 0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            value = ecg_waveform(next_tick - start, self.heart_rate, rng=rng)
+            line = f"{value},{seq}\n" if self.with_seq else f"{value}\n"
+            self.sent_at.append(time.monotonic())
+            try:
+                os.write(self._master, line.encode())
+            except OSError:
+                break
+            seq += 1
+            next_tick += period
+
+    def latency_ms(self, seq, received_at):
+        if 0 <= seq < len(self.sent_at):
+            return (received_at - self.sent_at[seq]) * 1000
+        return None
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class VideoFileCamera:
+    """Plays a video file (looping) or synthetic frames, paced like a webcam."""
+
+    def __init__(self, cv2, np, path=None, fps=30.0, shape=(480, 640, 3)):
+        self.cv2 = cv2
+        self.fps = fps
+        self.frames = []
+        if path:
+            cap = cv2.VideoCapture(path)
+            while len(self.frames) < 900:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                self.frames.append(frame)
+            cap.release()
+        if not self.frames:
+            self.frames = self._synthetic(cv2, np, shape)
+        self.index = 0
+        self.reads = 0
+        self._opened = True
+        self._next = time.monotonic()
+
+    @staticmethod
+    def _synthetic(cv2, np, shape, count=60):
+        rng = np.random.default_rng(0)
+        frames = []
+        for i in range(count):
+            frame = rng.integers(0, 40, size=shape, dtype=np.uint8)
+            cx = shape[1] // 2 + int(80 * math.sin(i / 10.0))
+            cv2.ellipse(frame, (cx, shape[0] // 2), (70, 95), 0, 0, 360, (170, 190, 220), -1)
+            if i % 20 not in (0, 1):     # eyes closed for two frames: a blink
+                cv2.circle(frame, (cx - 28, shape[0] // 2 - 25), 9, (40, 40, 40), -1)
+                cv2.circle(frame, (cx + 28, shape[0] // 2 - 25), 9, (40, 40, 40), -1)
+            frames.append(frame)
+        return frames
+
+    def isOpened(self):
+        return self._opened
+
+    def set(self, prop, value):
+        return True
+
+    def read(self, image=None):
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + 1.0 / self.fps
+        frame = self.frames[self.index % len(self.frames)]
+        self.index += 1
+        self.reads += 1
+        if image is not None and image.shape == frame.shape:
+            image[...] = frame
+            return True, image
+        return True, frame.copy()
+
+    def release(self):
+        self._opened = False
+
+
+class HeadlessCv2:
+    """cv2 without windows. `keys` maps a frame number (imshow count) to a key."""
+
+    def __init__(self, cv2, keys=None, roi=(0, 0, 0, 0)):
+        self._cv2 = cv2
+        self.keys = dict(keys or {})
+        self.roi = roi
+        self.shown = []            # time.monotonic() of every imshow
+
+    def __getattr__(self, name):
+        return getattr(self._cv2, name)
+
+    def imshow(self, name, frame):
+        self.shown.append(time.monotonic())
+
+    def waitKey(self, delay=0):
+        time.sleep(max(delay, 1) / 1000.0)
+        key = self.keys.pop(len(self.shown), None)
+        return ord(key) if key else -1
+
+    def selectROI(self, *args, **kwargs):
+        return self.roi
+
+    def destroyAllWindows(self):
+        pass
+
+
+def write_tone_wav(path, seconds=1.0, rate=16000, silence=0.5):
+    """A WAV with silence, a 440 Hz 'utterance' and silence, so listen() detects one phrase."""
+    with wave.open(path, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+        samples = []
+        for i in range(int(rate * (2 * silence + seconds))):
+            t = i / rate
+            speaking = silence <= t < silence + seconds
+            samples.append(int(12000 * math.sin(2 * math.pi * 440 * t)) if speaking else 0)
+        out.writeframes(struct.pack(f"<{len(samples)}h", *samples))
+    return path
+
+
+class WavMicrophone:
+    """
+    Stands in for the speech_recognition module. Microphone() plays `wav_path`;
+    recognize_google() returns the next scripted transcript (Google's cloud STT
+    can't be part of an offline benchmark).
+    """
+
+    def __init__(self, sr, wav_path, transcripts):
+        self._sr = sr
+        self.wav_path = wav_path
+        self.transcripts = list(transcripts)
+        self.recognized = []       # (time.monotonic(), text)
+        mic = self
+
+        class Recognizer(sr.Recognizer):
+            def recognize_google(self, audio_data, *args, **kwargs):
+                if not mic.transcripts:
+                    raise sr.UnknownValueError()
+                text = mic.transcripts.pop(0)
+                mic.recognized.append((time.monotonic(), text))
+                return text
+
+        self.Recognizer = Recognizer
+
+    def __getattr__(self, name):
+        return getattr(self._sr, name)
+
+    def Microphone(self):
+        return self._sr.AudioFile(self.wav_path)
+
+
+class SilentTTS:
+    """Stands in for pyttsx3: init() returns an engine that records instead of speaking."""
+
+    def __init__(self):
+        self.spoken = []           # (time.monotonic(), text)
+        tts = self
+
+        class Engine:
+            def setProperty(self, name, value):
+                pass
+
+            def say(self, text):
+                tts.spoken.append((time.monotonic(), text))
+
+            def runAndWait(self):
+                pass
+
+        self._engine = Engine()
+
+    def init(self, *args, **kwargs):
+        return self._engine
+
+
+class FakeBrowser:
+    """BrowserSession stand-in: records URLs, runs submitted work with driver=None."""
+
+    def __init__(self):
+        self.opened = []
+        self.is_open = False
+
+    def open_url(self, url):
+        self.opened.append(url)
+        self.is_open = True
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(RuntimeError("no browser in the benchmark"))
+        return future
+
+    def hide(self):
+        self.is_open = False
+
+    def shutdown(self, wait=True):
+        self.is_open = False
+
+
+class StubLLMServer:
+    """Answers Ollama and Gemini requests with canned text after `latency_sec`."""
+
+    def __init__(self, reply="Take a slow breath in, and let it out. You're doing fine.", latency_sec=0.15):
+        self.reply = reply
+        self.latency_sec = latency_sec
+        self.requests = []         # (time.monotonic(), path, payload bytes)
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, body):
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.startswith("/api/tags"):
+                    self._send_json({"models": [{"name": "stub:latest"}]})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                stub.requests.append((time.monotonic(), self.path, len(body)))
+                time.sleep(stub.latency_sec)
+                if self.path.startswith("/api/chat"):
+                    self._send_json({
+                        "message": {"role": "assistant", "content": stub.reply},
+                        "done": True,
+                        "prompt_eval_count": 32,
+                        "prompt_eval_duration": int(stub.latency_sec * 0.3 * 1e9),
+                    })
+                elif self.path.startswith("/api/generate"):
+                    self._send_json({"response": stub.reply, "done": True})
+                elif ":generateContent" in self.path:
+                    self._send_json({"candidates": [{"content": {"parts": [{"text": stub.reply}]}}]})
+                else:
+                    self.send_error(404)
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, name="stub-llm", daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StubOllamaServer:
+    """
+    Ollama stand-in with a model lifecycle. A request that finds the model
+    unloaded first waits `load_sec`; the model unloads `keep_alive` after the
+    last request that used it (the request's keep_alive, else
+    `default_keep_alive`); only `parallel` requests generate at once, the
+    others queue; a reply is `tokens` tokens (or options.num_predict) of
+    `token_sec` each, and a
+    streamed reply stops when the client goes away. /api/generate without a
+    prompt only loads the model, like the real server.
+    """
+
+    def __init__(self, load_sec=3.0, token_sec=0.02, tokens=30, parallel=1, default_keep_alive="5m"):
+        from nexo_ollama import keep_alive_seconds
+
+        self.load_sec = load_sec
+        self.token_sec = token_sec
+        self.tokens = tokens
+        self.default_keep_alive = default_keep_alive
+        self.loads = 0
+        self.completed = 0
+        self.aborted = 0
+        self.requests = []          # (time.monotonic(), path, model)
+        self._expires = None        # monotonic time the model unloads; None = not loaded
+        self._busy = 0              # requests using the model right now (never unloads then)
+        self._model_lock = threading.Lock()
+        self._slots = threading.Semaphore(parallel)
+        stub = self
+
+        def keep_sec(body):
+            seconds = keep_alive_seconds(body.get("keep_alive", stub.default_keep_alive))
+            return math.inf if seconds is None else seconds
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, body):
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path.startswith("/api/tags"):
+                    self._send_json({"models": [{"name": "stub:latest"}]})
+                elif self.path.startswith("/api/ps"):
+                    self._send_json({"models": [{"name": "stub:latest"}] if stub.loaded else []})
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub.requests.append((time.monotonic(), self.path, body.get("model")))
+                if not self.path.startswith(("/api/chat", "/api/generate")):
+                    self.send_error(404)
+                    return
+                stub._acquire_model()
+                try:
+                    if self.path.startswith("/api/generate") and not body.get("prompt"):
+                        self._send_json({"model": body.get("model"), "response": "", "done": True,
+                                         "done_reason": "load"})
+                        return
+                    tokens = body.get("options", {}).get("num_predict", stub.tokens)
+                    with stub._slots:
+                        if body.get("stream", True):
+                            self._stream(self.path.startswith("/api/chat"), tokens)
+                        else:
+                            time.sleep(tokens * stub.token_sec)
+                            stub.completed += 1
+                            self._send_json(stub._reply(self.path.startswith("/api/chat"), "x " * tokens))
+                finally:
+                    stub._release_model(keep_sec(body))
+
+            def _stream(self, chat, tokens):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    for _ in range(tokens):
+                        time.sleep(stub.token_sec)
+                        part = {"message": {"role": "assistant", "content": "x "}} if chat else {"response": "x "}
+                        self.wfile.write((json.dumps(dict(part, done=False)) + "\n").encode())
+                        self.wfile.flush()
+                    self.wfile.write((json.dumps(stub._reply(chat, "")) + "\n").encode())
+                    stub.completed += 1
+                except (BrokenPipeError, ConnectionResetError):
+                    stub.aborted += 1
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, name="stub-ollama", daemon=True).start()
+
+    def _reply(self, chat, text):
+        body = {"done": True, "prompt_eval_count": 32, "prompt_eval_duration": 0}
+        if chat:
+            body["message"] = {"role": "assistant", "content": text}
+        else:
+            body["response"] = text
+        return body
+
+    @property
+    def loaded(self):
+        return self._busy > 0 or (self._expires is not None and time.monotonic() < self._expires)
+
+    def _acquire_model(self):
+        with self._model_lock:      # concurrent requests wait for the same load
+            if not self.loaded:
+                time.sleep(self.load_sec)
+                self.loads += 1
+            self._busy += 1
+
+    def _release_model(self, keep_sec):
+        with self._model_lock:
+            self._busy -= 1
+            self._expires = time.monotonic() + keep_sec
+
+    def unload(self):
+        """Drops the model now (like `ollama stop` or a server restart)."""
+        with self._model_lock:
+            self._expires = None
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
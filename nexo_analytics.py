@@ -0,0 +1,234 @@
+# --- NEXO BIOMETRIC ANALYTICS ---
+# Answers questions about the past ("how stressed was I yesterday", "average
+# blink rate per hour this week") without re-reading the stress JSON log.
+#
+# One SQLite file (WAL mode) with two tables:
+#  * events  - every reading: time, metric, value (stress levels: label),
+#              indexed on (metric, ts) for drill-downs
+#  * rollups - one row per (period, bucket, metric) with count, sum, min and
+#              max. Periods are 'hour' (bucket '2026-10-18 14') and 'day'
+#              ('2026-10-18'), in local time, so "yesterday" is a calendar day.
+#              Stress levels are counted as their own metrics
+#              ('stress:High Stress').
+#
+# record() inserts the event and upserts its hour and day rollups in the same
+# transaction, so the rollups are always up to date and a query only reads
+# a few pre-aggregated rows (the primary key is the range index).
+#
+# history_context(text) turns a question about a past period into one short
+# '[Biometric history]' line for the LLM, built from the rollups only.
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+ANALYTICS_DB_FILE = 'nexo_analytics.db'
+
+BLINK_RATE = "blink_rate"       # blinks per minute, one reading per minute
+HEART_RATE = "heart_rate"       # BPM from the ECG
+HRV = "hrv_rmssd_ms"            # RMSSD of the RR intervals, ms
+STRESS = "stress"               # label: Normal / Moderate Stress / High Stress
+STRESS_LEVELS = ("Normal", "Moderate Stress", "High Stress")
+
+# Fast streams are sampled: at most one stored reading per metric per interval
+RECORD_EVERY_SEC = {HEART_RATE: 10.0, HRV: 10.0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    ts REAL NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL,
+    label TEXT
+);
+CREATE INDEX IF NOT EXISTS events_metric_ts ON events (metric, ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    total REAL,
+    lo REAL,
+    hi REAL,
+    PRIMARY KEY (period, bucket, metric)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO rollups (period, bucket, metric, n, total, lo, hi) VALUES (?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT (period, bucket, metric) DO UPDATE SET
+    n = n + 1,
+    total = total + excluded.total,
+    lo = min(lo, excluded.lo),
+    hi = max(hi, excluded.hi)
+"""
+
+_PERIOD_FORMATS = {"hour": "%Y-%m-%d %H", "day": "%Y-%m-%d"}
+
+_HISTORY_TOPIC = re.compile(r"\b(stress\w*|blink\w*|heart|pulse|bpm|hrv|calm\w*|relaxed|tense|anxious)\b", re.I)
+_HISTORY_PERIOD = re.compile(r"\b(yesterday|today|this week|last week|past week|last (\d+) days)\b", re.I)
+
+
+def bucket_key(when, period):
+    """Rollup bucket for a timestamp, date or datetime, e.g. '2026-10-18 14' for 'hour'."""
+    if isinstance(when, (int, float)):
+        when = datetime.fromtimestamp(when)
+    elif not isinstance(when, datetime):
+        when = datetime(when.year, when.month, when.day)
+    return when.strftime(_PERIOD_FORMATS[period])
+
+
+def history_range(text, today=None):
+    """
+    (label, first_day, last_day) if `text` asks about biometrics over a past
+    period ("how stressed was I yesterday"), otherwise None.
+    """
+    if not _HISTORY_TOPIC.search(text):
+        return None
+    match = _HISTORY_PERIOD.search(text)
+    if not match:
+        return None
+    today = today or date.today()
+    phrase = match.group(1).lower()
+    if phrase == "yesterday":
+        day = today - timedelta(days=1)
+        return "yesterday", day, day
+    if phrase == "today":
+        return "today", today, today
+    if phrase == "this week":
+        return "this week", today - timedelta(days=today.weekday()), today
+    if phrase == "last week":
+        monday = today - timedelta(days=today.weekday() + 7)
+        return "last week", monday, monday + timedelta(days=6)
+    days = int(match.group(2)) if match.group(2) else 7
+    return f"the last {days} days", today - timedelta(days=days - 1), today
+
+
+class BiometricAnalytics:
+    """SQLite event log with incrementally maintained hourly and daily rollups."""
+
+    def __init__(self, path=ANALYTICS_DB_FILE, record_every_sec=None):
+        self.path = path
+        self.record_every_sec = dict(RECORD_EVERY_SEC if record_every_sec is None else record_every_sec)
+        self._lock = threading.Lock()
+        self._last_recorded = {}
+        # One connection shared by the video, voice and ECG threads, behind the lock
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    # --- writing ---
+    def record(self, metric, value=None, label=None, ts=None):
+        """
+        Stores one reading and updates its rollups. Returns False when the
+        reading was skipped by the RECORD_EVERY_SEC sampling.
+        """
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            every = self.record_every_sec.get(metric)
+            if every and ts - self._last_recorded.get(metric, float("-inf")) < every:
+                return False
+            self._last_recorded[metric] = ts
+            with self._db:
+                self._insert(metric, value, label, ts)
+        return True
+
+    def record_minute(self, stress_level, blink_rate, ts=None):
+        """The video loop's once-a-minute result: blink rate and stress level together."""
+        ts = time.time() if ts is None else ts
+        with self._lock, self._db:
+            self._insert(BLINK_RATE, blink_rate, None, ts)
+            self._insert(STRESS, None, stress_level, ts)
+
+    def import_stress_events(self, events):
+        """Loads old stress_detection_log.json events (only non-Normal minutes were logged)."""
+        with self._lock, self._db:
+            for event in events:
+                ts = datetime.fromisoformat(event["timestamp"]).timestamp()
+                self._insert(BLINK_RATE, event.get("blink_rate"), None, ts)
+                self._insert(STRESS, None, event.get("stress_level"), ts)
+        return len(events)
+
+    def _insert(self, metric, value, label, ts):
+        self._db.execute("INSERT INTO events (ts, metric, value, label) VALUES (?, ?, ?, ?)",
+                         (ts, metric, value, label))
+        rollup_metric = f"{STRESS}:{label}" if metric == STRESS else metric
+        for period in _PERIOD_FORMATS:
+            self._db.execute(_UPSERT, (period, bucket_key(ts, period), rollup_metric, value, value, value))
+
+    def is_empty(self):
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM events LIMIT 1").fetchone() is None
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # --- reading ---
+    def summary(self, start, end, period="day"):
+        """
+        {metric: {"count", "mean", "min", "max"}} over the buckets from `start`
+        to `end` (inclusive; dates, datetimes or timestamps). Stress levels
+        appear as 'stress:<level>' with only a count.
+        """
+        rows = self._query(
+            "SELECT metric, sum(n), sum(total), min(lo), max(hi) FROM rollups "
+            "WHERE period = ? AND bucket BETWEEN ? AND ? GROUP BY metric",
+            (period, bucket_key(start, period), bucket_key(end, period)))
+        result = {}
+        for metric, n, total, lo, hi in rows:
+            result[metric] = {"count": n}
+            if total is not None:
+                result[metric].update(mean=total / n, min=lo, max=hi)
+        return result
+
+    def series(self, metric, start, end, period="hour"):
+        """[(bucket, count, mean)] for one metric, e.g. blink rate per hour this week."""
+        return self._query(
+            "SELECT bucket, n, total / n FROM rollups "
+            "WHERE period = ? AND bucket BETWEEN ? AND ? AND metric = ? ORDER BY bucket",
+            (period, bucket_key(start, period), bucket_key(end, period), metric))
+
+    def most_stressed_hour(self, start, end):
+        """(hour bucket, stressed minutes) with the most non-Normal minutes, or None."""
+        rows = self._query(
+            "SELECT bucket, sum(n) AS stressed FROM rollups "
+            "WHERE period = 'hour' AND bucket BETWEEN ? AND ? AND metric IN (?, ?) "
+            "GROUP BY bucket ORDER BY stressed DESC, bucket LIMIT 1",
+            (bucket_key(start, "hour"), bucket_key(datetime(end.year, end.month, end.day, 23), "hour"),
+             f"{STRESS}:Moderate Stress", f"{STRESS}:High Stress"))
+        return rows[0] if rows else None
+
+    def _query(self, sql, params):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    # --- for the LLM ---
+    def describe(self, label, first_day, last_day):
+        """One '[Biometric history]' line for the days first_day..last_day."""
+        stats = self.summary(first_day, last_day)
+        span = first_day.isoformat() if first_day == last_day else f"{first_day.isoformat()} to {last_day.isoformat()}"
+        if not stats:
+            return f"[Biometric history] No biometric data was recorded for {label} ({span})."
+
+        parts = []
+        levels = [(level, stats.get(f"{STRESS}:{level}", {}).get("count", 0)) for level in STRESS_LEVELS]
+        minutes = sum(count for _, count in levels)
+        if minutes:
+            parts.append(f"Stress checks: {minutes} minutes ("
+                         + ", ".join(f"{level} {count}" for level, count in levels) + ")")
+            worst = self.most_stressed_hour(first_day, last_day)
+            if worst:
+                parts.append(f"Most stressed hour: {worst[0]}:00 ({worst[1]} stressed minutes)")
+        for metric, name, unit in ((BLINK_RATE, "Blink rate", "/min"), (HEART_RATE, "Heart rate", " BPM"),
+                                   (HRV, "HRV (RMSSD)", " ms")):
+            s = stats.get(metric)
+            if s and s.get("mean") is not None:
+                parts.append(f"{name}: avg {s['mean']:.1f}{unit} (min {s['min']:.0f}, max {s['max']:.0f})")
+        return f"[Biometric history] {label} ({span}): " + ". ".join(parts) + "."
+
+    def history_context(self, text, today=None):
+        """The history line for a question like "how stressed was I yesterday", else None."""
+        period = history_range(text, today)
+        return self.describe(*period) if period else None
@@ -0,0 +1,171 @@
+# --- NEXO BROWSER SESSION ---
+# One warm Chrome/Selenium session for the whole assistant.
+#  * The driver is prelaunched in the background at startup, so the first
+#    "open youtube" doesn't make the user wait for Chrome to boot.
+#  * "close browser" only hides the window (blank page + minimise); the
+#    driver stays alive, so the next "open" is instant.
+#  * A persistent profile directory keeps Chrome's cache between runs.
+#  * ALL driver calls run on one dedicated worker thread. Selenium drivers are
+#    not thread safe, and this way the voice thread never blocks on Chrome.
+#  * on_navigate (e.g. ElementResolver.clear) runs on the worker thread after
+#    every navigation, so per-page caches never outlive their page.
+#  * selenium itself is imported on the worker thread the first time the
+#    driver is needed, so importing this module costs nothing at startup.
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BROWSER_PROFILE_DIR = os.path.abspath('nexo_chrome_profile')
+# No implicit wait: lookups use explicit WebDriverWaits (nexo_element_resolver.py),
+# and Selenium warns that mixing the two gives unpredictable timeouts.
+BROWSER_IMPLICIT_WAIT_SEC = 0
+
+
+class BrowserSession:
+    """A single, reusable Chrome session driven from a dedicated worker thread."""
+
+    def __init__(self, driver_path=None, profile_dir=BROWSER_PROFILE_DIR, headless=False, on_navigate=None):
+        self.driver_path = driver_path
+        self.profile_dir = profile_dir
+        self.headless = headless
+        self.on_navigate = on_navigate
+        self.launch_time_sec = None
+        self._driver = None
+        self._visible = False
+        self._open_requested = False
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexo-browser")
+
+    # --- Public API (safe to call from any thread, never blocks) ---
+    def prelaunch(self):
+        """Starts Chrome in the background (minimised). Returns a Future."""
+        return self._submit_logged("prelaunch", self._prelaunch)
+
+    def submit(self, fn, *args):
+        """
+        Runs fn(driver, *args) on the browser worker and returns a Future.
+        The driver is (re)launched first if needed.
+        """
+        def task():
+            return fn(self._ensure_driver(), *args)
+        return self._worker.submit(task)
+
+    def open_url(self, url):
+        """Shows the window (if it was hidden) and navigates to url."""
+        self._open_requested = True
+        return self._submit_logged(f"open {url}", self._open_url, url)
+
+    def hide(self):
+        """'Closes' the browser for the user while keeping the driver warm."""
+        self._open_requested = False
+        return self._submit_logged("hide", self._hide)
+
+    @property
+    def is_open(self):
+        """True when the user has a browser window open (or one is being opened)."""
+        return self._open_requested
+
+    def shutdown(self, wait=True):
+        """Really quits Chrome and stops the worker thread."""
+        self._open_requested = False
+        self._worker.submit(self._quit)
+        self._worker.shutdown(wait=wait)
+
+    # --- Worker-thread helpers ---
+    def _submit_logged(self, what, fn, *args):
+        future = self._worker.submit(fn, *args)
+
+        def report(done):
+            error = done.exception()
+            if error is not None:
+                print(f"[ERROR - Browser]: {what} failed: {error}")
+        future.add_done_callback(report)
+        return future
+
+    def _build_options(self, webdriver):
+        options = webdriver.ChromeOptions()
+        if self.profile_dir:
+            options.add_argument(f"--user-data-dir={self.profile_dir}")
+        if self.headless:
+            options.add_argument("--headless=new")
+        options.add_argument("--no-first-run")
+        options.add_argument("--no-default-browser-check")
+        return options
+
+    def _driver_alive(self):
+        if self._driver is None:
+            return False
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            # The user closed the window by hand or Chrome crashed.
+            return False
+
+    def _ensure_driver(self):
+        if self._driver_alive():
+            return self._driver
+        try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.service import Service
+        except ImportError:
+            raise RuntimeError("selenium is not installed.")
+
+        print("[System]: Starting Chrome web driver...")
+        start = time.perf_counter()
+        if self.driver_path:
+            service = Service(executable_path=self.driver_path)
+        else:
+            # Let Selenium Manager find a matching driver.
+            service = Service()
+        self._driver = webdriver.Chrome(service=service, options=self._build_options(webdriver))
+        self._driver.implicitly_wait(BROWSER_IMPLICIT_WAIT_SEC)
+        self._visible = not self.headless
+        self.launch_time_sec = time.perf_counter() - start
+        print(f"[System]: Chrome ready in {self.launch_time_sec:.2f} s")
+        return self._driver
+
+    def _prelaunch(self):
+        self._ensure_driver()
+        self._hide()
+
+    def _show(self, driver):
+        if self._visible or self.headless:
+            self._visible = True
+            return
+        try:
+            driver.maximize_window()
+        except Exception:
+            pass
+        self._visible = True
+
+    def _open_url(self, url):
+        driver = self._ensure_driver()
+        self._show(driver)
+        driver.get(url)
+        self._navigated()
+
+    def _hide(self):
+        if not self._driver_alive():
+            self._visible = False
+            return
+        self._driver.get("about:blank")
+        self._navigated()
+        if not self.headless:
+            try:
+                self._driver.minimize_window()
+            except Exception:
+                pass
+        self._visible = False
+
+    def _navigated(self):
+        if self.on_navigate is not None:
+            self.on_navigate()
+
+    def _quit(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                print(f"[ERROR - Browser]: Error while closing Chrome: {e}")
+        self._driver = None
+        self._visible = False
@@ -0,0 +1,370 @@
+# --- NEXO CHAT HISTORY INDEX ---
+# Lets Nexo remember old conversations without sending the whole, ever
+# growing CHAT_HISTORY to the LLM. The prompt gets the recent messages plus
+# the few older turns that match the new question.
+#
+# One SQLite file (chat_index.db):
+#  * messages     - every chat message; id = position in CHAT_HISTORY + 1
+#  * messages_fts - FTS5 keyword index over the message text (BM25 ranking)
+#  * vectors      - one embedding per message (float32 scale + int8 codes),
+#                   so a restart does not have to embed everything again
+#
+# Vector search uses an in-memory IVF index (IvfIndex): spherical k-means
+# puts the vectors into ~sqrt(n) lists, and a query only scores the vectors
+# in the IVF_NPROBE lists whose centroids are closest. Until IVF_TRAIN_AT
+# vectors exist it is plain brute force; it is retrained whenever the index
+# has grown RETRAIN_GROWTH times.
+#
+# The embedding is hashed_ngram_embedding from nexo_response_cache (no
+# model, no download) unless a sentence-transformers model is configured
+# (sentence_embedding()). Without NumPy only keyword search is used.
+#
+# sync(history) indexes the messages appended since the last call, so the
+# index stays up to date at the cost of only the new messages. clear()
+# starts over (e.g. when the chat log was deleted).
+#
+# BM25 has to score every message that contains a query word, so keyword
+# queries only use the FTS_MAX_TERMS rarest words, and leave out words found
+# in more than COMMON_TERM_FRACTION of all messages. The document frequencies
+# are kept in memory (read once from the FTS vocabulary, then updated by
+# sync()).
+# recall(query, k, before) merges the keyword and vector rankings
+# (reciprocal rank fusion) and returns whole turns (question + reply).
+import math
+import re
+import sqlite3
+import threading
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from nexo_response_cache import hashed_ngram_embedding
+
+CHAT_INDEX_FILE = 'chat_index.db'
+HASHED_EMBEDDING = "hashed-ngram-256"
+
+IVF_TRAIN_AT = 2048          # brute force below this many vectors
+IVF_MAX_LISTS = 1024
+IVF_NPROBE = 16
+RETRAIN_GROWTH = 4
+TAIL_FRACTION = 0.02         # unsorted rows (scanned in full) before they are sorted in
+KMEANS_ITERATIONS = 8
+KMEANS_SAMPLE_PER_LIST = 40
+
+RRF_K = 60                   # reciprocal rank fusion: score = sum 1 / (RRF_K + rank)
+VECTOR_MIN_SCORE = 0.45      # cosine similarity below this is not a match
+FTS_MAX_TERMS = 8
+COMMON_TERM_FRACTION = 0.02  # words in more than 2% of the messages are left out of keyword queries
+COMMON_TERM_MIN_DOCS = 1000  # ... unless they are in fewer messages than this (cheap to score anyway)
+
+_WORD = re.compile(r"\w+")
+_STOP_WORDS = frozenset("""
+    the and for are but not you your yours was were have has had what when where which who why how
+    can could would should will shall this that these those with from into about than then them
+    they their there here its just like some any all our out get got did does doing
+    nexo please tell me my is am be do to of in on at an a i it so if or as by up
+""".split())
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (id INTEGER PRIMARY KEY, role TEXT NOT NULL, text TEXT NOT NULL);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(text, content='messages', content_rowid='id');
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_terms USING fts5vocab(messages_fts, 'row');
+CREATE TABLE IF NOT EXISTS vectors (id INTEGER PRIMARY KEY, vec BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def message_text(message):
+    """Text of a Gemini-style chat message ({"role", "parts": [{"text"}]})."""
+    return message['parts'][0]['text']
+
+
+def query_words(text):
+    """The distinct words of `text` worth searching for (no stop words, no 1-2 letter words)."""
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) > 2 and word not in _STOP_WORDS and word not in words:
+            words.append(word)
+    return words
+
+
+def recent_window_start(count, size):
+    """
+    Index of the first message to send in full. The start moves in steps of
+    half the window (kept even, so it is always a user message), so the
+    prompt prefix stays the same for several turns and the LLM server can
+    keep reusing its prompt cache.
+    """
+    if count <= size:
+        return 0
+    step = max(2, size // 2 // 2 * 2)
+    return (count - size) // step * step
+
+
+def sentence_embedding(model_name):
+    """
+    A sentence-transformers embedding function (e.g. 'all-MiniLM-L6-v2', runs
+    on the CPU), or None if the package is not installed.
+    """
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("[Chat Index]: sentence-transformers is not installed, using hashed n-gram embeddings.")
+        return None
+    model = SentenceTransformer(model_name, device="cpu")
+    return lambda text: model.encode(text, normalize_embeddings=True)
+
+
+def quantize(vectors):
+    """
+    int8 codes and one float32 scale per vector (vector ~= codes * scale).
+    A quarter of the memory of float32, and int8 -> float32 is much cheaper
+    than float16 -> float32 when a query scores its candidate vectors.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=1) / 127
+    scales[scales == 0] = 1.0
+    return np.rint(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+
+
+class IvfIndex:
+    """
+    Approximate nearest neighbours over (quantized) unit vectors; dot product
+    = cosine. Rows are kept sorted by list, so a probe scores contiguous
+    slices. Vectors added after the last sort go to an unsorted tail that is
+    scanned in full and sorted in once it reaches TAIL_FRACTION of the index.
+    """
+
+    def __init__(self, dims, nprobe=IVF_NPROBE, train_at=IVF_TRAIN_AT):
+        self.dims = dims
+        self.nprobe = nprobe
+        self.train_at = train_at
+        self.codes = np.empty((1024, dims), dtype=np.int8)
+        self.scales = np.empty(1024, dtype=np.float32)
+        self.ids = np.empty(1024, dtype=np.int64)
+        self.lists = np.empty(1024, dtype=np.int32)     # list of each row
+        self.size = 0
+        self.sorted_size = 0        # rows [0, sorted_size) are sorted by list
+        self.centroids = None
+        self.offsets = None         # list c = rows [offsets[c], offsets[c + 1])
+        self._trained_size = 0
+
+    @property
+    def nlist(self):
+        return 0 if self.centroids is None else len(self.centroids)
+
+    def add(self, ids, codes, scales):
+        start, end = self.size, self.size + len(codes)
+        if end > len(self.ids):
+            capacity = max(end, 2 * len(self.ids))
+            self.codes = np.resize(self.codes, (capacity, self.dims))
+            self.scales = np.resize(self.scales, capacity)
+            self.ids = np.resize(self.ids, capacity)
+            self.lists = np.resize(self.lists, capacity)
+        self.codes[start:end] = codes
+        self.scales[start:end] = scales
+        self.ids[start:end] = ids
+        self.size = end
+        if self.centroids is None:
+            if self.size >= self.train_at:
+                self.train()
+        elif self.size >= RETRAIN_GROWTH * self._trained_size:
+            self.train()
+        else:
+            self.lists[start:end] = self._nearest_centroid(start, end)
+            if self.size - self.sorted_size > TAIL_FRACTION * self.size:
+                self._sort()
+
+    def vectors(self, rows):
+        return self.codes[rows].astype(np.float32) * self.scales[rows, None]
+
+    def _nearest_centroid(self, start, end, chunk=8192):
+        return np.concatenate([np.argmax(self.vectors(slice(i, min(i + chunk, end))) @ self.centroids.T, axis=1)
+                               for i in range(start, end, chunk)])
+
+    def train(self):
+        """Spherical k-means on a sample, then every vector goes to its nearest centroid."""
+        rng = np.random.default_rng(0)
+        nlist = max(1, min(IVF_MAX_LISTS, int(math.sqrt(self.size))))
+        sample = self.vectors(rng.choice(self.size, min(self.size, nlist * KMEANS_SAMPLE_PER_LIST), replace=False))
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        self.centroids = centroids
+        self.lists[:self.size] = self._nearest_centroid(0, self.size)
+        self._sort()
+        self._trained_size = self.size
+
+    def _sort(self):
+        order = np.argsort(self.lists[:self.size], kind="stable")
+        for name in ("codes", "scales", "ids", "lists"):
+            column = getattr(self, name)
+            column[:self.size] = column[order]
+        self.offsets = np.searchsorted(self.lists[:self.size], np.arange(self.nlist + 1))
+        self.sorted_size = self.size
+
+    def search(self, query, k, max_id=None):
+        """[(id, score)] of the k best matches, best first (only ids <= max_id)."""
+        if not self.size:
+            return []
+        q = np.asarray(query, dtype=np.float32)
+        if self.centroids is None:
+            slices = [(0, self.size)]
+        else:
+            nprobe = min(self.nprobe, self.nlist)
+            probe = np.argpartition(self.centroids @ q, -nprobe)[-nprobe:]
+            slices = [(self.offsets[c], self.offsets[c + 1]) for c in probe.tolist()]
+            slices.append((self.sorted_size, self.size))
+        rows = np.concatenate([np.arange(a, b) for a, b in slices])
+        scores = np.concatenate([(self.codes[a:b].astype(np.float32) @ q) * self.scales[a:b] for a, b in slices])
+        if max_id is not None:
+            keep = self.ids[rows] <= max_id
+            rows, scores = rows[keep], scores[keep]
+        if not len(rows):
+            return []
+        top = np.argpartition(scores, -k)[-k:] if len(rows) > k else np.arange(len(rows))
+        top = top[np.argsort(-scores[top])]
+        return [(int(self.ids[rows[i]]), float(scores[i])) for i in top]
+
+
+class ChatIndex:
+    """Keyword (FTS5) + vector (IVF) index over the chat history (see the module header)."""
+
+    def __init__(self, path=CHAT_INDEX_FILE, embed=hashed_ngram_embedding, embed_name=HASHED_EMBEDDING):
+        self.path = path
+        self.embed = embed if np is not None else None
+        self.embed_name = embed_name
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.count = self._db.execute("SELECT count(*) FROM messages").fetchone()[0]
+        self._doc_freq = dict(self._db.execute("SELECT term, doc FROM messages_terms"))
+        self.ivf = None
+        if self.embed is not None:
+            self._load_vectors()
+
+    def _load_vectors(self):
+        stored = self._db.execute("SELECT value FROM meta WHERE key = 'embedding'").fetchone()
+        if stored and stored[0] != self.embed_name:
+            print(f"[Chat Index]: Embedding changed ({stored[0]} -> {self.embed_name}), re-embedding.")
+            with self._db:
+                self._db.execute("DELETE FROM vectors")
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('embedding', ?)", (self.embed_name,))
+        rows = self._db.execute("SELECT id, vec FROM vectors ORDER BY id").fetchall()
+        if rows:
+            dims = len(rows[0][1]) - 4
+            record = np.dtype([("scale", "<f4"), ("codes", "i1", (dims,))])
+            stored = np.frombuffer(b"".join(vec for _, vec in rows), dtype=record)
+            self.ivf = IvfIndex(dims)
+            self.ivf.add([i for i, _ in rows], stored["codes"], stored["scale"])
+        missing = self._db.execute(
+            "SELECT id, text FROM messages WHERE id NOT IN (SELECT id FROM vectors) ORDER BY id").fetchall()
+        if missing:
+            with self._db:
+                self._add_vectors(missing)
+
+    # --- writing ---
+    def sync(self, history):
+        """Indexes history[self.count:] and returns how many messages were added."""
+        with self._lock:
+            new = history[self.count:]
+            if not new:
+                return 0
+            rows = [(self.count + 1 + i, message['role'], message_text(message)) for i, message in enumerate(new)]
+            for _, _, text in rows:
+                for word in set(_WORD.findall(text.lower())):
+                    self._doc_freq[word] = self._doc_freq.get(word, 0) + 1
+            with self._db:
+                self._db.executemany("INSERT INTO messages (id, role, text) VALUES (?, ?, ?)", rows)
+                self._db.executemany("INSERT INTO messages_fts (rowid, text) VALUES (?, ?)",
+                                     [(i, text) for i, _, text in rows])
+                if self.embed is not None:
+                    self._add_vectors([(i, text) for i, _, text in rows])
+            self.count += len(rows)
+            return len(rows)
+
+    def _add_vectors(self, rows):
+        codes, scales = quantize([self.embed(text) for _, text in rows])
+        self._db.executemany("INSERT INTO vectors (id, vec) VALUES (?, ?)",
+                             [(i, scale.tobytes() + code.tobytes()) for (i, _), code, scale in zip(rows, codes, scales)])
+        if self.ivf is None:
+            self.ivf = IvfIndex(codes.shape[1])
+        self.ivf.add([i for i, _ in rows], codes, scales)
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM messages")
+            self._db.execute("INSERT INTO messages_fts (messages_fts) VALUES ('delete-all')")
+            self._db.execute("DELETE FROM vectors")
+            self.count = 0
+            self.ivf = None
+            self._doc_freq = {}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # --- searching ---
+    def keyword_search(self, query, k, before=None):
+        """[(id, bm25 rank)] best first, for messages with id <= before."""
+        with self._lock:
+            found = sorted((self._doc_freq[w], w) for w in query_words(query) if self._doc_freq.get(w))
+            if not found:
+                return []
+            limit = max(COMMON_TERM_MIN_DOCS, COMMON_TERM_FRACTION * self.count)
+            words = [w for df, w in found if df <= limit][:FTS_MAX_TERMS] or [found[0][1]]
+            match = " OR ".join(f'"{w}"' for w in words)
+            return self._db.execute(
+                "SELECT rowid, rank FROM messages_fts WHERE messages_fts MATCH ? AND rowid <= ? "
+                "ORDER BY rank LIMIT ?", (match, self.count if before is None else before, k)).fetchall()
+
+    def vector_search(self, query, k, before=None):
+        """[(id, cosine)] best first, only matches scoring at least VECTOR_MIN_SCORE."""
+        if self.embed is None or self.ivf is None:
+            return []
+        vector = self.embed(query)
+        with self._lock:
+            hits = self.ivf.search(vector, k, max_id=before)
+        return [(i, score) for i, score in hits if score >= VECTOR_MIN_SCORE]
+
+    def search(self, query, k=5, before=None):
+        """Message ids ranked by reciprocal rank fusion of the keyword and vector results."""
+        scores = {}
+        for hits in (self.keyword_search(query, 4 * k, before), self.vector_search(query, 4 * k, before)):
+            for rank, (i, _) in enumerate(hits):
+                scores[i] = scores.get(i, 0.0) + 1.0 / (RRF_K + rank)
+        return sorted(scores, key=scores.get, reverse=True)[:k]
+
+    def recall(self, query, k=3, before=None):
+        """
+        The k best matching turns among messages[0:before] as Gemini-style
+        messages in chat order; each hit brings its question or reply along.
+        """
+        hits = self.search(query, k, before)
+        if not hits:
+            return []
+        limit = self.count if before is None else before
+        wanted = set()
+        for i in hits:
+            wanted.update(j for j in (i - 1, i, i + 1) if 1 <= j <= limit)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT id, role, text FROM messages WHERE id IN ({','.join('?' * len(wanted))}) ORDER BY id",
+                sorted(wanted)).fetchall()
+        # a hit on a question brings its reply, a hit on a reply brings its question
+        by_id = {i: (role, text) for i, role, text in rows}
+        turns = []
+        for i in sorted(hits):
+            role, _ = by_id[i]
+            pair = (i, i + 1) if role == "user" else (i - 1, i)
+            turns.extend(j for j in pair if j in by_id and j not in turns)
+        return [{"role": by_id[j][0], "parts": [{"text": by_id[j][1]}]} for j in sorted(turns)]
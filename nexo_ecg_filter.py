@@ -0,0 +1,130 @@
+# --- NEXO STREAMING ECG FILTER ---
+# Cleans the raw ADC stream before peak detection and plotting:
+#  * high-pass  - removes baseline wander (breathing, electrode drift)
+#  * notch      - removes 50/60 Hz mains hum
+#  * low-pass   - smooths EMG/high frequency noise
+#
+# The chain is one array of SciPy second-order sections (numerically stable
+# at low cut-off frequencies, unlike one big transfer function). It is run
+# block by block with sosfilt(zi=...): the filter state at the end of one
+# block is the initial state of the next, so processing a stream in chunks of
+# any size gives exactly the same output as filtering it in one go. The state
+# starts at the steady state for the first sample, so the output doesn't ring
+# when the stream starts.
+#
+# If the sample rate is not configured, EcgFilter measures it from the first
+# RATE_WARMUP_SAMPLES timestamps and passes samples through until then.
+# A notch at or above Nyquist is moved to where the hum actually shows up
+# after sampling (e.g. 60 Hz hum sampled at 100 Hz appears at 40 Hz).
+import numpy as np
+
+try:
+    from scipy import signal
+except ImportError:
+    signal = None
+
+# (kind, frequency Hz, order for butterworth stages / Q for notches)
+DEFAULT_CHAIN = (
+    ("highpass", 0.5, 2),
+    ("notch", 50.0, 30.0),
+    ("lowpass", 40.0, 4),
+)
+RATE_WARMUP_SAMPLES = 256
+
+
+def aliased_frequency(freq, sample_rate):
+    """Where a tone at `freq` appears after sampling at `sample_rate` (0..Nyquist)."""
+    folded = freq % sample_rate
+    return min(folded, sample_rate - folded)
+
+
+def design_chain(sample_rate, chain=DEFAULT_CHAIN):
+    """
+    SOS array (n_sections, 6) for the chain at this sample rate. Stages that
+    can't exist at this rate (a low-pass above Nyquist, a notch aliased onto
+    DC or Nyquist) are left out. None if nothing is left.
+    """
+    nyquist = sample_rate / 2
+    sections = []
+    for kind, freq, param in chain:
+        if kind == "notch":
+            freq = aliased_frequency(freq, sample_rate)
+            if not 0.01 * nyquist < freq < 0.99 * nyquist:
+                continue
+            b, a = signal.iirnotch(freq, param, fs=sample_rate)
+            sections.append(signal.tf2sos(b, a))
+        elif kind in ("highpass", "lowpass"):
+            if not 0 < freq < 0.95 * nyquist:
+                continue
+            sections.append(signal.butter(int(param), freq, kind, fs=sample_rate, output="sos"))
+        else:
+            raise ValueError(f"unknown filter stage {kind!r}")
+    return np.vstack(sections) if sections else None
+
+
+class SosStream:
+    """sosfilt over consecutive blocks of one channel, with the state carried across blocks."""
+
+    def __init__(self, sos):
+        self.sos = np.ascontiguousarray(sos, dtype=np.float64)
+        self._zi_step = signal.sosfilt_zi(self.sos)     # steady state for a unit input
+        self.zi = None
+
+    def reset(self, first_sample=0.0):
+        self.zi = self._zi_step * first_sample
+
+    def process(self, block):
+        """Filters one block (any length) and returns the filtered float64 samples."""
+        x = np.asarray(block, dtype=np.float64)
+        if x.size == 0:
+            return x
+        if self.zi is None:
+            self.reset(x[0])
+        y, self.zi = signal.sosfilt(self.sos, x, zi=self.zi)
+        return y
+
+
+class EcgFilter:
+    """
+    The ECG filter for a live stream. process(values, timestamps) returns the
+    filtered block; samples pass through unchanged while the sample rate is
+    still being measured (or when SciPy is not installed).
+    """
+
+    def __init__(self, sample_rate=None, chain=DEFAULT_CHAIN, warmup=RATE_WARMUP_SAMPLES):
+        self.chain = chain
+        self.sample_rate = None
+        self.stream = None
+        self._warmup = warmup
+        self._first_times = []
+        if signal is None:
+            print("[ECG Filter]: SciPy is not installed, the ECG is not filtered (pip install scipy).")
+        elif sample_rate:
+            self._configure(sample_rate)
+
+    @property
+    def active(self):
+        return self.stream is not None
+
+    def _configure(self, sample_rate):
+        self.sample_rate = sample_rate
+        sos = design_chain(sample_rate, self.chain)
+        self.stream = SosStream(sos) if sos is not None else None
+        print(f"[ECG Filter]: {sample_rate:.0f} Hz, {0 if sos is None else len(sos)} second-order sections")
+
+    def _measure_rate(self, timestamps):
+        self._first_times.extend(timestamps)
+        if len(self._first_times) >= self._warmup:
+            # Serial lines arrive in bursts, so use the average rate, not the median interval
+            span = self._first_times[-1] - self._first_times[0]
+            count = len(self._first_times) - 1
+            self._first_times = []
+            if span > 0:
+                self._configure(count / span)
+
+    def process(self, values, timestamps=None):
+        if self.stream is not None:
+            return self.stream.process(values)
+        if signal is not None and self.sample_rate is None and timestamps is not None:
+            self._measure_rate(timestamps)
+        return np.asarray(values, dtype=np.float64)
@@ -0,0 +1,197 @@
+# --- NEXO ECG SAMPLE STORE ---
+# Keeps a whole ECG session on disk, so hours of data can be browsed without
+# holding (or plotting) millions of points:
+#  * values.i16 / times.f64 - every sample and its timestamp, memory-mapped
+#    and grown in CHUNK_SAMPLES steps
+#  * minmax<k>.i16          - a min/max pyramid: level 0 has one (min, max)
+#    pair per BUCKET samples, every next level one per FANOUT buckets of the
+#    level below (16, 128, 1024, 8192, 65536 samples)
+#  * meta.json              - sample count, written every META_EVERY_SEC
+#
+# append() only queues the sample; flush() (called by the GUI before it
+# draws) writes the batch and updates the pyramid incrementally: only the
+# buckets the new samples fall into are recomputed on each level.
+#
+# envelope(t_start, t_end, columns) returns at most `columns` (time, min, max)
+# triples for any time range, read from the deepest pyramid level that still
+# has at least one bucket per column. Drawing an hour costs the same as
+# drawing ten seconds: O(pixels).
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+BUCKET = 16
+FANOUT = 8
+LEVELS = 5
+CHUNK_SAMPLES = 1 << 20
+META_EVERY_SEC = 1.0
+
+
+class _MappedColumn:
+    """A growable memory-mapped array file of shape (capacity,) or (capacity, width)."""
+
+    def __init__(self, path, dtype, width=None):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.array = None
+        self.capacity = 0
+        if os.path.exists(path):
+            row_bytes = self.dtype.itemsize * (width or 1)
+            self._map(os.path.getsize(path) // row_bytes)
+
+    def _map(self, capacity):
+        self.capacity = capacity
+        if capacity == 0:
+            self.array = None
+            return
+        shape = (capacity, self.width) if self.width else (capacity,)
+        self.array = np.memmap(self.path, dtype=self.dtype, mode="r+", shape=shape)
+
+    def reserve(self, rows, chunk):
+        if rows <= self.capacity:
+            return
+        capacity = -(-max(rows, 2 * self.capacity) // chunk) * chunk
+        if self.array is not None:
+            self.array.flush()
+            self.array = None        # the file can't be resized while mapped (Windows)
+        with open(self.path, "ab") as f:
+            f.truncate(capacity * self.dtype.itemsize * (self.width or 1))
+        self._map(capacity)
+
+    def flush(self):
+        if self.array is not None:
+            self.array.flush()
+
+
+class EcgSampleStore:
+    """On-disk ECG samples with an incremental min/max pyramid (see the module header)."""
+
+    def __init__(self, path, bucket=BUCKET, fanout=FANOUT, levels=LEVELS):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.bucket_sizes = [bucket * fanout ** k for k in range(levels)]
+        self._factors = [bucket] + [fanout] * (levels - 1)
+        self._meta_path = os.path.join(path, "meta.json")
+        self.count = 0
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self.count = json.load(f)["count"]
+        self._values = _MappedColumn(os.path.join(path, "values.i16"), np.int16)
+        self._times = _MappedColumn(os.path.join(path, "times.f64"), np.float64)
+        self._levels = [_MappedColumn(os.path.join(path, f"minmax{k}.i16"), np.int16, 2) for k in range(levels)]
+        self._lock = threading.Lock()
+        self._pending_values = []
+        self._pending_times = []
+        self._meta_written = 0.0
+
+    # --- writing ---
+    def append(self, value, timestamp):
+        """Queues one sample (any thread). Timestamps must not go backwards."""
+        with self._lock:
+            self._pending_values.append(value)
+            self._pending_times.append(timestamp)
+
+    def flush(self):
+        """Writes the queued samples and updates the pyramid. Returns the number written."""
+        with self._lock:
+            values, self._pending_values = self._pending_values, []
+            times, self._pending_times = self._pending_times, []
+            if not values:
+                return 0
+            start, end = self.count, self.count + len(values)
+            self._values.reserve(end, CHUNK_SAMPLES)
+            self._times.reserve(end, CHUNK_SAMPLES)
+            self._values.array[start:end] = np.clip(values, -32768, 32767)
+            self._times.array[start:end] = times
+            self.count = end
+            self._update_pyramid(start, end)
+            now = time.monotonic()
+            if now - self._meta_written >= META_EVERY_SEC:
+                self._write_meta()
+                self._meta_written = now
+            return len(values)
+
+    def _update_pyramid(self, start, end):
+        """Recomputes every bucket that samples [start, end) fall into, level by level."""
+        lows = highs = self._values.array
+        lo, hi = start, end
+        for factor, column in zip(self._factors, self._levels):
+            first, last = lo // factor, -(-hi // factor)
+            base = first * factor
+            offsets = np.arange(0, hi - base, factor)
+            column.reserve(last, max(1, CHUNK_SAMPLES // factor))
+            column.array[first:last, 0] = np.minimum.reduceat(lows[base:hi], offsets)
+            column.array[first:last, 1] = np.maximum.reduceat(highs[base:hi], offsets)
+            lows, highs = column.array[:, 0], column.array[:, 1]
+            lo, hi = first, last
+
+    def _write_meta(self):
+        tmp = self._meta_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"count": self.count, "bucket_sizes": self.bucket_sizes}, f)
+        os.replace(tmp, self._meta_path)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            for column in [self._values, self._times] + self._levels:
+                column.flush()
+            self._write_meta()
+
+    # --- reading ---
+    @property
+    def start_time(self):
+        return float(self._times.array[0]) if self.count else None
+
+    @property
+    def end_time(self):
+        return float(self._times.array[self.count - 1]) if self.count else None
+
+    def index_range(self, t_start, t_end):
+        times = self._times.array[:self.count]
+        return int(np.searchsorted(times, t_start, "left")), int(np.searchsorted(times, t_end, "right"))
+
+    def samples(self, t_start, t_end):
+        """Raw (times, values) copies for a (short) time range."""
+        with self._lock:
+            i0, i1 = self.index_range(t_start, t_end)
+            return np.array(self._times.array[i0:i1]), np.array(self._values.array[i0:i1])
+
+    def envelope(self, t_start, t_end, columns):
+        """
+        Up to `columns` (times, mins, maxs) arrays covering [t_start, t_end].
+        Below one sample per column the raw samples are returned (mins == maxs).
+        """
+        with self._lock:
+            if not self.count:
+                empty = np.empty(0)
+                return empty, empty, empty
+            i0, i1 = self.index_range(t_start, t_end)
+            n = i1 - i0
+            if n <= columns:
+                values = np.array(self._values.array[i0:i1])
+                return np.array(self._times.array[i0:i1]), values, values
+
+            per_column = n / columns
+            level = None
+            for k, size in enumerate(self.bucket_sizes):
+                if size <= per_column:
+                    level = k
+            if level is None:
+                size, b0 = 1, i0
+                lows = highs = self._values.array[i0:i1]
+            else:
+                size = self.bucket_sizes[level]
+                b0, b1 = i0 // size, -(-i1 // size)
+                pairs = self._levels[level].array[b0:b1]
+                lows, highs = pairs[:, 0], pairs[:, 1]
+
+            edges = np.unique(np.arange(columns) * len(lows) // columns)
+            mins = np.minimum.reduceat(lows, edges)
+            maxs = np.maximum.reduceat(highs, edges)
+            first_sample = np.minimum(b0 * size + edges * size, self.count - 1)
+            return np.array(self._times.array[first_sample]), mins, maxs
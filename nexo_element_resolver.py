@@ -0,0 +1,202 @@
+# --- NEXO ELEMENT RESOLVER (for ACTION: CLICK) ---
+# The old click lookup was a five-way XPath union with translate() over every
+# button, link and div on the page, plus a 10 s WebDriverWait. On heavy pages
+# (Spotify) that is very slow, and the element name was pasted raw into the
+# XPath, so a name with a quote in it broke the query.
+#
+# Here instead:
+#  1. ONE injected JavaScript pass indexes the clickable elements on the page
+#     by normalised text, aria-label and id.
+#  2. The index is cached per document (a token the script stores on the
+#     page's window, so a reload or navigation - even to the same URL - is a
+#     new document) in a small LRU; the browser session clears it whenever
+#     it navigates. A MutationObserver in the page marks the index dirty when
+#     the DOM changes, so it is only rebuilt when needed.
+#  3. The spoken name is fuzzy-matched against the index in Python.
+#  4. If nothing matches, a short XPath fallback runs with the name properly
+#     escaped (see xpath_literal).
+import difflib
+import re
+from collections import OrderedDict
+
+FUZZY_THRESHOLD = 0.6
+FALLBACK_WAIT_SEC = 2
+# Documents whose index is kept (pages reached by clicks; back/forward can restore them)
+INDEX_CACHE_SIZE = 4
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_SPACES = re.compile(r"\s+")
+
+# Tags/roles the user most likely means when they say "click X".
+_PREFERRED_TAGS = {"button", "a", "input"}
+
+# Builds window.__nexoIndex (the element handles) and returns
+# [document token, [[index, text, aria-label, id, tag, role], ...]].
+INDEX_SCRIPT = """
+if (!window.__nexoDoc) {
+    window.__nexoDoc = Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+var SELECTOR = 'button, a, input[type="button"], input[type="submit"], [role="button"], [role="link"], ' +
+               '[role="menuitem"], [role="tab"], [role="option"], [onclick], [tabindex], [aria-label], [id]';
+var nodes = document.querySelectorAll(SELECTOR);
+var index = [], entries = [];
+for (var i = 0; i < nodes.length; i++) {
+    var el = nodes[i];
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 && rect.height === 0) { continue; }
+    var text = (el.innerText || el.value || '').trim().slice(0, 200);
+    entries.push([index.length, text, el.getAttribute('aria-label') || '', el.id || '',
+                  el.tagName.toLowerCase(), el.getAttribute('role') || '']);
+    index.push(el);
+}
+window.__nexoIndex = index;
+window.__nexoDirty = false;
+if (!window.__nexoObserver) {
+    window.__nexoObserver = new MutationObserver(function () { window.__nexoDirty = true; });
+    window.__nexoObserver.observe(document.documentElement, {
+        childList: true, subtree: true, attributes: true,
+        attributeFilter: ['aria-label', 'id', 'hidden', 'disabled']
+    });
+}
+return [window.__nexoDoc, entries];
+"""
+
+# Cheap check before reusing the cached index (one round trip, no DOM walk).
+STATE_SCRIPT = "return [window.__nexoDoc || null, window.__nexoIndex ? window.__nexoDirty : true];"
+
+GET_ELEMENT_SCRIPT = "return window.__nexoIndex[arguments[0]];"
+
+
+def normalize_label(text):
+    """Lower-case, punctuation and '-'/'_' turned into spaces, single spaces."""
+    text = _NON_WORD.sub(" ", text.lower().replace("_", " ").replace("-", " "))
+    return _SPACES.sub(" ", text).strip()
+
+
+def xpath_literal(text):
+    """
+    Returns text as a safe XPath string literal.
+    XPath 1.0 has no escape character, so a string containing both quote
+    types has to be built with concat().
+    """
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+def fallback_xpath(element_name):
+    """The old lookup, with the name escaped instead of interpolated raw."""
+    literal = xpath_literal(element_name.lower())
+    lower = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return (f"//button[contains({lower}, {literal})] | "
+            f"//a[contains({lower}, {literal})] | "
+            f"//*[contains(@aria-label, {literal})] | "
+            f"//*[contains(@id, {literal})]")
+
+
+def _field_score(query, field):
+    if not field:
+        return 0.0
+    if field == query:
+        return 1.0
+    if query in field:
+        # Prefer the tightest match: "play" should hit the "Play" button,
+        # not a 300 character card that happens to contain "play".
+        return 0.65 + 0.3 * len(query) / len(field)
+    if len(field) <= 3 * len(query) + 10:
+        ratio = difflib.SequenceMatcher(None, query, field).ratio()
+        return 0.85 * ratio
+    return 0.0
+
+
+def score_entry(query, entry):
+    """Score (0..1+) of one index entry for an already normalised query."""
+    _, text, aria, element_id, tag, role = entry
+    best = max(_field_score(query, normalize_label(text)),
+               _field_score(query, normalize_label(aria)),
+               _field_score(query, normalize_label(element_id)))
+    if best and (tag in _PREFERRED_TAGS or role):
+        best += 0.05
+    return best
+
+
+def best_match(element_name, entries, threshold=FUZZY_THRESHOLD):
+    """Returns (index, score) of the best matching entry, or (None, score)."""
+    query = normalize_label(element_name)
+    if not query:
+        return None, 0.0
+    best_index, best_score = None, 0.0
+    for entry in entries:
+        score = score_entry(query, entry)
+        if score > best_score:
+            best_index, best_score = entry[0], score
+    if best_score >= threshold:
+        return best_index, best_score
+    return None, best_score
+
+
+class ElementResolver:
+    """Finds clickable elements by spoken name. Use from the browser worker thread only."""
+
+    def __init__(self, max_documents=INDEX_CACHE_SIZE):
+        self.max_documents = max_documents
+        self._cache = OrderedDict()   # document token -> index entries, least recently used first
+        self._document = None         # token of the page the last lookup ran on
+        self.metrics = {"index_builds": 0, "index_reuses": 0, "fallbacks": 0, "evictions": 0}
+
+    def clear(self):
+        """Forgets every cached index (the browser navigated). Browser worker thread."""
+        self._cache.clear()
+        self._document = None
+
+    def _entries(self, driver):
+        document, dirty = driver.execute_script(STATE_SCRIPT)
+        if not dirty and document in self._cache:
+            self._cache.move_to_end(document)
+            self._document = document
+            self.metrics["index_reuses"] += 1
+            return self._cache[document]
+        document, entries = driver.execute_script(INDEX_SCRIPT)
+        self._cache[document] = entries
+        self._cache.move_to_end(document)
+        while len(self._cache) > self.max_documents:
+            self._cache.popitem(last=False)
+            self.metrics["evictions"] += 1
+        self._document = document
+        self.metrics["index_builds"] += 1
+        return entries
+
+    def find(self, driver, element_name):
+        """Returns the WebElement that best matches element_name, or None."""
+        index, _ = best_match(element_name, self._entries(driver))
+        if index is not None:
+            return driver.execute_script(GET_ELEMENT_SCRIPT, index)
+
+        # Nothing in the index (e.g. the page is still loading): short, escaped XPath.
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        self.metrics["fallbacks"] += 1
+        try:
+            return WebDriverWait(driver, FALLBACK_WAIT_SEC).until(
+                EC.element_to_be_clickable((By.XPATH, fallback_xpath(element_name))))
+        except TimeoutException:
+            return None
+
+    def click(self, driver, element_name):
+        """Finds and clicks element_name. Raises LookupError if nothing matches."""
+        element = self.find(driver, element_name)
+        if element is None:
+            raise LookupError(f"No clickable element matching '{element_name}'")
+        try:
+            element.click()
+        except Exception:
+            # Covered by an overlay or not scrolled into view: let the page click it.
+            driver.execute_script("arguments[0].click();", element)
+        # The click usually changes the page; rebuild next time.
+        self._cache.pop(self._document, None)
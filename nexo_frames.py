@@ -0,0 +1,75 @@
+# --- NEXO FRAME BUFFERS & HUD ---
+# Keeps the video loop from allocating new full-size arrays every frame:
+#  * FrameBuffers - the camera reads into one reused array (cap.read(image=)),
+#    and the mirrored frame is written into a second one (cv2.flip(dst=)).
+#  * HudOverlay   - the status text lives in a persistent overlay + mask.
+#    A line is only re-rendered when its text or colour changes; every frame
+#    the overlay is just copied onto the frame through the mask, in place.
+import cv2
+import numpy as np
+
+HUD_HEIGHT = 160
+HUD_LINE_ABOVE = 22   # pixels above a line's baseline that belong to it
+HUD_LINE_BELOW = 8
+
+
+class FrameBuffers:
+    """Reused capture and display frames for one camera."""
+
+    def __init__(self, shape):
+        self._allocate(tuple(shape))
+        self.reallocations = 0
+
+    def _allocate(self, shape):
+        self.raw = np.empty(shape, dtype=np.uint8)
+        self.frame = np.empty(shape, dtype=np.uint8)
+
+    def read(self, cap):
+        """Reads and mirrors the next frame. Returns (ok, frame); `frame` is reused every call."""
+        ok, image = cap.read(image=self.raw)
+        if not ok:
+            return False, None
+        if image is not self.raw:
+            # The driver changed the frame size (or ignored our buffer): adopt it.
+            self.reallocations += 1
+            self.raw = image
+            self.frame = np.empty_like(image)
+        cv2.flip(self.raw, 1, dst=self.frame)
+        return True, self.frame
+
+
+class HudOverlay:
+    """Status text drawn once into an overlay, re-rendered per line when it changes."""
+
+    def __init__(self, width, height=HUD_HEIGHT):
+        self.overlay = np.zeros((height, width, 3), dtype=np.uint8)
+        self.mask = np.zeros((height, width, 1), dtype=np.uint8)
+        self._where = self.mask.view(bool)
+        self._lines = {}      # key -> (text, org, color, scale, thickness)
+        self.renders = 0
+
+    def set_line(self, key, text, org, color, scale=0.7, thickness=2):
+        """Shows `text` at `org` (baseline). Cheap when nothing changed."""
+        line = (text, org, color, scale, thickness)
+        if self._lines.get(key) == line:
+            return
+        old = self._lines.get(key)
+        if old is not None:
+            self._clear(old[1])
+        self._clear(org)
+        self._lines[key] = line
+        cv2.putText(self.overlay, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        # 0/1 mask drawn without anti-aliasing, so it can be viewed as bool
+        cv2.putText(self.mask, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, 1, thickness)
+        self.renders += 1
+
+    def _clear(self, org):
+        top = max(0, org[1] - HUD_LINE_ABOVE)
+        bottom = min(self.overlay.shape[0], org[1] + HUD_LINE_BELOW)
+        self.overlay[top:bottom] = 0
+        self.mask[top:bottom] = 0
+
+    def apply(self, frame):
+        """Copies the HUD onto the top of `frame`, in place."""
+        height, width = self.overlay.shape[:2]
+        np.copyto(frame[:height, :width], self.overlay, where=self._where)
@@ -0,0 +1,171 @@
+# --- NEXO FRAME-RATE GOVERNOR ---
+# Decides, frame by frame, how fast the video loop should capture and how
+# often the (expensive) face/eye detection + tracking should run:
+#  * "full"    - the car is FOLLOWING / AVOIDING / SPINNING, or motion was just
+#                seen: full capture rate, detection on every frame.
+#  * "idle"    - car IDLE and a face is in view: lower capture rate, still
+#                detecting every frame. The vision pipeline scales its blink
+#                threshold to the measured frame rate (one frame without
+#                eyes at 15 fps instead of two at 30), so short blinks count.
+#  * "standby" - no face for NO_FACE_STANDBY_SEC and nothing moving: a few
+#                frames per second, detection on every Nth frame only.
+# Motion is found by cheap frame differencing on a tiny grayscale copy of the
+# frame; any motion switches straight back to "full".
+import time
+from collections import Counter, namedtuple
+
+import cv2
+import numpy as np
+
+MODE_FULL = "full"
+MODE_IDLE = "idle"
+MODE_STANDBY = "standby"
+
+# mode -> (capture fps, run detection on every Nth frame)
+GOVERNOR_MODES = {
+    MODE_FULL: (30.0, 1),
+    MODE_IDLE: (15.0, 1),
+    MODE_STANDBY: (4.0, 2),
+}
+ACTIVE_CAR_STATES = ("FOLLOWING", "AVOIDING", "SPINNING")
+NO_FACE_STANDBY_SEC = 5.0
+MOTION_HOLD_SEC = 2.0
+MOTION_SIZE = (64, 48)
+MOTION_THRESHOLD = 6.0   # mean absolute difference (0-255) that counts as motion
+
+GovernorDecision = namedtuple("GovernorDecision", ["mode", "detect"])
+
+
+class MotionDetector:
+    """Frame differencing on a downscaled grayscale copy of the frame."""
+
+    def __init__(self, size=MOTION_SIZE, threshold=MOTION_THRESHOLD):
+        self.size = size
+        self.threshold = threshold
+        self.last_score = 0.0
+        # Reused buffers: colour thumbnail, two grayscale thumbnails, difference
+        width, height = size
+        self._small = np.empty((height, width, 3), dtype=np.uint8)
+        self._gray = [np.empty((height, width), dtype=np.uint8) for _ in range(2)]
+        self._diff = np.empty((height, width), dtype=np.uint8)
+        self._current = 0
+        self._frames = 0
+
+    def update(self, frame):
+        """Returns True when this frame differs enough from the previous one."""
+        cv2.resize(frame, self.size, dst=self._small, interpolation=cv2.INTER_AREA)
+        current, previous = self._gray[self._current], self._gray[1 - self._current]
+        cv2.cvtColor(self._small, cv2.COLOR_BGR2GRAY, dst=current)
+        self._current = 1 - self._current
+        self._frames += 1
+        if self._frames < 2:
+            return False
+        cv2.absdiff(current, previous, dst=self._diff)
+        self.last_score = cv2.mean(self._diff)[0]
+        return self.last_score > self.threshold
+
+
+class FrameRateGovernor:
+    """Picks the capture rate and detection frequency from the car state, faces and motion."""
+
+    def __init__(self, modes=GOVERNOR_MODES, no_face_sec=NO_FACE_STANDBY_SEC,
+                 motion_hold_sec=MOTION_HOLD_SEC, motion=None):
+        self.modes = dict(modes)
+        self.no_face_sec = no_face_sec
+        self.motion_hold_sec = motion_hold_sec
+        self.motion = motion if motion is not None else MotionDetector()
+        self.mode = MODE_FULL
+        self._frame_in_mode = 0
+        self._last_face = None       # set on the first decide()
+        self._last_motion = None
+        self._frame_start = None
+
+        # metrics
+        self.frames = Counter()          # mode -> frames captured
+        self.detections = Counter()      # mode -> frames sent to detection
+        self.wall_sec = Counter()        # mode -> seconds spent
+        self.cpu_sec = Counter()         # mode -> process CPU seconds spent
+        self.switches = []               # (time, old mode, new mode, reason)
+        self._mark_wall = None
+        self._mark_cpu = None
+
+    def face_seen(self, now=None):
+        """Call when a processed frame contained a face."""
+        self._last_face = time.monotonic() if now is None else now
+
+    def _choose(self, car_state, moving, now):
+        if car_state in ACTIVE_CAR_STATES:
+            return MODE_FULL, f"car {car_state}"
+        if moving or now - self._last_motion < self.motion_hold_sec:
+            return MODE_FULL, "motion"
+        if now - self._last_face < self.no_face_sec:
+            return MODE_IDLE, "face in view"
+        return MODE_STANDBY, f"no face for {self.no_face_sec:.0f} s"
+
+    def _account(self, now):
+        cpu = time.process_time()
+        if self._mark_wall is not None:
+            self.wall_sec[self.mode] += now - self._mark_wall
+            self.cpu_sec[self.mode] += cpu - self._mark_cpu
+        self._mark_wall = now
+        self._mark_cpu = cpu
+
+    def decide(self, frame, car_state, now=None):
+        """
+        Called once per captured frame, before any drawing.
+        Returns (mode, detect): detect says whether this frame goes to detection.
+        """
+        now = time.monotonic() if now is None else now
+        if self._last_face is None:
+            self._last_face = self._last_motion = now
+        moving = self.motion.update(frame)
+        if moving:
+            self._last_motion = now
+
+        mode, reason = self._choose(car_state, moving, now)
+        self._account(now)
+        if mode != self.mode:
+            self.switches.append((now, self.mode, mode, reason))
+            print(f"[Governor]: {self.mode} -> {mode} ({reason})")
+            self.mode = mode
+            self._frame_in_mode = 0
+
+        fps, detect_every = self.modes[mode]
+        detect = self._frame_in_mode % detect_every == 0
+        self._frame_in_mode += 1
+        self.frames[mode] += 1
+        if detect:
+            self.detections[mode] += 1
+
+        self._frame_start = time.monotonic()
+        return GovernorDecision(mode, detect)
+
+    def wait_ms(self):
+        """Delay for cv2.waitKey(): what is left of this frame's time budget (at least 1 ms)."""
+        fps, _ = self.modes[self.mode]
+        spent_ms = 0.0 if self._frame_start is None else (time.monotonic() - self._frame_start) * 1000.0
+        return max(1, int(1000.0 / fps - spent_ms))
+
+    def metrics(self):
+        """Decisions and savings so far, compared to running every frame at full rate."""
+        if self._mark_wall is not None:
+            self._account(time.monotonic())
+        wall = sum(self.wall_sec.values())
+        full_fps, _ = self.modes[MODE_FULL]
+        full_rate_detections = wall * full_fps
+        detections = sum(self.detections.values())
+        full_cpu_per_sec = (self.cpu_sec[MODE_FULL] / self.wall_sec[MODE_FULL]) if self.wall_sec[MODE_FULL] > 0 else None
+        cpu = sum(self.cpu_sec.values())
+        return {
+            "mode": self.mode,
+            "frames": dict(self.frames),
+            "detections": dict(self.detections),
+            "seconds_in_mode": {mode: round(sec, 1) for mode, sec in self.wall_sec.items()},
+            "cpu_percent_in_mode": {mode: round(100.0 * self.cpu_sec[mode] / sec, 1)
+                                    for mode, sec in self.wall_sec.items() if sec > 0},
+            "mode_switches": len(self.switches),
+            "detections_saved_percent": round(100.0 * (1 - detections / full_rate_detections), 1) if full_rate_detections else 0.0,
+            # CPU actually used vs. what full mode costs per second over the same time
+            "cpu_saved_percent": round(100.0 * (1 - cpu / (full_cpu_per_sec * wall)), 1)
+                                 if full_cpu_per_sec and wall > 0 else None,
+        }
@@ -0,0 +1,176 @@
+# --- NEXO LOCAL INTENT ROUTER ---
+# Resolves the well known PC/web commands ("open youtube", "close browser",
+# "click search", ...) locally, in microseconds, and returns the same
+# 'ACTION: ...' string the LLM would have produced. Anything that is not a
+# known command returns None and goes to nexo_brain as before.
+#
+# Stage 1: keyword trie. The first word of the cleaned utterance picks a short
+#          list of precompiled regexes, so most conversational sentences are
+#          rejected with a single dict lookup.
+# Stage 2 (optional): a tiny TF-IDF matcher over example phrases for the
+#          fixed commands, for wordings the regexes don't cover. Bag of words
+#          can't tell "don't open youtube" or "how do i close the browser"
+#          from the command, so negations and questions never reach it, and
+#          the matched command's examples have to cover most of the utterance.
+#
+# Click commands only match while a browser window is open (browser_open)
+# and name a short target (CLICK_MAX_WORDS); "press"/"tap" also need the
+# word "button", so "tap water or bottled water" and "press releases are
+# boring" still go to the LLM.
+import math
+import re
+from collections import Counter
+
+# Polite / wake-word prefixes removed before matching.
+_FILLER_PREFIX = re.compile(
+    r"^(?:(?:hey|ok|okay|hi)\s+)?(?:nexo\s+)?"
+    r"(?:(?:can|could|would|will)\s+you\s+)?(?:please\s+)?(?:just\s+)?"
+)
+_PUNCTUATION = re.compile(r"[^\w\s'-]")
+_SPACES = re.compile(r"\s+")
+
+CLICK_MAX_WORDS = 4
+
+# trigger word -> [(compiled regex, action template, needs an open browser)]
+# '{arg}' in a template is filled from the regex's 'arg' group.
+_INTENT_TRIE = {}
+
+
+def _add_intent(triggers, pattern, template, needs_browser=False):
+    compiled = re.compile(pattern)
+    for trigger in triggers:
+        _INTENT_TRIE.setdefault(trigger, []).append((compiled, template, needs_browser))
+
+
+_OPEN = ["open", "launch", "start", "go", "show", "bring"]
+_OPEN_PREFIX = r"^(?:open|launch|start|go\s+to|show|bring\s+up)\s+(?:up\s+)?(?:the\s+)?"
+
+_add_intent(_OPEN, _OPEN_PREFIX + r"youtube(?:\s+for\s+me)?$", "ACTION: OPEN YOUTUBE")
+_add_intent(_OPEN, _OPEN_PREFIX + r"google(?:\s+for\s+me)?$", "ACTION: OPEN GOOGLE")
+_add_intent(_OPEN, _OPEN_PREFIX + r"(?:notepad|text\s+editor)(?:\s+for\s+me)?$", "ACTION: OPEN NOTEPAD")
+_add_intent(["close", "quit", "exit", "shut"],
+            r"^(?:close|quit|exit|shut\s+down)\s+(?:the\s+)?(?:browser|chrome|web\s+browser)$",
+            "ACTION: CLOSE BROWSER")
+_add_intent(["close", "stop"],
+            r"^(?:close\s+(?:the\s+)?assistant|stop\s+listening)$",
+            "ACTION: CLOSE ASSISTANT")
+_add_intent(["play", "put"],
+            r"^(?:play|put\s+on)\s+(?:some\s+)?(?:calming\s+|relaxing\s+)?nature\s+(?:sounds|music|playlist)$",
+            "ACTION: SPOTIFY_NATURE")
+_add_intent(["play", "put"],
+            r"^(?:play|put\s+on)\s+(?:the\s+song\s+|song\s+)?(?P<arg>.+?)\s+on\s+spotify$",
+            "ACTION: SPOTIFY_PLAY {arg}")
+_add_intent(["play"],
+            r"^play\s+(?:the\s+)?song\s+(?P<arg>.+)$",
+            "ACTION: SPOTIFY_PLAY {arg}")
+_CLICK_TARGET = r"(?P<arg>\S+(?:\s\S+){0,%d}?)" % (CLICK_MAX_WORDS - 1)
+_add_intent(["click"],
+            r"^click\s+(?:on\s+)?(?:the\s+)?" + _CLICK_TARGET + r"(?:\s+button)?$",
+            "ACTION: CLICK {arg}", needs_browser=True)
+_add_intent(["press", "tap"],
+            r"^(?:press|tap)\s+(?:on\s+)?(?:the\s+)?" + _CLICK_TARGET + r"\s+button$",
+            "ACTION: CLICK {arg}", needs_browser=True)
+
+# Example phrases for the TF-IDF fallback (fixed commands only, no arguments).
+INTENT_EXAMPLES = {
+    "ACTION: OPEN YOUTUBE": ["open youtube", "i want to watch youtube", "take me to youtube", "youtube please"],
+    "ACTION: OPEN GOOGLE": ["open google", "take me to google", "i need to google something", "google search page"],
+    "ACTION: OPEN NOTEPAD": ["open notepad", "open a text editor", "i want to write a note", "start notepad"],
+    "ACTION: CLOSE BROWSER": ["close the browser", "close chrome", "shut the browser window", "get rid of the browser"],
+    "ACTION: SPOTIFY_NATURE": ["play nature sounds", "play some calming nature music", "put on relaxing rain sounds",
+                               "nature sounds on spotify"],
+}
+
+TFIDF_THRESHOLD = 0.6
+# Share of the utterance's words that must appear in the matched action's examples
+TFIDF_MIN_COVERAGE = 0.75
+
+_NEGATION = re.compile(r"\b(?:not|no|never|nothing|dont|cannot)\b|n't\b")
+_QUESTION_START = {"how", "what", "why", "when", "where", "which", "who", "whose", "whom",
+                   "do", "does", "did", "is", "are", "was", "were", "am", "can", "could", "would",
+                   "will", "should", "shall", "may", "might", "must", "have", "has", "had"}
+
+
+def normalize_utterance(text):
+    """Lower-cases, strips punctuation and polite prefixes."""
+    text = _PUNCTUATION.sub(" ", text.lower())
+    text = _SPACES.sub(" ", text).strip()
+    return _FILLER_PREFIX.sub("", text).strip()
+
+
+def is_negated_or_question(cleaned_text):
+    """True for "don't open youtube", "how do i close the browser", ... (not commands)."""
+    return bool(_NEGATION.search(cleaned_text)) or cleaned_text.split(" ", 1)[0] in _QUESTION_START
+
+
+class TfidfIntentMatcher:
+    """Tiny dependency-free TF-IDF + cosine matcher over example phrases."""
+
+    def __init__(self, examples, threshold=TFIDF_THRESHOLD, min_coverage=TFIDF_MIN_COVERAGE):
+        self.threshold = threshold
+        self.min_coverage = min_coverage
+        docs = [(action, normalize_utterance(phrase).split())
+                for action, phrases in examples.items() for phrase in phrases]
+        doc_freq = Counter(word for _, words in docs for word in set(words))
+        self.idf = {word: math.log((1 + len(docs)) / (1 + df)) + 1.0 for word, df in doc_freq.items()}
+        # Words never seen in the examples still count towards the query's
+        # length, so "explain photosynthesis to me" doesn't match on "to me".
+        self.unknown_idf = math.log(1 + len(docs)) + 1.0
+        self.vectors = [(action, self._vector(words)) for action, words in docs]
+        self.vocabulary = {}
+        for action, words in docs:
+            self.vocabulary.setdefault(action, set()).update(words)
+
+    def _vector(self, words):
+        counts = Counter(words)
+        vec = {w: c * self.idf.get(w, self.unknown_idf) for w, c in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        return {w: v / norm for w, v in vec.items()} if norm else {}
+
+    def match(self, cleaned_text):
+        query = self._vector(cleaned_text.split())
+        if not query:
+            return None, 0.0
+        best_action, best_score = None, 0.0
+        for action, vec in self.vectors:
+            score = sum(weight * vec.get(word, 0.0) for word, weight in query.items())
+            if score > best_score:
+                best_action, best_score = action, score
+        if best_score < self.threshold:
+            return None, best_score
+        words = cleaned_text.split()
+        known = self.vocabulary[best_action]
+        if sum(word in known for word in words) < self.min_coverage * len(words):
+            # "tell me about nature sounds on spotify": most of it isn't the command
+            return None, best_score
+        return best_action, best_score
+
+
+_tfidf_matcher = None
+
+
+def route_intent(user_input, use_tfidf=True, browser_open=False):
+    """
+    Returns an 'ACTION: ...' string if the utterance is a known PC command,
+    or None if it should go to the LLM. Click commands need browser_open.
+    """
+    global _tfidf_matcher
+    cleaned = normalize_utterance(user_input)
+    if not cleaned:
+        return None
+
+    first_word = cleaned.split(" ", 1)[0]
+    for pattern, template, needs_browser in _INTENT_TRIE.get(first_word, ()):
+        if needs_browser and not browser_open:
+            continue
+        match = pattern.match(cleaned)
+        if match:
+            arg = match.groupdict().get("arg")
+            return template.format(arg=arg) if arg else template
+
+    if use_tfidf and not is_negated_or_question(cleaned):
+        if _tfidf_matcher is None:
+            _tfidf_matcher = TfidfIntentMatcher(INTENT_EXAMPLES)
+        action, _ = _tfidf_matcher.match(cleaned)
+        return action
+    return None
@@ -0,0 +1,220 @@
+# --- NEXO TRACING & METRICS ---
+# Built-in instrumentation for the whole assistant:
+#  * span("stt")            - times a stage (capture, detection, tracking,
+#                             serial_write, stt, llm, tts, ...), as a `with` block
+#  * observe("stage", sec)  - records a duration measured elsewhere
+#  * inc("cache_hits")      - counters (dropped frames, serial bytes, ...)
+# Every stage gets a p50/p95/p99 histogram. Export:
+#  * Chrome trace JSON (open in chrome://tracing or https://ui.perfetto.dev)
+#  * Prometheus text format on http://127.0.0.1:<port>/metrics
+#
+# Disabled by default, and then free: span/observe/inc are swapped for no-op
+# functions until enable() is called. Always call them through the module
+# (nexo_metrics.span(...)), never `from nexo_metrics import span`.
+import atexit
+import http.server
+import json
+import os
+import threading
+import time
+from collections import deque
+
+QUANTILES = (0.5, 0.95, 0.99)
+RESERVOIR_SIZE = 2048          # most recent durations kept per stage
+MAX_TRACE_EVENTS = 200_000
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _null_span(name):
+    return _NULL_SPAN
+
+
+def _null_observe(name, seconds):
+    pass
+
+
+def _null_inc(name, amount=1):
+    pass
+
+
+span = _null_span
+observe = _null_observe
+inc = _null_inc
+
+
+class Histogram:
+    """Count, sum and a reservoir of recent values for quantiles."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.recent.append(value)
+
+    def quantiles(self):
+        values = sorted(self.recent)
+        if not values:
+            return {q: 0.0 for q in QUANTILES}
+        return {q: values[min(len(values) - 1, int(len(values) * q))] for q in QUANTILES}
+
+
+class MetricsRegistry:
+    """Holds the histograms, counters and trace events while metrics are enabled."""
+
+    def __init__(self, trace=True):
+        self.histograms = {}
+        self.counters = {}
+        self.trace = trace
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._t0_ns = time.perf_counter_ns()
+
+    def observe(self, name, seconds, start_ns=None):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.add(seconds)
+        if self.trace:
+            if start_ns is None:
+                start_ns = time.perf_counter_ns() - int(seconds * 1e9)
+            self.events.append((name, start_ns, int(seconds * 1e9), threading.get_ident()))
+
+    def inc(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """{"stages": {name: {count, sum, p50, p95, p99}}, "counters": {...}}"""
+        with self._lock:
+            stages = {}
+            for name, histogram in self.histograms.items():
+                quantiles = histogram.quantiles()
+                stages[name] = {"count": histogram.count, "sum_sec": histogram.total,
+                                **{f"p{int(q * 100)}_ms": quantiles[q] * 1000 for q in QUANTILES}}
+            return {"stages": stages, "counters": dict(self.counters)}
+
+    def chrome_trace(self):
+        """Trace events in the Chrome trace event format (complete events, microseconds)."""
+        events = [{"name": name, "cat": "nexo", "ph": "X", "pid": self._pid, "tid": tid,
+                   "ts": (start - self._t0_ns) / 1000, "dur": duration / 1000}
+                  for name, start, duration, tid in list(self.events)]
+        threads = {tid: name for tid, name in ((t.ident, t.name) for t in threading.enumerate())}
+        for tid in {event["tid"] for event in events}:
+            events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                           "args": {"name": threads.get(tid, str(tid))}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        os.replace(tmp, path)
+        print(f"[Metrics]: Wrote {len(self.events)} trace events to {path}")
+
+    def prometheus_text(self):
+        """Prometheus exposition format (text, version 0.0.4)."""
+        snapshot = self.snapshot()
+        lines = ["# HELP nexo_stage_seconds Time spent per pipeline stage.",
+                 "# TYPE nexo_stage_seconds summary"]
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                quantiles = histogram.quantiles()
+                for q in QUANTILES:
+                    lines.append(f'nexo_stage_seconds{{stage="{name}",quantile="{q}"}} {quantiles[q]:.9g}')
+                lines.append(f'nexo_stage_seconds_sum{{stage="{name}"}} {histogram.total:.9g}')
+                lines.append(f'nexo_stage_seconds_count{{stage="{name}"}} {histogram.count}')
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"# TYPE nexo_{name}_total counter")
+            lines.append(f"nexo_{name}_total {value}")
+        return "\n".join(lines) + "\n"
+
+
+class _Span:
+    __slots__ = ("registry", "name", "start")
+
+    def __init__(self, registry, name):
+        self.registry = registry
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        self.registry.observe(self.name, duration / 1e9, self.start)
+        return False
+
+
+REGISTRY = None
+_server = None
+
+
+def enable(trace_path=None, http_port=None):
+    """
+    Turns instrumentation on. trace_path: Chrome trace written at exit.
+    http_port: serve Prometheus text on 127.0.0.1:<port>/metrics.
+    """
+    global REGISTRY, span, observe, inc
+    REGISTRY = MetricsRegistry(trace=trace_path is not None)
+    registry = REGISTRY
+    span = lambda name: _Span(registry, name)
+    observe = registry.observe
+    inc = registry.inc
+    if trace_path:
+        atexit.register(registry.write_trace, trace_path)
+    if http_port:
+        serve_prometheus(http_port)
+    return registry
+
+
+def disable():
+    global span, observe, inc
+    span, observe, inc = _null_span, _null_observe, _null_inc
+
+
+def enabled():
+    return span is not _null_span
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """Starts the /metrics endpoint on a daemon thread."""
+    global _server
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics" or REGISTRY is None:
+                self.send_error(404)
+                return
+            body = REGISTRY.prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    _server = http.server.ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=_server.serve_forever, name="nexo-metrics-http", daemon=True).start()
+    print(f"[Metrics]: Prometheus metrics on http://{host}:{port}/metrics")
+    return _server
@@ -0,0 +1,258 @@
+# --- NEXO OLLAMA MODEL MANAGER ---
+# Keeps the local model loaded and decides which LLM request runs next.
+#
+#  * Warm-up: start() loads the model on a background thread (an
+#    /api/generate request without a prompt only loads the model), so the
+#    first question doesn't pay the model load (seconds on a cold start).
+#  * Keep-alive: while idle, that request is repeated every ping_every_sec
+#    (a third of keep_alive by default), so Ollama never unloads the model
+#    between conversations, and reloads it after a server restart.
+#  * Scheduling: LLM calls go through submit(fn, priority). At most
+#    max_concurrent run at once (match Ollama's OLLAMA_NUM_PARALLEL, 1 by
+#    default); the queue is ordered by priority, then arrival. A request that
+#    finds every slot taken preempts the least important running one if that
+#    one is less important than itself: the preempted job's cancel token is
+#    set (a streamed Ollama request stops at the next token); background
+#    jobs are queued again, speculative ones end with None. Background work
+#    therefore never holds up a user reply for more than about one token.
+#
+# fn(cancel) gets a CancelToken and returns the result, or None once the
+# token is set. A job whose token is set before it leaves the queue is not
+# run; its future gets None.
+import heapq
+import itertools
+import json
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future
+
+from nexo_prompt import OLLAMA_KEEP_ALIVE
+
+PRIORITY_USER = 0           # the reply the user is waiting for
+PRIORITY_INTENT = 1         # LLM fallback of the intent router
+PRIORITY_SPECULATIVE = 2    # replies started from partial transcripts (nexo_speculative.py)
+PRIORITY_BACKGROUND = 3     # summaries and other work nobody is waiting for
+
+WARM_TIMEOUT_SEC = 15       # request timeout once the model is loaded
+COLD_TIMEOUT_SEC = 60       # ... while it may still be loading
+LOAD_TIMEOUT_SEC = 300
+LOAD_RETRY_SEC = 10.0
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SEC = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def keep_alive_seconds(keep_alive):
+    """Ollama keep_alive ("30m", "1h30m", 300, -1) in seconds; None = forever."""
+    if isinstance(keep_alive, (int, float)):
+        return None if keep_alive < 0 else float(keep_alive)
+    if keep_alive.strip().startswith("-"):
+        return None
+    parts = _DURATION.findall(keep_alive)
+    if not parts:
+        return float(keep_alive)
+    return sum(float(value) * _UNIT_SEC[unit] for value, unit in parts)
+
+
+class CancelToken:
+    """Set by the scheduler (preemption) or by the caller's own cancel event."""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.preempted = False
+        self._event = threading.Event()
+
+    def set(self):
+        self._event.set()
+
+    def is_set(self):
+        return self._event.is_set() or (self.parent is not None and self.parent.is_set())
+
+    def wait(self, timeout=None):
+        """Like Event.wait(); returns True once the token is set."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.is_set():
+            remaining = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            self._event.wait(remaining)
+        return True
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "fn", "future", "cancel", "token", "requeue", "name", "submitted")
+
+    def __init__(self, priority, seq, fn, cancel, requeue, name):
+        self.priority = priority
+        self.seq = seq
+        self.fn = fn
+        self.future = Future()
+        self.cancel = cancel
+        self.token = CancelToken(cancel)
+        self.requeue = requeue
+        self.name = name
+        self.submitted = time.monotonic()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class OllamaModelManager:
+    """Preloads and keeps one Ollama model resident; priority scheduling of requests."""
+
+    def __init__(self, base_url, model, keep_alive=OLLAMA_KEEP_ALIVE, ping_every_sec=None, max_concurrent=1):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.keep_alive = keep_alive
+        keep_sec = keep_alive_seconds(keep_alive)
+        self.ping_every_sec = ping_every_sec or (keep_sec / 3 if keep_sec else 600.0)
+        self.max_concurrent = max_concurrent
+        self.ready = threading.Event()      # the model is known to be loaded
+        self.last_used = time.monotonic()
+        self._cond = threading.Condition()
+        self._queue = []                    # heap of _Job
+        self._running = set()
+        self._seq = itertools.count()
+        self._stop = threading.Event()
+        self._threads = []
+        self.stats = {"preload_ms": None, "pings": 0, "load_failures": 0, "completed": 0,
+                      "preempted": 0, "requeued": 0, "skipped": 0, "wait_ms_by_priority": {}}
+
+    # --- lifecycle ---
+    def start(self):
+        if self._threads:
+            return
+        for i in range(self.max_concurrent):
+            self._threads.append(threading.Thread(target=self._worker, name=f"ollama-slot-{i}", daemon=True))
+        self._threads.append(threading.Thread(target=self._keep_alive_loop, name="ollama-keep-alive", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            for job in self._queue:
+                job.future.cancel()
+            self._queue.clear()
+            for job in self._running:
+                job.token.set()
+            self._cond.notify_all()
+
+    def request_timeout(self):
+        """HTTP timeout for a chat request: short once the model is loaded."""
+        return WARM_TIMEOUT_SEC if self.ready.is_set() else COLD_TIMEOUT_SEC
+
+    def load(self, timeout=LOAD_TIMEOUT_SEC):
+        """Loads the model (or refreshes its keep_alive). True on success."""
+        body = json.dumps({"model": self.model, "keep_alive": self.keep_alive}).encode()
+        request = urllib.request.Request(f"{self.base_url}/api/generate", data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+        except OSError as e:
+            self.stats["load_failures"] += 1
+            print(f"[Ollama Manager]: Could not load {self.model}: {e}")
+            self.ready.clear()
+            return False
+        self.ready.set()
+        return True
+
+    def _keep_alive_loop(self):
+        start = time.perf_counter()
+        while not self._stop.is_set() and not self.load():
+            self._stop.wait(LOAD_RETRY_SEC)
+        if self._stop.is_set():
+            return
+        self.stats["preload_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        print(f"[Ollama Manager]: {self.model} loaded in {self.stats['preload_ms']:.0f} ms "
+              f"(keep_alive {self.keep_alive}, ping every {self.ping_every_sec:.0f} s when idle)")
+        self.last_used = time.monotonic()
+        while not self._stop.wait(min(1.0, self.ping_every_sec / 4)):
+            with self._cond:
+                idle = not self._running and not self._queue
+                due = time.monotonic() - self.last_used >= self.ping_every_sec
+            if idle and due:
+                self.stats["pings"] += 1
+                self.load()
+                self.last_used = time.monotonic()
+
+    # --- scheduling ---
+    def submit(self, fn, priority=PRIORITY_USER, cancel=None, requeue=None, name=""):
+        """
+        Queues fn(cancel_token) and returns a Future with its result.
+        `cancel` is the caller's own cancel event (e.g. from the Speculator).
+        Preempted jobs are run again when `requeue` is true (default: background jobs).
+        """
+        job = _Job(priority, next(self._seq), fn, cancel,
+                   priority >= PRIORITY_BACKGROUND if requeue is None else requeue, name)
+        with self._cond:
+            heapq.heappush(self._queue, job)
+            if len(self._running) >= self.max_concurrent:
+                victims = [j for j in self._running if j.priority > priority and not j.token.preempted]
+                if victims:
+                    victim = max(victims)
+                    victim.token.preempted = True
+                    victim.token.set()
+                    self.stats["preempted"] += 1
+            self._cond.notify()
+        return job.future
+
+    def run(self, fn, priority=PRIORITY_USER, cancel=None, name=""):
+        """submit() and wait for the result."""
+        return self.submit(fn, priority, cancel, name=name).result()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    return
+                job = heapq.heappop(self._queue)
+                # Cancelled while queued (e.g. a stale speculation): never sent at all
+                skipped = job.token.is_set()
+                if skipped:
+                    self.stats["skipped"] += 1
+                else:
+                    self._running.add(job)
+                    waits = self.stats["wait_ms_by_priority"].setdefault(job.priority, [])
+                    waits.append((time.monotonic() - job.submitted) * 1000)
+                    del waits[:-256]
+            if skipped:
+                job.future.set_result(None)
+                continue
+            result = error = None
+            try:
+                result = job.fn(job.token)
+            except Exception as e:
+                error = e
+            with self._cond:
+                self._running.discard(job)
+                self.last_used = time.monotonic()
+                if (job.token.preempted and result is None and error is None and job.requeue
+                        and not (job.cancel is not None and job.cancel.is_set()) and not self._stop.is_set()):
+                    job.token = CancelToken(job.cancel)
+                    heapq.heappush(self._queue, job)      # keeps its place (same seq)
+                    self.stats["requeued"] += 1
+                    self._cond.notify()
+                    continue
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                if not job.token.is_set():
+                    self.ready.set()
+                    self.stats["completed"] += 1
+                job.future.set_result(result)
+
+    def report(self):
+        """One line for the console: preload time, pings and scheduling counters."""
+        with self._cond:
+            waits = {p: sorted(w) for p, w in self.stats["wait_ms_by_priority"].items()}
+            queued = len(self._queue)
+        wait_p50 = ", ".join(f"p{p} {w[len(w) // 2]:.0f} ms" for p, w in sorted(waits.items()) if w)
+        return (f"preload {self.stats['preload_ms']} ms, pings {self.stats['pings']}, "
+                f"completed {self.stats['completed']}, preempted {self.stats['preempted']}, "
+                f"requeued {self.stats['requeued']}, skipped {self.stats['skipped']}, queued {queued}, queue wait p50: {wait_p50 or '-'}")
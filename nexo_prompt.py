@@ -0,0 +1,118 @@
+# --- NEXO PROMPT BUILDER ---
+# The system prompt is defined ONCE here and never changes between turns.
+# The live biometric values (stress, heart rate, ECG) are sent as a small
+# message at the END of the conversation instead of being baked into the
+# middle of the system prompt. That keeps the prompt prefix identical every
+# turn, so the LLM server can reuse its prompt (KV) cache instead of
+# re-reading the whole conversation.
+
+# How long Ollama should keep the model loaded between requests.
+OLLAMA_KEEP_ALIVE = "30m"
+
+NEXO_SYSTEM_PROMPT = """
+    You are Nexo, a friendly, non-GUI, face-to-face voice assistant and stress relief coach. This is an ongoing conversation. Use the previous messages for context (e.g., if the user just opened Spotify, 'click search' refers to Spotify). Your primary goal is to converse naturally, teach subjects, and offer stress relief.
+    The user's live biometrics (stress level from real-time blink analysis, Heart Rate in Beats Per Minute and the raw ECG data) are sent to you in a short '[Live biometrics]' message at the end of the conversation. Always use the most recent one.
+    Only the most recent messages are sent in full; older ones that match the question follow in an '[Earlier conversation]' block. Use them when the user refers back to something ("like last time", "that song you played").
+    When the user asks about an earlier period (e.g. "How stressed was I yesterday?"), a '[Biometric history]' line with the totals for that period follows it. Answer from those numbers in one or two spoken sentences.
+    **Rules:**
+    1.  **PC/Web Control:** If the user conversationally asks to open, click, or close something, you MUST respond with a single line containing only the keyword 'ACTION:' followed by the command. You must not add any other words.
+        * Example for opening YouTube: `ACTION: OPEN YOUTUBE`
+        * Example for playing nature sounds: `ACTION: SPOTIFY_NATURE`
+        * Example for playing a song: `ACTION: SPOTIFY_PLAY <song_name_and_artist>`
+        * **NEW:** Example for clicking an element: `ACTION: CLICK <element_text_or_name>` (e.g., ACTION: CLICK search, ACTION: CLICK play button)
+        * **NEW:** Example for closing the browser: `ACTION: CLOSE BROWSER`
+    2.  **Conversational/Teaching:** For all other queries, respond naturally and concisely, as if speaking.
+        * **Stress Relief:** If the stress level is 'Moderate Stress' or 'High Stress', gently suggest a quick, simple stress relief technique (like a deep breath) BEFORE answering their actual query.
+        * **Do NOT** include the 'ACTION:' prefix in conversational responses.
+    3.  **Stress Reporting:** Do not tell the user their stress level or heart rate unless they explicitly ask, for example, "How stressed am I?" or "What is my heart rate?"
+    4.  **Tone:** Always maintain a helpful, friendly, and non-judgmental tone.
+    """
+
+# Filled in from the last Ollama reply so we can see how much prefill we paid.
+PREFILL_STATS = {"requests": 0, "prompt_tokens": 0, "prompt_eval_ms": 0.0}
+
+
+def build_recall_context(recalled):
+    """'[Earlier conversation]' block for older turns pulled from the chat index."""
+    lines = ["[Earlier conversation] Older messages that may be relevant:"]
+    for message in recalled:
+        speaker = "User" if message['role'] == 'user' else "Nexo"
+        lines.append(f"{speaker}: {message['parts'][0]['text']}")
+    return "\n".join(lines)
+
+
+def build_biometric_context(stress_level, heart_rate, ecg_raw, history=None, recalled=None):
+    """
+    Builds the small, volatile biometric message sent at the end of each turn.
+    `history` is an optional '[Biometric history]' line (nexo_analytics.py)
+    for questions about past days, `recalled` older chat messages
+    (nexo_chat_index.py).
+    """
+    parts = [f"[Live biometrics] Stress level: {stress_level}. "
+             f"Heart rate: {heart_rate} BPM. ECG raw: {ecg_raw}."]
+    if history:
+        parts.append(history)
+    if recalled:
+        parts.append(build_recall_context(recalled))
+    return "\n".join(parts)
+
+
+def build_gemini_payload(chat_history, stress_level, heart_rate, ecg_raw, history=None, recalled=None):
+    """
+    Builds the Gemini request body.
+    The biometric context is added as an extra part on the latest user turn,
+    so the stored chat history itself is never modified.
+    """
+    contents = list(chat_history)
+    context_part = {"text": build_biometric_context(stress_level, heart_rate, ecg_raw, history, recalled)}
+
+    if contents and contents[-1].get("role") == "user":
+        last = contents[-1]
+        contents[-1] = {"role": "user", "parts": list(last["parts"]) + [context_part]}
+    else:
+        contents.append({"role": "user", "parts": [context_part]})
+
+    return {
+        "contents": contents,
+        "systemInstruction": {"parts": [{"text": NEXO_SYSTEM_PROMPT}]},
+        "tools": [{"google_search": {}}]
+    }
+
+
+def build_ollama_messages(chat_history, stress_level, heart_rate, ecg_raw, history=None, recalled=None):
+    """
+    Converts our Gemini-style chat history into Ollama /api/chat messages.
+    Order: static system prompt -> conversation -> biometric context.
+    """
+    messages = [{"role": "system", "content": NEXO_SYSTEM_PROMPT}]
+    for message in chat_history:
+        role = "user" if message['role'] == 'user' else 'assistant'
+        messages.append({"role": role, "content": message['parts'][0]['text']})
+    messages.append({"role": "system",
+                     "content": build_biometric_context(stress_level, heart_rate, ecg_raw, history, recalled)})
+    return messages
+
+
+def build_ollama_chat_payload(model, chat_history, stress_level, heart_rate, ecg_raw, keep_alive=OLLAMA_KEEP_ALIVE,
+                              history=None, recalled=None):
+    """Builds the full Ollama /api/chat request body."""
+    return {
+        "model": model,
+        "messages": build_ollama_messages(chat_history, stress_level, heart_rate, ecg_raw, history, recalled),
+        "stream": False,
+        "keep_alive": keep_alive
+    }
+
+
+def record_prefill_stats(result):
+    """
+    Reads the prefill counters Ollama returns with every reply.
+    'prompt_eval_count' only counts the tokens the server actually had to
+    evaluate, so a low number here means the prompt cache was reused.
+    """
+    prompt_tokens = result.get('prompt_eval_count', 0) or 0
+    prompt_eval_ms = (result.get('prompt_eval_duration', 0) or 0) / 1e6
+    PREFILL_STATS["requests"] += 1
+    PREFILL_STATS["prompt_tokens"] += prompt_tokens
+    PREFILL_STATS["prompt_eval_ms"] += prompt_eval_ms
+    return prompt_tokens, prompt_eval_ms
@@ -0,0 +1,267 @@
+# --- NEXO RESPONSE CACHE ---
+# Users ask Nexo the same things again and again ("how stressed am I",
+# "give me a breathing exercise"). Each one costs a multi-second LLM call,
+# so replies are cached here.
+#
+# Key   = normalised prompt + coarse biometric bucket (stress level and heart
+#         rate rounded to HEART_RATE_BUCKET_BPM), so a cached answer is only
+#         reused while the user is in roughly the same state. A follow-up that
+#         refers back ("tell me more", "why is that") also gets a hash of the
+#         conversation turns before it, so it only gets the reply it got after
+#         the same previous turn; standalone questions hit all session long.
+# Lookup: 1. exact match on the key
+#         2. only with `similarity` set (off by default): a near-identical
+#            prompt in the same bucket and context, with the same numbers and
+#            names ("12 times 13" never answers "13 times 12")
+# Prompts whose answer depends on the moment (time, date, weather, news...)
+# are never cached. Entries expire after a TTL and the least recently used
+# ones are evicted. The cache is saved to a JSON file so it survives restarts.
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+RESPONSE_CACHE_FILE = 'response_cache.json'
+RESPONSE_CACHE_MAX_ENTRIES = 500
+RESPONSE_CACHE_TTL_SEC = 24 * 60 * 60
+RESPONSE_CACHE_SIMILARITY = None     # e.g. 0.9 to also reuse near-identical wording
+HEART_RATE_BUCKET_BPM = 20
+EMBEDDING_DIMS = 256
+
+_NON_WORD = re.compile(r"[^a-z0-9\s]")
+_SPACES = re.compile(r"\s+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+_NAME = re.compile(r"(?<!^)(?<![.?!]\s)\b[A-Z][a-zA-Z]+")
+_MOMENT_DEPENDENT = re.compile(
+    r"\b(time|clock|date|day|today|tonight|tomorrow|yesterday|now|current|currently|latest|"
+    r"recent|news|weather|temperature|forecast|week|weekend|month|year|morning|afternoon|evening)\b")
+# Words that point back at the conversation: the answer depends on what came before
+_FOLLOW_UP = re.compile(
+    r"\b(it|its|that|this|these|those|they|them|their|he|she|him|her|more|again|another|else|"
+    r"also|too|instead|same|then|above|previous|last)\b")
+
+
+def normalize_prompt(text):
+    """Lower-case, no punctuation, single spaces."""
+    text = _NON_WORD.sub(" ", text.lower())
+    return _SPACES.sub(" ", text).strip()
+
+
+def is_cacheable(prompt):
+    """False for prompts whose answer depends on the moment ("what time is it now")."""
+    text = normalize_prompt(prompt)
+    return bool(text) and not _MOMENT_DEPENDENT.search(text)
+
+
+def is_follow_up(prompt):
+    """True for prompts that refer back to the conversation ("tell me more", "why is that")."""
+    return bool(_FOLLOW_UP.search(normalize_prompt(prompt)))
+
+
+def context_key(context):
+    """Short hash of the previous turns' texts ('' when there are none)."""
+    texts = [normalize_prompt(text) for text in context or ()]
+    if not any(texts):
+        return ""
+    return hashlib.sha1("\n".join(texts).encode("utf-8")).hexdigest()[:16]
+
+
+def prompt_signature(prompt):
+    """Numbers (in order) and capitalised names in a prompt; must match for a semantic hit."""
+    return {"numbers": _NUMBER.findall(prompt), "names": sorted({n.lower() for n in _NAME.findall(prompt)})}
+
+
+def biometric_bucket(stress_level, heart_rate):
+    """Coarse state bucket, e.g. 'High Stress|80'. Heart rate 0 means 'unknown'."""
+    try:
+        hr_bucket = int(heart_rate) // HEART_RATE_BUCKET_BPM * HEART_RATE_BUCKET_BPM
+    except (TypeError, ValueError):
+        hr_bucket = 0
+    return f"{stress_level}|{hr_bucket}"
+
+
+def hashed_ngram_embedding(text, dims=EMBEDDING_DIMS):
+    """
+    Cheap, dependency-free sentence embedding: character trigrams and words
+    hashed into a fixed size vector, L2 normalised. crc32 is used instead of
+    hash() so the vectors are the same after a restart.
+    """
+    vec = [0.0] * dims
+    padded = f"  {text}  "
+    features = [padded[i:i + 3] for i in range(len(padded) - 2)] + text.split()
+    for feature in features:
+        vec[zlib.crc32(feature.encode('utf-8')) % dims] += 1.0
+    norm = math.sqrt(sum(v * v for v in vec))
+    return [v / norm for v in vec] if norm else vec
+
+
+def _cosine(a, b):
+    return sum(x * y for x, y in zip(a, b))
+
+
+class ResponseCache:
+    """Exact (+ optional near-identical) response cache with TTL, LRU eviction and a JSON file store."""
+
+    def __init__(self, path=RESPONSE_CACHE_FILE, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl_sec=RESPONSE_CACHE_TTL_SEC, similarity=RESPONSE_CACHE_SIMILARITY,
+                 embed=hashed_ngram_embedding):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.similarity = similarity
+        self.embed = embed
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> entry dict, oldest first
+        self._embeddings = {}           # key -> vector (rebuilt on load, never saved)
+        self.metrics = {"exact_hits": 0, "semantic_hits": 0, "misses": 0,
+                        "evictions": 0, "expired": 0, "stores": 0}
+        self._load()
+
+    # --- Lookup ---
+    def get(self, prompt, stress_level, heart_rate, context=()):
+        """
+        Returns a cached reply for this prompt/state, or None. `context` is
+        the texts of the messages before the prompt (e.g. the last exchange);
+        it is only part of the key for follow-ups (is_follow_up).
+        """
+        if not is_cacheable(prompt):
+            return None
+        with self._lock:
+            key, kind, expired = self._find(prompt, stress_level, heart_rate, context)
+            for other_key in expired:
+                self._drop(other_key)
+                self.metrics["expired"] += 1
+            if key is None:
+                self.metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.metrics[f"{kind}_hits"] += 1
+            return self._entries[key]["response"]
+
+    def peek(self, prompt, stress_level, heart_rate, context=()):
+        """Same answer as get(), but touches nothing: no metrics, LRU order or expiry."""
+        if not is_cacheable(prompt):
+            return None
+        with self._lock:
+            key, _, _ = self._find(prompt, stress_level, heart_rate, context)
+            return None if key is None else self._entries[key]["response"]
+
+    def _find(self, prompt, stress_level, heart_rate, context):
+        """(Lock held) Returns (key, "exact"/"semantic", expired keys seen); key is None on a miss."""
+        text = normalize_prompt(prompt)
+        bucket = biometric_bucket(stress_level, heart_rate)
+        context = context_key(context) if is_follow_up(prompt) else ""
+        key = f"{bucket}|{context}|{text}"
+        now = time.time()
+        expired = []
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if not self._expired(entry, now):
+                return key, "exact", expired
+            expired.append(key)
+
+        if self.similarity is not None and self.embed is not None:
+            query = self.embed(text)
+            signature = prompt_signature(prompt)
+            best_key, best_score = None, self.similarity
+            for other_key, other in self._entries.items():
+                if other_key == key or other["bucket"] != bucket or other["context"] != context:
+                    continue
+                if self._expired(other, now):
+                    expired.append(other_key)
+                    continue
+                if other["signature"] != signature:
+                    continue
+                score = _cosine(query, self._embeddings[other_key])
+                if score >= best_score:
+                    best_key, best_score = other_key, score
+            if best_key is not None:
+                return best_key, "semantic", expired
+        return None, None, expired
+
+    # --- Store ---
+    def put(self, prompt, stress_level, heart_rate, response, context=()):
+        """Stores a reply (unless the prompt is moment-dependent) and saves the cache file."""
+        if not response or not is_cacheable(prompt):
+            return
+        text = normalize_prompt(prompt)
+        bucket = biometric_bucket(stress_level, heart_rate)
+        context = context_key(context) if is_follow_up(prompt) else ""
+        key = f"{bucket}|{context}|{text}"
+
+        with self._lock:
+            self._entries[key] = {"prompt": text, "bucket": bucket, "context": context,
+                                  "signature": prompt_signature(prompt),
+                                  "response": response, "created": time.time()}
+            self._entries.move_to_end(key)
+            if self.similarity is not None and self.embed is not None:
+                self._embeddings[key] = self.embed(text)
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._drop(oldest_key)
+                self.metrics["evictions"] += 1
+            self.metrics["stores"] += 1
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._embeddings.clear()
+            self._save()
+
+    def stats(self):
+        """Hit/miss counters plus the current size and hit rate."""
+        with self._lock:
+            stats = dict(self.metrics)
+            stats["entries"] = len(self._entries)
+        lookups = stats["exact_hits"] + stats["semantic_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["exact_hits"] + stats["semantic_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
+
+    # --- Internal helpers (call with the lock held) ---
+    def _expired(self, entry, now):
+        return self.ttl_sec is not None and now - entry["created"] > self.ttl_sec
+
+    def _drop(self, key):
+        self._entries.pop(key, None)
+        self._embeddings.pop(key, None)
+
+    def _load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        now = time.time()
+        for entry in saved.get("entries", []):
+            # Entries saved before the context key existed can't be matched safely,
+            # and standalone ones saved with a context would never be hit again
+            if (self._expired(entry, now) or "context" not in entry or not is_cacheable(entry["prompt"])
+                    or (entry["context"] and not is_follow_up(entry["prompt"]))):
+                continue
+            key = f"{entry['bucket']}|{entry['context']}|{entry['prompt']}"
+            self._entries[key] = entry
+            if self.similarity is not None and self.embed is not None:
+                self._embeddings[key] = self.embed(entry["prompt"])
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+        print(f"[Response Cache]: Loaded {len(self._entries)} cached replies.")
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({"entries": list(self._entries.values())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR - Response Cache]: Could not save cache. {e}")
@@ -0,0 +1,187 @@
+# --- NEXO ASYNC RUNTIME (SUPERVISOR) ---
+# Runs every Nexo subsystem as a task under ONE asyncio event loop:
+#  * each subsystem is a coroutine with its own restart policy
+#    ("never", "on_failure", "always") and backoff,
+#  * blocking work (STT, TTS, HTTP LLM calls, the OpenCV video loop) is
+#    bridged in with run_blocking() / loop.run_in_executor,
+#  * shutdown is structured: tasks that registered a grace period (the video
+#    loop, which stops the car and closes the serial ports) may finish by
+#    themselves for that long, then everything still running is cancelled
+#    and gets shutdown_timeout (100 ms by default) to go. Both phases are
+#    measured: grace_ms is the time spent waiting for graceful tasks (real
+#    threads finishing their cleanup), cancel_ms the cancellation after it.
+#
+# Blocking calls run on DAEMON threads (DaemonThreadExecutor). A thread stuck
+# in e.g. Recognizer.listen() can't be interrupted, but a daemon thread never
+# keeps the process alive, so cancelling its task is enough for shutdown.
+import asyncio
+import functools
+import threading
+import time
+from collections import Counter, namedtuple
+from concurrent.futures import Executor, Future
+
+RESTART_NEVER = "never"
+RESTART_ON_FAILURE = "on_failure"
+RESTART_ALWAYS = "always"
+
+SHUTDOWN_TIMEOUT_SEC = 0.1
+STOP_POLL_INTERVAL_SEC = 0.02
+
+TaskSpec = namedtuple("TaskSpec", ["name", "factory", "restart", "max_restarts", "backoff_sec", "critical", "grace_sec"])
+
+
+class DaemonThreadExecutor(Executor):
+    """concurrent.futures executor that runs every call on a fresh daemon thread."""
+
+    def __init__(self, name_prefix="nexo-blocking"):
+        self._name_prefix = name_prefix
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def runner():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+        with self._lock:
+            self._counter += 1
+            name = f"{self._name_prefix}-{self._counter}"
+        threading.Thread(target=runner, name=name, daemon=True).start()
+        return future
+
+
+class Supervisor:
+    """Starts, restarts and stops a set of named asyncio tasks."""
+
+    def __init__(self, shutdown_timeout=SHUTDOWN_TIMEOUT_SEC):
+        self.shutdown_timeout = shutdown_timeout
+        self.executor = DaemonThreadExecutor()
+        self.restarts = Counter()
+        self.shutdown_latency_ms = None
+        self.grace_ms = None
+        self.cancel_ms = None
+        self._specs = []
+        self._stop_event = None
+        self._loop = None
+
+    def add(self, name, factory, restart=RESTART_ON_FAILURE, max_restarts=5, backoff_sec=1.0,
+            critical=False, grace_sec=0.0):
+        """
+        Registers a subsystem. `factory` is an async function with no arguments.
+        critical  - when this task ends, the whole runtime stops.
+        grace_sec - at shutdown, time the task may use to finish by itself
+                    (e.g. to stop the car) before it is cancelled. Not
+                    bounded by shutdown_timeout: a blocking thread's cleanup
+                    can take seconds, and its daemon thread dies at exit.
+        """
+        self._specs.append(TaskSpec(name, factory, restart, max_restarts, backoff_sec, critical, grace_sec))
+
+    async def run_blocking(self, fn, *args, **kwargs):
+        """Runs a blocking function on a daemon thread and awaits its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    def request_stop(self):
+        """Asks the runtime to stop. Safe to call from any thread."""
+        if self._loop is not None and self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    async def _run_task(self, spec):
+        attempt = 0
+        while True:
+            try:
+                await spec.factory()
+                if spec.restart != RESTART_ALWAYS:
+                    return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[Supervisor]: Task '{spec.name}' failed: {e!r}")
+                if spec.restart == RESTART_NEVER:
+                    raise
+            if attempt >= spec.max_restarts:
+                print(f"[Supervisor]: Task '{spec.name}' gave up after {attempt} restarts.")
+                return
+            attempt += 1
+            self.restarts[spec.name] += 1
+            delay = spec.backoff_sec * attempt
+            print(f"[Supervisor]: Restarting '{spec.name}' in {delay:.1f} s (restart {attempt}/{spec.max_restarts})")
+            await asyncio.sleep(delay)
+
+    async def _watch(self, stop_when):
+        while not stop_when():
+            await asyncio.sleep(STOP_POLL_INTERVAL_SEC)
+
+    async def run(self, stop_when=None, on_stop=None):
+        """
+        Runs all registered tasks until request_stop(), stop_when() returns
+        True, a critical task ends, or this coroutine is cancelled (Ctrl+C).
+        on_stop() is called once, as soon as shutdown starts.
+        Returns the measured shutdown latency in ms.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        tasks = {asyncio.create_task(self._run_task(spec), name=spec.name): spec for spec in self._specs}
+        waiters = {asyncio.create_task(self._stop_event.wait(), name="stop-request")}
+        if stop_when is not None:
+            waiters.add(asyncio.create_task(self._watch(stop_when), name="stop-watch"))
+
+        try:
+            pending = set(tasks)
+            while pending:
+                done, _ = await asyncio.wait(pending | waiters, return_when=asyncio.FIRST_COMPLETED)
+                if done & waiters:
+                    break
+                critical_done = False
+                for task in done:
+                    pending.discard(task)
+                    spec = tasks[task]
+                    if not task.cancelled() and task.exception() is not None:
+                        print(f"[Supervisor]: Task '{spec.name}' stopped with error: {task.exception()!r}")
+                    if spec.critical:
+                        print(f"[Supervisor]: Critical task '{spec.name}' ended.")
+                        critical_done = True
+                if critical_done:
+                    break
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            await self._shutdown(tasks, on_stop)
+        return self.shutdown_latency_ms
+
+    async def _shutdown(self, tasks, on_stop):
+        start = time.perf_counter()
+        if on_stop is not None:
+            on_stop()
+
+        running = [task for task in tasks if not task.done()]
+        graceful = [task for task in running if tasks[task].grace_sec > 0]
+        if graceful:
+            _, late = await asyncio.wait(graceful, timeout=max(tasks[task].grace_sec for task in graceful))
+            for task in late:
+                print(f"[Supervisor]: Task '{tasks[task].name}' did not finish within its grace period.")
+        cancel_start = time.perf_counter()
+
+        still_running = [task for task in running if not task.done()]
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            _, pending = await asyncio.wait(still_running, timeout=self.shutdown_timeout)
+            for task in pending:
+                print(f"[Supervisor]: Task '{tasks[task].name}' did not stop in time.")
+
+        end = time.perf_counter()
+        self.grace_ms = (cancel_start - start) * 1000
+        self.cancel_ms = (end - cancel_start) * 1000
+        self.shutdown_latency_ms = (end - start) * 1000
+        print(f"[Supervisor]: All tasks stopped in {self.shutdown_latency_ms:.1f} ms "
+              f"(graceful tasks {self.grace_ms:.1f} ms, cancellation {self.cancel_ms:.1f} ms).")
@@ -0,0 +1,254 @@
+# --- NEXO SPECULATIVE LLM CALLS ---
+# A voice turn used to be strictly sequential: wait for the final transcript,
+# then ask the LLM, then speak. With streaming partial transcripts the LLM
+# request can start while the user is still finishing the sentence:
+#
+#  * every partial goes to Speculator.on_partial(). Once the text has not
+#    changed for STABLE_SEC (and has at least MIN_WORDS words) a cancellable
+#    request is started for it.
+#  * a partial that changes after that cancels the request; a new one starts
+#    when the text is stable again.
+#  * finalize(final) keeps the in-flight request if its text matches the final
+#    transcript (normalised) and cancels it otherwise. take() then returns the
+#    speculative reply, or None so the caller asks the LLM as usual.
+#
+# Partial transcripts come from VoskPartials (offline, true streaming) when the
+# vosk package and a model are installed. GooglePartials re-uploads the whole
+# phrase captured so far every PARTIAL_INTERVAL_SEC, which multiplies STT
+# requests (and each stable partial may start an LLM request), so it is only
+# used when the caller opts in with allow_google.
+import importlib.util
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nexo_response_cache import normalize_prompt
+
+STABLE_SEC = 0.35              # partial unchanged this long -> speculate
+MIN_WORDS = 2
+PARTIAL_INTERVAL_SEC = 0.6     # GooglePartials: one re-recognition per interval
+
+
+class SpeculativeRequest:
+    """One in-flight LLM request for a partial transcript."""
+    __slots__ = ("text", "key", "started_at", "done_at", "cancel", "future")
+
+    def __init__(self, text, key, started_at):
+        self.text = text
+        self.key = key
+        self.started_at = started_at
+        self.done_at = None
+        self.cancel = threading.Event()
+        self.future = None
+
+
+class Speculator:
+    """
+    start(text, cancel_event) runs the LLM request on a worker thread and
+    returns the reply, or None when cancel_event was set. accept(text) can veto
+    speculation, e.g. for local intents or cached replies.
+    """
+
+    def __init__(self, start, accept=None, stable_sec=STABLE_SEC, min_words=MIN_WORDS,
+                 max_workers=2, clock=time.monotonic):
+        self._start = start
+        self._accept = accept
+        self.stable_sec = stable_sec
+        self.min_words = min_words
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nexo-speculate")
+        self._lock = threading.Lock()
+        self._current = None           # SpeculativeRequest or None
+        self._kept = None              # request matching the final transcript
+        self._final_at = None
+        self._partial_key = None
+        self._partial_since = None
+        self._vetoed = None
+        self.turns = 0
+        self.started = 0
+        self.wins = 0
+        self.misses = 0                # speculated, but the final transcript differed
+        self.cancelled = 0             # requests aborted (changed partial or miss)
+        self.saved_ms = []
+
+    # --- while the user speaks ---
+    def on_partial(self, text, now=None):
+        now = self._clock() if now is None else now
+        key = normalize_prompt(text or "")
+        with self._lock:
+            if key != self._partial_key:
+                self._partial_key = key
+                self._partial_since = now
+                if self._current is not None and self._current.key != key:
+                    self._cancel_locked(self._current)
+                    self._current = None
+                return
+            if (self._current is None and len(key.split()) >= self.min_words
+                    and now - self._partial_since >= self.stable_sec):
+                if key == self._vetoed:
+                    return
+                if self._accept is not None and not self._accept(text):
+                    self._vetoed = key
+                    return
+                self._launch_locked(text, key, now)
+
+    def _launch_locked(self, text, key, now):
+        request = SpeculativeRequest(text, key, now)
+        request.future = self._executor.submit(self._run, request)
+        self._current = request
+        self.started += 1
+
+    def _run(self, request):
+        try:
+            return self._start(request.text, request.cancel)
+        finally:
+            request.done_at = self._clock()
+
+    def _cancel_locked(self, request):
+        request.cancel.set()
+        request.future.cancel()
+        self.cancelled += 1
+
+    # --- once the final transcript is known ---
+    def finalize(self, text, now=None):
+        """Keeps the request matching `text`, cancels anything else. text=None cancels all."""
+        now = self._clock() if now is None else now
+        key = normalize_prompt(text) if text else None
+        with self._lock:
+            if text:
+                self.turns += 1
+            if self._kept is not None:
+                self._cancel_locked(self._kept)
+                self._kept = None
+            current, self._current = self._current, None
+            if current is not None:
+                if key is not None and current.key == key:
+                    self._kept = current
+                    self._final_at = now
+                else:
+                    self._cancel_locked(current)
+                    if key is not None:
+                        self.misses += 1
+            self._partial_key = self._partial_since = self._vetoed = None
+
+    def take(self, timeout=None):
+        """The speculative reply for the last final transcript, or None."""
+        with self._lock:
+            request, self._kept = self._kept, None
+            final_at = self._final_at
+        if request is None:
+            return None
+        try:
+            reply = request.future.result(timeout=timeout)
+        except Exception as e:
+            print(f"[Speculator]: Speculative request failed: {e}")
+            return None
+        if reply is None:
+            return None
+        with self._lock:
+            self.wins += 1
+            self.saved_ms.append((min(final_at, request.done_at) - request.started_at) * 1000)
+        return reply
+
+    def report(self):
+        saved = sorted(self.saved_ms)
+        return {
+            "turns": self.turns,
+            "speculated": self.started,
+            "wins": self.wins,
+            "misses": self.misses,
+            "cancelled": self.cancelled,
+            "win_rate": round(self.wins / self.turns, 3) if self.turns else 0.0,
+            "saved_ms_mean": round(sum(saved) / len(saved), 1) if saved else 0.0,
+            "saved_ms_p50": round(saved[len(saved) // 2], 1) if saved else 0.0,
+        }
+
+    def shutdown(self):
+        self.finalize(None)
+        self._executor.shutdown(wait=False)
+
+
+# --- partial transcript sources ---
+# feed(chunk) takes raw PCM bytes and returns the best transcript so far (or None).
+
+class VoskPartials:
+    """Offline streaming recognizer; PartialResult() updates with every chunk."""
+    _models = {}
+
+    def __init__(self, model_path, sample_rate):
+        import vosk
+        model = self._models.get(model_path)
+        if model is None:
+            model = self._models[model_path] = vosk.Model(model_path)
+        self._recognizer = vosk.KaldiRecognizer(model, sample_rate)
+        self._segments = []
+
+    def feed(self, chunk):
+        if self._recognizer.AcceptWaveform(chunk):
+            self._segments.append(json.loads(self._recognizer.Result()).get("text", ""))
+            partial = ""
+        else:
+            partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return " ".join(s for s in self._segments + [partial] if s) or None
+
+    def close(self):
+        pass
+
+
+class GooglePartials:
+    """
+    Re-recognises everything captured so far with recognize_google() on a
+    background thread, at most one request at a time. Costs a few extra STT
+    requests per phrase; use Vosk where possible.
+    """
+
+    def __init__(self, recognizer, sr, sample_rate, sample_width, interval_sec=PARTIAL_INTERVAL_SEC):
+        self._recognizer = recognizer
+        self._sr = sr
+        self._rate = sample_rate
+        self._width = sample_width
+        self.interval_sec = interval_sec
+        self._audio = bytearray()
+        self._latest = None
+        self._pending = None
+        self._last_sent = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nexo-partials")
+
+    def _recognize(self, frame_data):
+        try:
+            return self._recognizer.recognize_google(self._sr.AudioData(frame_data, self._rate, self._width))
+        except Exception:
+            return None
+
+    def feed(self, chunk):
+        self._audio += chunk
+        if self._pending is not None and self._pending.done():
+            self._latest = self._pending.result() or self._latest
+            self._pending = None
+        now = time.monotonic()
+        if self._pending is None and now - self._last_sent >= self.interval_sec:
+            self._pending = self._executor.submit(self._recognize, bytes(self._audio))
+            self._last_sent = now
+        return self._latest
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def vosk_available(model_path):
+    """True if the vosk package is installed and model_path is a model folder."""
+    return bool(model_path) and os.path.isdir(model_path) and importlib.util.find_spec("vosk") is not None
+
+
+def partial_transcriber(recognizer, sr, sample_rate, sample_width, vosk_model_path=None, allow_google=False):
+    """VoskPartials when vosk and a model are available, else GooglePartials if allowed, else None."""
+    if vosk_available(vosk_model_path):
+        try:
+            return VoskPartials(vosk_model_path, sample_rate)
+        except Exception as e:
+            print(f"[Speculator]: Could not load the Vosk model ({e}).")
+    if allow_google:
+        return GooglePartials(recognizer, sr, sample_rate, sample_width)
+    return None
@@ -0,0 +1,128 @@
+# --- NEXO STARTUP HELPERS ---
+# Makes a cold start fast and measurable:
+#  * lazy_import() - a module placeholder that only imports the real module
+#    the first time one of its attributes is used (cv2, selenium,
+#    speech_recognition, pyttsx3, requests, ... are all slow to import).
+#  * start_parallel() - runs the slow init steps (camera, serial ports, LLM
+#    health check, TTS warm-up) at the same time on background threads.
+#  * STARTUP_PROFILE - records import and init times per subsystem, printed by
+#    `python test.py --profile-startup`.
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupProfiler:
+    """Collects import/init timings per subsystem."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self.imports = []      # (subsystem, module, seconds)
+        self.inits = []        # (subsystem, seconds, ok)
+        self.marks = {}        # name -> seconds since t0
+
+    def record_import(self, subsystem, module, seconds):
+        with self._lock:
+            self.imports.append((subsystem, module, seconds))
+
+    def record_init(self, subsystem, seconds, ok):
+        with self._lock:
+            self.inits.append((subsystem, seconds, ok))
+
+    def mark(self, name):
+        """Remembers the first time `name` happened (e.g. 'first_listen'). True on the first call."""
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = time.perf_counter() - self.t0
+            return True
+
+    def elapsed(self, name):
+        """Seconds from start to mark `name`, or None if it hasn't happened."""
+        with self._lock:
+            return self.marks.get(name)
+
+    def timed(self, subsystem, fn, *args):
+        """Runs fn(*args) and records how long it took."""
+        start = time.perf_counter()
+        ok = False
+        try:
+            result = fn(*args)
+            ok = result is not False and result is not None
+            return result
+        finally:
+            self.record_init(subsystem, time.perf_counter() - start, ok)
+
+    def report(self):
+        """Human readable breakdown."""
+        with self._lock:
+            imports = sorted(self.imports, key=lambda item: -item[2])
+            inits = sorted(self.inits, key=lambda item: -item[1])
+            marks = dict(self.marks)
+        lines = ["=" * 50, "STARTUP PROFILE", "-" * 50, "Imports (first use):"]
+        for subsystem, module, seconds in imports:
+            lines.append(f"  {subsystem:<12} {module:<22} {seconds * 1000:8.1f} ms")
+        lines.append("Init steps (run in parallel, include their imports):")
+        for subsystem, seconds, ok in inits:
+            lines.append(f"  {subsystem:<12} {'ok' if ok else 'FAILED':<22} {seconds * 1000:8.1f} ms")
+        lines.append("Milestones (since start):")
+        for name, seconds in sorted(marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {name:<35} {seconds * 1000:8.1f} ms")
+        lines.append("=" * 50)
+        return "\n".join(lines)
+
+
+STARTUP_PROFILE = StartupProfiler()
+
+
+class LazyModule:
+    """Stands in for a module until it is first used."""
+
+    def __init__(self, name, subsystem):
+        self._lazy_name = name
+        self._lazy_subsystem = subsystem
+        self._lazy_module = None
+        self._lazy_lock = threading.Lock()
+
+    def _load(self):
+        if self._lazy_module is None:
+            with self._lazy_lock:
+                if self._lazy_module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._lazy_name)
+                    STARTUP_PROFILE.record_import(self._lazy_subsystem, self._lazy_name, time.perf_counter() - start)
+                    self._lazy_module = module
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._lazy_module is not None else "not loaded"
+        return f"<lazy module '{self._lazy_name}' ({state})>"
+
+
+def lazy_import(name, subsystem):
+    """e.g. cv2 = lazy_import("cv2", "vision")"""
+    return LazyModule(name, subsystem)
+
+
+def preload(*modules):
+    """Imports lazy modules now (e.g. from a background init step)."""
+    for module in modules:
+        if isinstance(module, LazyModule):
+            module._load()
+
+
+def start_parallel(steps):
+    """
+    Starts every init step at once on its own thread.
+    `steps` maps subsystem name -> function. Returns name -> Future; callers
+    only wait on the futures they actually need.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, len(steps)), thread_name_prefix="nexo-init")
+    futures = {name: pool.submit(STARTUP_PROFILE.timed, name, fn) for name, fn in steps.items()}
+    pool.shutdown(wait=False)
+    return futures
@@ -0,0 +1,86 @@
+# --- NEXO SHARED STATE STORE ---
+# Replaces the bare module globals (STRESS_LEVEL, BLINK_RATE,
+# current_heart_rate, last_ecg_data, car_currentState, global_running_flag)
+# that the video, voice and ECG threads used to share.
+#
+# The state is one immutable snapshot (a namedtuple). Writers never modify a
+# snapshot; they build a new one with a bumped version and swap the reference.
+#  * Readers take no lock at all: `STATE.snapshot` is a single attribute read,
+#    and everything in the snapshot they get is from the same moment.
+#  * Writers are serialised by one lock (publishes are rare and tiny).
+#  * Threads can wait for the next version with wait_for_update().
+#  * The last N snapshots are kept in a history ring.
+import threading
+import time
+from collections import deque, namedtuple
+
+STATE_HISTORY_SIZE = 256
+
+BiometricSnapshot = namedtuple("BiometricSnapshot", [
+    "version",        # increases by one on every publish
+    "timestamp",      # time.time() of the publish
+    "stress_level",   # "Normal" / "Moderate Stress" / "High Stress"
+    "blink_rate",     # blinks in the last full minute
+    "heart_rate",     # BPM from the ECG (0 = unknown)
+    "ecg_raw",        # last raw line / status from the ECG
+    "car_state",      # IDLE / SELECTING / FOLLOWING / AVOIDING / SPINNING
+    "running",        # False once anyone asks the whole app to stop
+])
+
+INITIAL_SNAPSHOT = BiometricSnapshot(
+    version=0, timestamp=0.0, stress_level="Normal", blink_rate=0,
+    heart_rate=0, ecg_raw="Connecting...", car_state="IDLE", running=True,
+)
+
+
+class BiometricStateStore:
+    """Versioned, immutable-snapshot state shared by all Nexo threads."""
+
+    def __init__(self, initial=INITIAL_SNAPSHOT, history_size=STATE_HISTORY_SIZE):
+        self._snapshot = initial._replace(timestamp=time.time())
+        self._cond = threading.Condition(threading.Lock())
+        self._history = deque([self._snapshot], maxlen=history_size)
+
+    @property
+    def snapshot(self):
+        """The current snapshot. Lock-free; never changes after you get it."""
+        return self._snapshot
+
+    def publish(self, **changes):
+        """
+        Publishes a new snapshot with the given fields changed,
+        e.g. STATE.publish(heart_rate=72, ecg_raw="512").
+        Returns the new snapshot.
+        """
+        with self._cond:
+            new = self._snapshot._replace(version=self._snapshot.version + 1,
+                                          timestamp=time.time(), **changes)
+            self._snapshot = new
+            self._history.append(new)
+            self._cond.notify_all()
+        return new
+
+    def wait_for_update(self, last_version, timeout=None):
+        """
+        Blocks until a snapshot newer than last_version is published
+        (or timeout expires) and returns the current snapshot.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._snapshot.version > last_version, timeout)
+            return self._snapshot
+
+    def history(self, n=None):
+        """The last n snapshots, oldest first."""
+        with self._cond:
+            items = list(self._history)
+        return items if n is None else items[-n:]
+
+    # --- Convenience for the shared run flag ---
+    @property
+    def running(self):
+        return self._snapshot.running
+
+    def request_shutdown(self):
+        """Tells every loop to stop and wakes anything waiting for an update."""
+        if self._snapshot.running:
+            self.publish(running=False)
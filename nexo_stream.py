@@ -0,0 +1,463 @@
+# --- NEXO BIOMETRIC STREAMING SERVER ---
+# Publishes the live ECG samples and the biometric status (BPM, HRV, stress
+# level, ...) to any number of dashboard clients on the local machine:
+#  * WebSocket  ws://127.0.0.1:<port>/ws      binary ECG blocks + JSON text
+#  * SSE        http://127.0.0.1:<port>/events "ecg" events (base64 blocks)
+#                                               and "status" events (JSON)
+#  * JSON       http://127.0.0.1:<port>/status  latest status + server stats
+#
+# ECG block (little-endian): BLOCK_HEADER = magic "NXE1", block seq (uint32),
+# t0 = time of the first sample (float64, unix seconds), dt = seconds between
+# samples (float32), decimation (uint8), sample count (uint16), followed by a
+# zlib stream of `count` int16 deltas: the first sample, then the difference
+# to the previous sample for the rest. Each delta is zigzag encoded
+# ((d << 1) ^ (d >> 15), so small negative numbers become small positive ones)
+# and stored as byte planes: all low bytes, then all high bytes. The high
+# bytes are then nearly all zero and compress away, roughly halving the block
+# compared to plain int16. In a browser: DecompressionStream("deflate"),
+# z = low[i] | high[i] << 8, d = (z >> 1) ^ -(z & 1), then a running sum.
+#
+# Samples are collected for BLOCK_SEC and encoded once per decimation level
+# in use, however many clients there are. Each client has a bounded queue.
+# A client that falls behind by SLOW_LAG_BLOCKS blocks is switched to
+# decimated blocks (mean of 4, then 16 samples), and blocks are dropped for it
+# once its queue is full. It steps back to full rate after RECOVER_BLOCKS
+# blocks without lag.
+# How far behind a client is: WebSocket clients should send a text message
+# {"ack": <block seq>} after handling a block (every few blocks is enough);
+# the lag is then the number of blocks since the last ack. For clients that
+# never ack (and SSE clients) it is the depth of their queue, which only
+# starts to grow once the socket buffers are full, so those are kept small.
+#
+# Only the dashboard may read the stream from a browser: a request carrying an
+# Origin header (every WebSocket handshake and cross-origin fetch/EventSource
+# from a web page) is refused with 403 unless that origin is in
+# allowed_origins, so another page open in the user's browser can't read the
+# ECG from 127.0.0.1. Clients that send no Origin (scripts, native apps) are
+# served. CORS headers name the allowed origin, never "*".
+# Every request must also name this server in its Host header (127.0.0.1,
+# localhost, the bind host or allowed_hosts, with the right port): after DNS
+# rebinding an attacker's page is "same origin" and sends no Origin, but its
+# Host is still the attacker's domain. Client WebSocket frames are small
+# (acks, pings); longer ones than MAX_CLIENT_FRAME close the connection.
+#
+# The server runs its own asyncio loop on a daemon thread; push_sample() and
+# publish_status() can be called from any thread.
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import socket
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+
+STREAM_PORT = 8765             # test.py (Nexo)
+ECG_APP_STREAM_PORT = 8766     # ECGFEELU.py, so both can run at once
+BLOCK_SEC = 0.1
+CLIENT_QUEUE_BLOCKS = 16
+DECIMATION_LEVELS = (1, 4, 16)
+SLOW_LAG_BLOCKS = 4            # blocks behind that count as falling behind
+RECOVER_BLOCKS = 20
+WRITE_BUFFER_HIGH = 4096       # per-client transport buffer before drain() waits
+SEND_BUFFER_BYTES = 8192       # per-client kernel send buffer (no autotuning to megabytes)
+SAMPLE_LIMIT = 16383           # samples are clamped so every delta fits in int16
+
+BLOCK_HEADER = struct.Struct("<4sIdfBH")
+BLOCK_MAGIC = b"NXE1"
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+MAX_CLIENT_FRAME = 4096        # bytes; a client only sends acks, pings and close frames
+
+
+def origin_of(url):
+    """The Origin a browser sends for pages under `url`, e.g. 'https://host:8080'."""
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def decimate(values, factor):
+    """Mean of every `factor` samples (a boxcar low-pass, so there is no aliasing noise)."""
+    return [sum(values[i:i + factor]) // len(values[i:i + factor]) for i in range(0, len(values), factor)]
+
+
+def encode_block(seq, t0, dt, values, decimation=1):
+    """One ECG block: header + zlib(int16 first sample + deltas)."""
+    if decimation > 1:
+        values = decimate(values, decimation)
+        dt *= decimation
+    deltas = [values[0]] + [b - a for a, b in zip(values, values[1:])]
+    zigzag = [((d << 1) ^ (d >> 15)) & 0xFFFF for d in deltas]
+    planes = bytes(z & 0xFF for z in zigzag) + bytes(z >> 8 for z in zigzag)
+    header = BLOCK_HEADER.pack(BLOCK_MAGIC, seq & 0xFFFFFFFF, t0, dt, decimation, len(deltas))
+    return header + zlib.compress(planes)
+
+
+def decode_block(data):
+    """The inverse of encode_block(): {"seq", "t0", "dt", "decimation", "values"}."""
+    magic, seq, t0, dt, decimation, count = BLOCK_HEADER.unpack_from(data)
+    if magic != BLOCK_MAGIC:
+        raise ValueError("not an NXE1 block")
+    planes = zlib.decompress(data[BLOCK_HEADER.size:])
+    if len(planes) != 2 * count:
+        raise ValueError("block length mismatch")
+    zigzag = (low | high << 8 for low, high in zip(planes[:count], planes[count:]))
+    return {"seq": seq, "t0": t0, "dt": dt, "decimation": decimation,
+            "values": list(itertools.accumulate((z >> 1) ^ -(z & 1) for z in zigzag))}
+
+
+def ws_frame(payload, opcode=0x2):
+    """An unmasked, unfragmented WebSocket frame (server -> client)."""
+    n = len(payload)
+    if n < 126:
+        header = struct.pack("!BB", 0x80 | opcode, n)
+    elif n < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, n)
+    return header + payload
+
+
+def _sse_event(event, data):
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+
+def _frame(kind, message):
+    """Wire bytes of a block (bytes) or a status message (dict) for a websocket/sse client."""
+    if isinstance(message, dict):
+        text = json.dumps(message)
+        return ws_frame(text.encode(), 0x1) if kind == "ws" else _sse_event(message["type"], text)
+    return ws_frame(message) if kind == "ws" else _sse_event("ecg", base64.b64encode(message).decode())
+
+
+class _Client:
+    __slots__ = ("kind", "writer", "queue", "level", "calm", "sent", "dropped", "acked")
+
+    def __init__(self, kind, writer, queue_blocks):
+        self.kind = kind
+        self.writer = writer
+        self.queue = asyncio.Queue(maxsize=queue_blocks)
+        self.level = 0
+        self.calm = 0
+        self.sent = 0
+        self.dropped = 0
+        self.acked = None              # last block seq acknowledged by the client
+
+    def decimation(self, seq):
+        """Adjusts this client's decimation to its lag before block `seq` and returns the factor."""
+        lag = seq - 1 - self.acked if self.acked is not None else self.queue.qsize()
+        if lag >= SLOW_LAG_BLOCKS:
+            self.calm = 0
+            if self.level < len(DECIMATION_LEVELS) - 1:
+                self.level += 1
+        elif lag == 0:
+            self.calm += 1
+            if self.calm >= RECOVER_BLOCKS and self.level > 0:
+                self.level -= 1
+                self.calm = 0
+        else:
+            self.calm = 0
+        return DECIMATION_LEVELS[self.level]
+
+    def offer(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+
+class BiometricStreamServer:
+    """WebSocket + SSE fan-out of ECG blocks and biometric status. See the module header."""
+
+    def __init__(self, host="127.0.0.1", port=STREAM_PORT, block_sec=BLOCK_SEC,
+                 queue_blocks=CLIENT_QUEUE_BLOCKS, write_buffer_high=WRITE_BUFFER_HIGH,
+                 send_buffer=SEND_BUFFER_BYTES, allowed_origins=(), allowed_hosts=()):
+        self.host = host
+        self.allowed_origins = {origin.rstrip("/").lower() for origin in allowed_origins}
+        self.allowed_hosts = {name.lower() for name in (*LOCAL_HOSTS, host, *allowed_hosts)}
+        self.port = port
+        self.block_sec = block_sec
+        self.queue_blocks = queue_blocks
+        self.write_buffer_high = write_buffer_high
+        self.send_buffer = send_buffer
+        self.error = None
+        self._lock = threading.Lock()
+        self._pending = []             # (timestamp, value) since the last block
+        self._status = {}
+        self._status_version = 0
+        self._sent_status_version = 0
+        self._clients = set()
+        self._loop = None
+        self._thread = None
+        self._seq = 0
+        self.blocks = 0
+        self.samples = 0
+        self.bytes_raw = 0             # the same samples as plain int16
+        self.bytes_encoded = 0         # full-rate blocks
+        self.clients_total = 0
+        self.rejected_origins = 0
+        self.rejected_hosts = 0
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/ws"
+
+    # --- producer side (any thread) ---
+    def push_sample(self, value, timestamp=None):
+        with self._lock:
+            self._pending.append((time.time() if timestamp is None else timestamp, value))
+
+    def publish_status(self, **fields):
+        """Merges fields into the status; clients get it with the next block if anything changed."""
+        with self._lock:
+            changed = False
+            for name, value in fields.items():
+                if self._status.get(name) != value:
+                    self._status[name] = value
+                    changed = True
+            if changed:
+                self._status_version += 1
+
+    def follow_state(self, store, fields=("stress_level", "blink_rate", "heart_rate", "car_state")):
+        """Publishes the given BiometricStateStore fields whenever they change (daemon thread)."""
+        def run():
+            version = -1
+            while store.running:
+                snapshot = store.wait_for_update(version, timeout=1.0)
+                version = snapshot.version
+                self.publish_status(**{name: getattr(snapshot, name) for name in fields})
+
+        thread = threading.Thread(target=run, name="nexo-stream-state", daemon=True)
+        thread.start()
+        return thread
+
+    # --- server lifecycle ---
+    def start(self):
+        """Starts the server thread. False (and self.error) if the port could not be opened."""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="nexo-stream", daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        return self.error is None
+
+    def stop(self):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=2)
+
+    def _run(self, ready):
+        loop = asyncio.new_event_loop()
+        try:
+            server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            self.error = e
+            print(f"[Stream]: Could not start the streaming server on port {self.port}: {e}")
+            loop.close()
+            ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        self._loop = loop
+        print(f"[Stream]: Streaming biometrics on {self.url} and http://{self.host}:{self.port}/events")
+        ready.set()
+        flusher = loop.create_task(self._flush_loop())
+        try:
+            loop.run_forever()
+        finally:
+            flusher.cancel()
+            server.close()
+            for client in list(self._clients):
+                client.writer.close()
+            loop.run_until_complete(asyncio.sleep(0))
+            loop.close()
+
+    def stats(self):
+        clients = list(self._clients)
+        return {
+            "clients": len(clients),
+            "clients_total": self.clients_total,
+            "clients_by_decimation": {str(f): sum(1 for c in clients if DECIMATION_LEVELS[c.level] == f)
+                                      for f in DECIMATION_LEVELS},
+            "blocks": self.blocks,
+            "samples": self.samples,
+            "compression_ratio": round(self.bytes_raw / self.bytes_encoded, 2) if self.bytes_encoded else None,
+            "dropped_blocks": sum(c.dropped for c in clients),
+            "rejected_origins": self.rejected_origins,
+            "rejected_hosts": self.rejected_hosts,
+        }
+
+    # --- fan-out (event loop) ---
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.block_sec)
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            samples, self._pending = self._pending, []
+            status = None
+            if self._status_version != self._sent_status_version:
+                status = dict(self._status, type="status")
+                self._sent_status_version = self._status_version
+        if status is not None:
+            frames = {kind: _frame(kind, status) for kind in ("ws", "sse")}
+            for client in self._clients:
+                client.offer(frames[client.kind])
+        if not samples:
+            return
+
+        t0 = samples[0][0]
+        dt = (samples[-1][0] - t0) / (len(samples) - 1) if len(samples) > 1 else 0.0
+        values = [max(-SAMPLE_LIMIT, min(SAMPLE_LIMIT, int(v))) for _, v in samples]
+        seq = self._seq
+        self._seq += 1
+        blocks = {1: encode_block(seq, t0, dt, values)}
+        self.blocks += 1
+        self.samples += len(values)
+        self.bytes_raw += 2 * len(values)
+        self.bytes_encoded += len(blocks[1])
+
+        frames = {}
+        for client in self._clients:
+            factor = client.decimation(seq)
+            frame = frames.get((factor, client.kind))
+            if frame is None:
+                block = blocks.get(factor)
+                if block is None:
+                    block = blocks[factor] = encode_block(seq, t0, dt, values, factor)
+                frame = frames[(factor, client.kind)] = _frame(client.kind, block)
+            client.offer(frame)
+
+    async def _pump(self, client):
+        writer = client.writer
+        try:
+            while True:
+                frame = await client.queue.get()
+                writer.write(frame)
+                await writer.drain()
+                client.sent += 1
+        except ConnectionError:
+            return
+
+    # --- connections ---
+    async def _handle(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+            if not self._host_allowed(headers.get("host", "")):
+                self.rejected_hosts += 1
+                print(f"[Stream]: Refused a {path} request for host {headers.get('host')!r}")
+                writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+            origin = headers.get("origin")
+            if origin is not None and origin.rstrip("/").lower() not in self.allowed_origins:
+                self.rejected_origins += 1
+                print(f"[Stream]: Refused a {path} request from origin {origin}")
+                writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+            cors = b"" if origin is None else f"Access-Control-Allow-Origin: {origin}\r\nVary: Origin\r\n".encode()
+
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._serve_websocket(reader, writer, headers)
+            elif path == "/events":
+                await self._serve_sse(reader, writer, cors)
+            elif path == "/status":
+                body = json.dumps({"status": dict(self._status), "server": self.stats()}).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n" + cors
+                             + f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+                await writer.drain()
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _host_allowed(self, host):
+        """True if a Host header ('127.0.0.1:8765', '[::1]:8765') names this server."""
+        name, _, port = host.strip().lower().rpartition(":")
+        if not name or "]" in port:          # no port given (or a bare IPv6 address)
+            name, port = host.strip().lower(), "80"
+        return name.strip("[]") in self.allowed_hosts and port == str(self.port)
+
+    def _hello(self, kind):
+        with self._lock:
+            status = dict(self._status, type="status")
+        hello = {"type": "hello", "format": BLOCK_MAGIC.decode(), "block_sec": self.block_sec,
+                 "decimation_levels": list(DECIMATION_LEVELS)}
+        return _frame(kind, hello) + _frame(kind, status)
+
+    async def _stream_to(self, client, until):
+        """Registers the client and pumps its queue until `until` (a coroutine) returns."""
+        client.writer.transport.set_write_buffer_limits(high=self.write_buffer_high)
+        sock = client.writer.get_extra_info("socket")
+        if sock is not None and self.send_buffer:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.send_buffer)
+        self._clients.add(client)
+        self.clients_total += 1
+        pump = asyncio.ensure_future(self._pump(client))
+        watch = asyncio.ensure_future(until)
+        try:
+            await asyncio.wait({pump, watch}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self._clients.discard(client)
+            pump.cancel()
+            watch.cancel()
+
+    async def _serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode() + self._hello("ws"))
+        await writer.drain()
+        client = _Client("ws", writer, self.queue_blocks)
+        await self._stream_to(client, self._read_websocket(reader, writer, client))
+
+    async def _read_websocket(self, reader, writer, client):
+        """Reads client frames until close: acks, pings and close."""
+        try:
+            while True:
+                b1, b2 = await reader.readexactly(2)
+                length = b2 & 0x7F
+                if length == 126:
+                    (length,) = struct.unpack("!H", await reader.readexactly(2))
+                elif length == 127:
+                    (length,) = struct.unpack("!Q", await reader.readexactly(8))
+                if length > MAX_CLIENT_FRAME:
+                    writer.write(ws_frame(struct.pack("!H", 1009), 0x8))    # 1009: message too big
+                    return
+                mask = await reader.readexactly(4) if b2 & 0x80 else bytes(4)
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(length)))
+                opcode = b1 & 0x0F
+                if opcode == 0x8:
+                    writer.write(ws_frame(payload[:2], 0x8))
+                    return
+                if opcode == 0x9:
+                    writer.write(ws_frame(payload, 0xA))
+                elif opcode == 0x1:
+                    try:
+                        client.acked = int(json.loads(payload)["ack"])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            return
+
+    async def _serve_sse(self, reader, writer, cors=b""):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                     + cors + b"Connection: keep-alive\r\n\r\n" + self._hello("sse"))
+        await writer.drain()
+        await self._stream_to(_Client("sse", writer, self.queue_blocks), reader.read())
@@ -0,0 +1,273 @@
+# --- NEXO TARGET TRACKING & MOTOR CONTROL ---
+# Splits "follow the target" into three parts that no longer share one clock:
+#  * HybridTracker   - a fast OpenCV tracker (KCF / MOSSE) on every frame, with
+#                      a CSRT re-check every few frames that corrects drift.
+#                      "CSRT" alone gives the old behaviour.
+#  * BBoxPredictor   - a constant-velocity Kalman filter on the bbox. Fed with
+#                      each tracked frame, it can predict where the target is
+#                      at ANY moment in between.
+#  * MotorControlLoop - a PID controller on its own thread, ticking at a fixed
+#                      rate (CONTROL_RATE_HZ) from the prediction, so the car's
+#                      steering no longer jitters with the camera frame rate.
+import threading
+import time
+
+import cv2
+
+TRACKER_KINDS = ("CSRT", "KCF", "MOSSE")
+VERIFY_EVERY_FRAMES = 15
+VERIFY_MIN_IOU = 0.4
+
+# At 9600 baud the Arduino link carries ~960 bytes/s; a "M,150,150\n" command
+# every 20 ms uses about half of that (repeated commands are not re-sent).
+CONTROL_RATE_HZ = 50
+MAX_PREDICT_SEC = 0.5     # stop extrapolating if no measurement for this long
+
+
+def create_tracker(kind):
+    """OpenCV tracker by name. KCF/MOSSE need opencv-contrib (cv2 or cv2.legacy)."""
+    kind = kind.upper()
+    if kind not in TRACKER_KINDS:
+        raise ValueError(f"Unknown tracker '{kind}', expected one of {TRACKER_KINDS}")
+    name = f"Tracker{kind}_create"
+    for namespace in (cv2, getattr(cv2, "legacy", None)):
+        factory = getattr(namespace, name, None) if namespace is not None else None
+        if factory is not None:
+            return factory()
+    raise RuntimeError(f"This OpenCV build has no {kind} tracker (install opencv-contrib-python).")
+
+
+def iou(a, b):
+    """Intersection over union of two (x, y, w, h) boxes."""
+    ax2, ay2 = a[0] + a[2], a[1] + a[3]
+    bx2, by2 = b[0] + b[2], b[1] + b[3]
+    iw = max(0.0, min(ax2, bx2) - max(a[0], b[0]))
+    ih = max(0.0, min(ay2, by2) - max(a[1], b[1]))
+    inter = iw * ih
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class HybridTracker:
+    """Fast tracker every frame, CSRT every `verify_every` frames to catch drift."""
+
+    def __init__(self, kind="KCF", verify_every=VERIFY_EVERY_FRAMES, min_iou=VERIFY_MIN_IOU):
+        self.kind = kind.upper()
+        self.verify_every = verify_every if self.kind != "CSRT" else 0
+        self.min_iou = min_iou
+        self.tracker = None
+        self.verifier = None
+        self.frames = 0
+        self.corrections = 0
+
+    def init(self, frame, bbox):
+        bbox = tuple(int(v) for v in bbox)
+        try:
+            self.tracker = create_tracker(self.kind)
+        except RuntimeError as e:
+            print(f"[Tracking]: {e} Falling back to CSRT.")
+            self.kind, self.verify_every = "CSRT", 0
+            self.tracker = create_tracker(self.kind)
+        self.tracker.init(frame, bbox)
+        if self.verify_every:
+            self.verifier = create_tracker("CSRT")
+            self.verifier.init(frame, bbox)
+        self.frames = 0
+
+    def update(self, frame):
+        """Returns (ok, (x, y, w, h)) like the OpenCV trackers."""
+        ok, bbox = self.tracker.update(frame)
+        self.frames += 1
+        if not self.verify_every or self.frames % self.verify_every:
+            return ok, bbox
+
+        verified, reference = self.verifier.update(frame)
+        if verified and (not ok or iou(bbox, reference) < self.min_iou):
+            # The fast tracker drifted (or lost it): restart it on CSRT's box.
+            self.corrections += 1
+            self.tracker = create_tracker(self.kind)
+            self.tracker.init(frame, tuple(int(v) for v in reference))
+            return True, reference
+        if ok and not verified:
+            # CSRT lost the target between checks; restart it on the fast box.
+            self.verifier = create_tracker("CSRT")
+            self.verifier.init(frame, tuple(int(v) for v in bbox))
+        return ok, bbox
+
+
+class _AxisKalman:
+    """1-D constant-velocity Kalman filter: state (position, velocity)."""
+
+    def __init__(self, position, process_noise, measurement_noise):
+        self.x = float(position)
+        self.v = 0.0
+        # covariance [[p00, p01], [p01, p11]]
+        self.p00, self.p01, self.p11 = measurement_noise, 0.0, 1000.0
+        self.q = process_noise
+        self.r = measurement_noise
+
+    def predict(self, dt):
+        self.x += self.v * dt
+        self.p00 += dt * (2 * self.p01 + dt * self.p11) + self.q * dt ** 3 / 3
+        self.p01 += dt * self.p11 + self.q * dt ** 2 / 2
+        self.p11 += self.q * dt
+
+    def correct(self, measured):
+        s = self.p00 + self.r
+        k0, k1 = self.p00 / s, self.p01 / s
+        residual = measured - self.x
+        self.x += k0 * residual
+        self.v += k1 * residual
+        self.p00, self.p01, self.p11 = (1 - k0) * self.p00, (1 - k0) * self.p01, self.p11 - k1 * self.p01
+
+
+class BBoxPredictor:
+    """Constant-velocity Kalman filter on the bbox centre and size. Thread safe."""
+
+    def __init__(self, process_noise=4000.0, measurement_noise=25.0, max_predict_sec=MAX_PREDICT_SEC):
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.max_predict_sec = max_predict_sec
+        self._axes = None
+        self._t = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self._axes = None
+            self._t = None
+
+    def update(self, bbox, timestamp):
+        """Adds one measured (x, y, w, h) taken at `timestamp` (time.monotonic())."""
+        x, y, w, h = bbox
+        measured = (x + w / 2, y + h / 2, w, h)
+        with self._lock:
+            if self._axes is None:
+                self._axes = [_AxisKalman(m, self.process_noise, self.measurement_noise) for m in measured]
+            else:
+                dt = max(0.0, timestamp - self._t)
+                for axis, value in zip(self._axes, measured):
+                    axis.predict(dt)
+                    axis.correct(value)
+            self._t = timestamp
+
+    def predict(self, timestamp):
+        """Predicted (x, y, w, h) at `timestamp`, or None if there is no recent measurement."""
+        with self._lock:
+            if self._axes is None or timestamp - self._t > self.max_predict_sec:
+                return None
+            dt = max(0.0, timestamp - self._t)
+            cx, cy, w, h = (axis.x + axis.v * dt for axis in self._axes)
+        return (cx - w / 2, cy - h / 2, w, h)
+
+
+class PIDController:
+    """Textbook PID with output and integral clamping."""
+
+    def __init__(self, kp, ki=0.0, kd=0.0, out_limit=255.0, integral_limit=500.0):
+        self.kp, self.ki, self.kd = kp, ki, kd
+        self.out_limit = out_limit
+        self.integral_limit = integral_limit
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.previous_error = None
+
+    def update(self, error, dt):
+        if dt > 0:
+            self.integral = max(-self.integral_limit, min(self.integral + error * dt, self.integral_limit))
+        derivative = 0.0
+        if self.previous_error is not None and dt > 0:
+            derivative = (error - self.previous_error) / dt
+        self.previous_error = error
+        output = self.kp * error + self.ki * self.integral + self.kd * derivative
+        return max(-self.out_limit, min(output, self.out_limit))
+
+
+class MotorControlLoop:
+    """
+    Fixed-rate steering thread. While following, every tick predicts the
+    target's position, runs the PID on its offset from the frame centre and
+    sends "M,left,right" through send(command).
+    """
+
+    def __init__(self, predictor, send, frame_center_x, base_speed, pid, dead_zone=0, rate_hz=CONTROL_RATE_HZ):
+        self.predictor = predictor
+        self.send = send
+        self.frame_center_x = frame_center_x
+        self.base_speed = base_speed
+        self.pid = pid
+        self.dead_zone = dead_zone
+        self.period = 1.0 / rate_hz
+        self.last_command = None
+        self.ticks = 0
+        self.lateness_ms = []       # how late each tick woke up (ring of the last 1000)
+        self._following = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="nexo-motor-control", daemon=True)
+        self._thread.start()
+
+    def follow(self):
+        with self._lock:
+            self.pid.reset()
+            self._following = True
+
+    def pause(self):
+        """Stops steering. Once this returns, no further command is sent until follow()."""
+        with self._lock:
+            self._following = False
+
+    @property
+    def following(self):
+        return self._following
+
+    def stop(self):
+        self.pause()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def _tick(self, now):
+        bbox = self.predictor.predict(now)
+        if bbox is None:
+            # No measurement for max_predict_sec (vision stalled or lagging): the
+            # Arduino keeps the last command forever, so stop it, once.
+            if self.last_command != "S":
+                self.pid.reset()
+                self.last_command = "S"
+                self.send(self.last_command)
+            return
+        error = (bbox[0] + bbox[2] / 2) - self.frame_center_x
+        if abs(error) < self.dead_zone:
+            # The error is ignored here, so it mustn't wind up the integral either
+            self.pid.reset()
+            turn = 0.0
+        else:
+            turn = self.pid.update(error, self.period)
+        left = max(-255, min(self.base_speed + turn, 255))
+        right = max(-255, min(self.base_speed - turn, 255))
+        self.last_command = f"M,{int(left)},{int(right)}"
+        self.send(self.last_command)
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            next_tick += self.period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+            now = time.monotonic()
+            self.lateness_ms.append((now - next_tick) * 1000)
+            if len(self.lateness_ms) > 1000:
+                del self.lateness_ms[:500]
+            if now - next_tick > self.period:
+                next_tick = now      # fell behind (e.g. a blocking write): don't burst
+            with self._lock:
+                if self._following:
+                    self.ticks += 1
+                    self._tick(now)
@@ -0,0 +1,345 @@
+# --- NEXO VISION PIPELINE ---
+# Face/eye detection (blink counting), target tracking and the follow
+# command for the car, for ONE frame at a time.
+#
+# Two ways to run it, with the same interface (submit / poll / start_tracking
+# / stop_tracking / close):
+#  * InProcessVision - runs in the calling thread (the old behaviour).
+#  * ProcessVision   - runs in its own process, so Haar detection and
+#    tracking no longer fight the voice and ECG threads for the GIL.
+#    Frames go through multiprocessing.shared_memory ring slots (the worker
+#    reads them as NumPy views, no pickling); results come back over a
+#    small multiprocessing queue.
+#
+# Blinks: blink_consec_frames is meant at BLINK_REFERENCE_FPS. The frame rate
+# actually reaching the pipeline (from the frame timestamps) drops when the
+# governor lowers the capture rate or the machine can't keep up, so the
+# threshold is scaled to it: at 15 fps one frame without eyes spans what two
+# do at 30, and short blinks still count.
+import os
+import queue
+import time
+import multiprocessing as mp
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from nexo_tracking import HybridTracker, VERIFY_EVERY_FRAMES
+
+VISION_RING_SLOTS = 4
+BLINK_REFERENCE_FPS = 30.0
+FPS_SMOOTHING = 0.2         # EMA weight of the newest frame interval
+
+VisionResult = namedtuple("VisionResult", [
+    "seq",           # frame number given to submit()
+    "faces",         # [(x, y, w, h), ...]
+    "eyes",          # [(x, y, w, h), ...] in frame coordinates
+    "blink",         # True when this frame completed a blink
+    "track_ok",      # None when not tracking, else tracker.update()'s ok
+    "track_bbox",    # (x, y, w, h) or None
+    "car_command",   # follow command for this bbox, e.g. "M,150,150", or None
+    "left_speed",
+    "right_speed",
+    "timestamp",     # time.monotonic() when the frame was captured (given to submit())
+    "tracking_ms",   # time spent in tracker.update() (0 when not tracking)
+    "detection_ms",  # time spent in face/eye detection
+])
+
+
+def clamp(value, min_val=-255, max_val=255):
+    """Clamps a value between a min and max."""
+    return max(min_val, min(value, max_val))
+
+
+def follow_command(bbox, frame_center_x, base_speed, kp_turn, dead_zone):
+    """Proportional steering towards the bbox centre. Returns (command, left, right)."""
+    target_center_x = int(bbox[0] + bbox[2] / 2)
+    error = target_center_x - frame_center_x
+    left_speed = base_speed
+    right_speed = base_speed
+    if abs(error) >= dead_zone:
+        turn = kp_turn * error
+        left_speed = clamp(base_speed + turn)
+        right_speed = clamp(base_speed - turn)
+    return f"M,{int(left_speed)},{int(right_speed)}", left_speed, right_speed
+
+
+class VisionPipeline:
+    """The per-frame vision work. Holds the cascades, blink counter and tracker."""
+
+    def __init__(self, frame_width, frame_height, base_speed, kp_turn, dead_zone, blink_consec_frames,
+                 tracker_kind="CSRT", verify_every=VERIFY_EVERY_FRAMES):
+        face_cascade_path = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
+        eye_cascade_path = os.path.join(cv2.data.haarcascades, 'haarcascade_eye.xml')
+        if not os.path.exists(face_cascade_path):
+            raise FileNotFoundError(f"Could not find face cascade: {face_cascade_path}")
+        if not os.path.exists(eye_cascade_path):
+            raise FileNotFoundError(f"Could not find eye cascade: {eye_cascade_path}")
+        self.face_cascade = cv2.CascadeClassifier(face_cascade_path)
+        self.eye_cascade = cv2.CascadeClassifier(eye_cascade_path)
+
+        self.frame_center_x = frame_width // 2
+        self.base_speed = base_speed
+        self.kp_turn = kp_turn
+        self.dead_zone = dead_zone
+        self.blink_consec_frames = blink_consec_frames
+        self.blink_counter = 0
+        self.fps = None             # measured from the frame timestamps
+        self._blink_counted = False
+        self._last_timestamp = None
+        self.tracker_kind = tracker_kind
+        self.verify_every = verify_every
+        self.tracker = None
+        self._gray = None   # reused grayscale buffer
+
+    def start_tracking(self, frame, bbox):
+        self.tracker = HybridTracker(self.tracker_kind, self.verify_every)
+        self.tracker.init(frame, bbox)
+
+    def stop_tracking(self):
+        self.tracker = None
+
+    def blink_frames(self, timestamp):
+        """Frames without eyes that make a blink, at the frame rate measured up to `timestamp`."""
+        if timestamp is not None:
+            if self._last_timestamp is not None and 0 < timestamp - self._last_timestamp < 1.0:
+                fps = 1.0 / (timestamp - self._last_timestamp)
+                self.fps = fps if self.fps is None else self.fps + FPS_SMOOTHING * (fps - self.fps)
+            self._last_timestamp = timestamp
+        if self.fps is None:
+            return self.blink_consec_frames
+        return max(1, round(self.blink_consec_frames * self.fps / BLINK_REFERENCE_FPS))
+
+    def process(self, seq, frame, timestamp=None):
+        # --- Tracking ---
+        start = time.perf_counter()
+        track_ok, track_bbox = None, None
+        car_command, left_speed, right_speed = None, None, None
+        if self.tracker is not None:
+            track_ok, bbox = self.tracker.update(frame)
+            if track_ok:
+                track_bbox = tuple(float(v) for v in bbox)
+                car_command, left_speed, right_speed = follow_command(
+                    track_bbox, self.frame_center_x, self.base_speed, self.kp_turn, self.dead_zone)
+            else:
+                self.tracker = None
+
+        tracked = time.perf_counter()
+
+        # --- Face / eye detection ---
+        if self._gray is None or self._gray.shape != frame.shape[:2]:
+            self._gray = np.empty(frame.shape[:2], dtype=np.uint8)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray)
+        faces = self.face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50))
+
+        eyes_detected = False
+        detected_faces = []
+        detected_eyes = []
+        for (x, y, w, h) in faces:
+            detected_faces.append((int(x), int(y), int(w), int(h)))
+            if w > 0:
+                roi_gray = gray[y:y+h, x:x+w]
+                eyes = self.eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=4, minSize=(20, 20))
+                if len(eyes) > 0:
+                    eyes_detected = True
+                    for (ex, ey, ew, eh) in eyes:
+                        detected_eyes.append((int(x+ex), int(y+ey), int(ew), int(eh)))
+                break
+
+        detected = time.perf_counter()
+
+        # --- Blink counting ---
+        needed = self.blink_frames(timestamp)
+        if eyes_detected:
+            self.blink_counter = 0
+            self._blink_counted = False
+        else:
+            self.blink_counter += 1
+        # >= and a flag: the threshold can change in the middle of a blink
+        blink = not eyes_detected and not self._blink_counted and self.blink_counter >= needed
+        if blink:
+            self._blink_counted = True
+
+        return VisionResult(seq, detected_faces, detected_eyes, blink,
+                            track_ok, track_bbox, car_command, left_speed, right_speed, timestamp,
+                            (tracked - start) * 1000, (detected - tracked) * 1000)
+
+
+class InProcessVision:
+    """Runs the pipeline synchronously in the calling thread."""
+
+    def __init__(self, frame_shape, **pipeline_args):
+        height, width = frame_shape[:2]
+        self.pipeline = VisionPipeline(width, height, **pipeline_args)
+        self._results = deque()
+        self._seq = 0
+        self.dropped_frames = 0
+
+    @property
+    def tracking(self):
+        return self.pipeline.tracker is not None
+
+    def submit(self, frame, timestamp=None):
+        self._seq += 1
+        self._results.append(self.pipeline.process(self._seq, frame, timestamp))
+
+    def poll(self):
+        results = list(self._results)
+        self._results.clear()
+        return results
+
+    def start_tracking(self, frame, bbox):
+        self.pipeline.start_tracking(frame, bbox)
+
+    def stop_tracking(self):
+        self.pipeline.stop_tracking()
+
+    def close(self):
+        pass
+
+
+class SharedFrameRing:
+    """N frame slots in one shared memory block, exposed as NumPy views."""
+
+    def __init__(self, frame_shape, slots=VISION_RING_SLOTS, name=None):
+        self.shape = (slots,) + tuple(frame_shape)
+        size = int(np.prod(self.shape))
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.frames = np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _vision_worker(ring_name, frame_shape, slots, pipeline_args, ctrl_queue, result_queue):
+    """(Vision process) Processes frames from the ring until told to stop."""
+    ring = SharedFrameRing(frame_shape, slots, name=ring_name)
+    try:
+        pipeline = VisionPipeline(frame_shape[1], frame_shape[0], **pipeline_args)
+        result_queue.put(("ready", None, None))
+        while True:
+            message = ctrl_queue.get()
+            kind = message[0]
+            if kind == "frame":
+                _, slot, seq, timestamp = message
+                result = pipeline.process(seq, ring.frames[slot], timestamp)
+                result_queue.put(("result", slot, result))
+            elif kind == "track":
+                _, slot, bbox = message
+                pipeline.start_tracking(ring.frames[slot], bbox)
+                result_queue.put(("free", slot, None))
+            elif kind == "untrack":
+                pipeline.stop_tracking()
+            elif kind == "stop":
+                break
+    except Exception as e:
+        result_queue.put(("error", None, repr(e)))
+    finally:
+        ring.close()
+
+
+class ProcessVision:
+    """Runs the pipeline in a separate process, fed through a shared memory ring."""
+
+    def __init__(self, frame_shape, slots=VISION_RING_SLOTS, **pipeline_args):
+        self.frame_shape = tuple(frame_shape)
+        self.ring = SharedFrameRing(self.frame_shape, slots)
+        self._free_slots = deque(range(slots))
+        self._ctrl = mp.Queue()
+        self._results = mp.Queue()
+        self._seq = 0
+        self._tracking = False
+        # Results drained to free a slot (submit/start_tracking) wait here for poll()
+        self._pending = []
+        self.dropped_frames = 0
+        self.process = mp.Process(
+            target=_vision_worker, name="nexo-vision", daemon=True,
+            args=(self.ring.name, self.frame_shape, slots, pipeline_args, self._ctrl, self._results))
+        self.process.start()
+
+        kind, _, error = self._results.get(timeout=30)
+        if kind != "ready":
+            self.close()
+            raise RuntimeError(f"Vision process failed to start: {error}")
+
+    @property
+    def tracking(self):
+        return self._tracking
+
+    def _copy_into_slot(self, frame):
+        if not self._free_slots:
+            self._drain(block=False)
+        if not self._free_slots:
+            return None
+        slot = self._free_slots.popleft()
+        np.copyto(self.ring.frames[slot], frame)
+        return slot
+
+    def submit(self, frame, timestamp=None):
+        """Queues a frame. If the worker is behind and no slot is free, the frame is dropped."""
+        slot = self._copy_into_slot(frame)
+        if slot is None:
+            self.dropped_frames += 1
+            return
+        self._seq += 1
+        self._ctrl.put(("frame", slot, self._seq, timestamp))
+
+    def _drain(self, block):
+        """Collects arrived results into self._pending and frees their slots."""
+        while True:
+            try:
+                kind, slot, payload = self._results.get(block=block, timeout=1.0 if block else None)
+            except queue.Empty:
+                break
+            block = False
+            if slot is not None:
+                self._free_slots.append(slot)
+            if kind == "result":
+                self._pending.append(payload)
+                if payload.track_ok is False:
+                    self._tracking = False
+            elif kind == "error":
+                raise RuntimeError(f"Vision process error: {payload}")
+
+    def poll(self):
+        """Returns every result that has arrived since the last poll (never blocks)."""
+        self._drain(block=False)
+        results, self._pending = self._pending, []
+        return results
+
+    def start_tracking(self, frame, bbox):
+        slot = self._copy_into_slot(frame)
+        if slot is None:
+            # Every slot is busy: wait for the worker to hand one back.
+            self._drain(block=True)
+            slot = self._copy_into_slot(frame)
+            if slot is None:
+                raise RuntimeError("Vision process is not returning frame slots.")
+        self._ctrl.put(("track", slot, tuple(bbox)))
+        self._tracking = True
+
+    def stop_tracking(self):
+        self._ctrl.put(("untrack",))
+        self._tracking = False
+
+    def close(self):
+        if self.process.is_alive():
+            self._ctrl.put(("stop",))
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.ring.close()
@@ -1,23 +1,42 @@
 # --- ALL IMPORTS ---
-# I've added cv2 here, as you pointed out!
-import cv2 
-import serial
+from nexo_startup import STARTUP_PROFILE, lazy_import, preload, start_parallel
 import time
 import sys
-import numpy as np
 import json
 import threading
-import requests
-import speech_recognition as sr
-import pyttsx3
+import queue
+import asyncio
+import argparse
+import importlib.util
 import os
-import webbrowser
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from nexo_prompt import build_gemini_payload, build_ollama_chat_payload, record_prefill_stats
+from nexo_intent import route_intent
+from nexo_response_cache import ResponseCache
+from nexo_browser import BrowserSession
+from nexo_element_resolver import ElementResolver
+from nexo_state import BiometricStateStore
+from nexo_runtime import Supervisor, RESTART_NEVER, RESTART_ON_FAILURE
+from nexo_speculative import Speculator, partial_transcriber, vosk_available
+from nexo_stream import STREAM_PORT, BiometricStreamServer
+from nexo_analytics import ANALYTICS_DB_FILE, BiometricAnalytics, history_range
+from nexo_ollama import PRIORITY_SPECULATIVE, PRIORITY_USER, OllamaModelManager
+import nexo_metrics
+
+# Heavy libraries are only imported when a subsystem first uses them
+# (nexo_startup.py), so Nexo can start listening before OpenCV & co. load.
+cv2 = lazy_import("cv2", "vision")
+nexo_vision = lazy_import("nexo_vision", "vision")
+nexo_governor = lazy_import("nexo_governor", "vision")
+nexo_tracking = lazy_import("nexo_tracking", "vision")
+nexo_frames = lazy_import("nexo_frames", "vision")
+serial = lazy_import("serial", "serial")
+requests = lazy_import("requests", "llm")
+sr = lazy_import("speech_recognition", "stt")
+pyttsx3 = lazy_import("pyttsx3", "tts")
+nexo_chat_index = lazy_import("nexo_chat_index", "chat_index")
+
+STARTUP_PROFILE.mark("imports_done")
 
 # --- CONFIGURATION & API SETUP ---
 
@@ -34,6 +53,11 @@ OLLAMA_API_URL = "http://127.0.0.1:11434"
 # IMPORTANT: Change this to the model you have downloaded in Ollama
 # --- UPDATED as per your request ---
 OLLAMA_MODEL = "Gemma3:1b" 
+# Model lifecycle (nexo_ollama.py): the model is loaded at startup and kept
+# loaded while idle; LLM requests run OLLAMA_MAX_CONCURRENT at a time (match
+# OLLAMA_NUM_PARALLEL), user turns first, preempting speculative requests.
+OLLAMA_MAX_CONCURRENT = 1
+MODEL_MANAGER = None
 
 # --- Path to your WebDriver ---
 try:
@@ -41,37 +65,115 @@ try:
 except NameError:
     DRIVER_PATH = os.path.abspath('chromedriver.exe')
     
+# --- RUNTIME ---
+# True  = one asyncio event loop supervises voice, ECG and video (nexo_runtime.py)
+# False = the original threads, with the video loop on the main thread
+#         (needed on macOS, where OpenCV windows must live on the main thread)
+USE_ASYNC_RUNTIME = True
+# At shutdown, how long the video loop may take to clean up (camera, motor
+# thread, ECG port) before its task is cancelled. The car is stopped first anyway.
+VIDEO_STOP_GRACE_SEC = 3.0
+
+# --- SPECULATIVE LLM CALLS (nexo_speculative.py) ---
+# Start the LLM request from stable partial transcripts while the user is
+# still speaking. Partials come from Vosk when NEXO_VOSK_MODEL points to a
+# model folder (pip install vosk); without it there is no speculation unless
+# SPECULATE_WITH_GOOGLE_PARTIALS is True, which re-sends the growing phrase to
+# Google STT every 0.6 s and may start Gemini requests that can't be
+# cancelled (several times the STT/LLM quota).
+USE_SPECULATIVE_LLM = True
+VOSK_MODEL_PATH = os.environ.get("NEXO_VOSK_MODEL")
+SPECULATE_WITH_GOOGLE_PARTIALS = False
+
 # --- AUTONOMOUS CAR CONFIGURATION (Merged) ---
-CAR_SERIAL_PORT = 'COM14'
+# NEXO_CAR_PORT / NEXO_ECG_PORT override the ports without editing this file
+# (e.g. to point at the simulated devices in benchmarks/fakes.py)
+CAR_SERIAL_PORT = os.environ.get("NEXO_CAR_PORT", 'COM14')
 CAR_BAUD_RATE = 9600
 BASE_SPEED = 150
 KP_TURN = 0.5
 MAX_TARGET_AREA_PERCENT = 40 
 TURN_DEAD_ZONE = 30 
 
+# --- TRACKING & MOTOR CONTROL (nexo_tracking.py) ---
+# "CSRT" = slow but accurate; "KCF" / "MOSSE" = fast (need opencv-contrib),
+# re-checked by CSRT every TRACKER_VERIFY_EVERY frames
+TRACKER_KIND = "KCF"
+TRACKER_VERIFY_EVERY = 15
+# True = PID steering at a fixed rate on its own thread, from a Kalman
+# prediction of the target; False = one P-only command per tracked frame
+USE_CONTROL_THREAD = True
+KI_TURN = 0.0
+KD_TURN = 0.02
+
+# --- VISION PROCESS CONFIGURATION ---
+# True = run face detection + tracking in a separate process (frames are
+# shared through shared memory). Frees the GIL for the voice and ECG threads.
+VISION_OUT_OF_PROCESS = False
+VISION_RING_SLOTS = 4
+# True = lower the capture rate / detection frequency while the car is idle
+# or nobody is in view; any motion brings it straight back (nexo_governor.py)
+USE_FRAME_GOVERNOR = True
+
 # --- NEW: ECG/HRV MONITOR CONFIGURATION ---
-ECG_SERIAL_PORT = 'COM14' # !!! CHANGE THIS to your ECG's COM port !!!
+ECG_SERIAL_PORT = os.environ.get("NEXO_ECG_PORT", 'COM14') # !!! CHANGE THIS to your ECG's COM port !!!
 ECG_BAUD_RATE = 9600     
 
+# --- LIVE STREAMING (nexo_stream.py) ---
+# ECG samples, heart rate, blink rate and stress level for the dashboard on
+# ws://127.0.0.1:<port>/ws and http://127.0.0.1:<port>/events.
+USE_STREAM_SERVER = True
+STREAM_SERVER_PORT = int(os.environ.get("NEXO_STREAM_PORT", STREAM_PORT))
+# Browser pages (origins) allowed to read the stream; any other page gets 403.
+# NEXO_STREAM_ORIGINS = comma separated origins, e.g. "http://localhost:3000"
+STREAM_ALLOWED_ORIGINS = [origin for origin in os.environ.get(
+    "NEXO_STREAM_ORIGINS", "https://6000-firebase-studio-1758901258057.cluster-cz5nqyh5nreq6ua6gaqd7okl7o.cloudworkstations.dev"
+).split(",") if origin]
+STREAM = None
+
 # --- Global States ---
 STRESS_DATA_FILE = 'stress_detection_log.json'
+# Every minute's blink rate and stress level, with hourly/daily rollups (nexo_analytics.py).
+# Opened by a startup step (get_analytics()), never at import.
+ANALYTICS = None
+ANALYTICS_LOCK = threading.Lock()
 CHAT_LOG_FILE = 'chat_history.json'
 CHAT_HISTORY = [] 
-
-STRESS_LEVEL = "Normal"
-BLINK_RATE = 0
-global_running_flag = True
+# Chat memory (nexo_chat_index.py): the LLM gets the last CHAT_RECENT_MESSAGES
+# messages in full plus the CHAT_RECALL_TOP_K older turns that match the question.
+USE_CHAT_RETRIEVAL = True
+CHAT_RECENT_MESSAGES = 20
+CHAT_RECALL_TOP_K = 3
+CHAT_EMBED_MODEL = os.environ.get("NEXO_EMBED_MODEL")   # e.g. 'all-MiniLM-L6-v2'; None = hashed n-grams
+CHAT_INDEX_FILE = 'chat_index.db'
+CHAT_INDEX = None
+CHAT_INDEX_LOCK = threading.Lock()
+# Loaded by a startup step (get_response_cache()), never at import
+RESPONSE_CACHE = None
+RESPONSE_CACHE_LOCK = threading.Lock()
+# Follow-ups ("tell me more") are cached per previous exchange; other questions aren't
+RESPONSE_CACHE_CONTEXT_MESSAGES = 2
+BROWSER_SESSION = None
+ELEMENT_RESOLVER = ElementResolver()
+
+# Stress level, blink rate, heart rate, ECG data, car state and the run flag
+# live in one versioned snapshot store shared by all threads (nexo_state.py).
+STATE = BiometricStateStore()
 
 # --- Car Global States ---
-car_currentState = "IDLE" 
-car_tracker = None
 car_serial_port = None
 last_car_command = ""
+# The motor control thread and the video loop both send car commands
+CAR_COMMAND_LOCK = threading.Lock()
 
 # --- NEW: ECG Global States ---
 ecg_serial_port = None
-current_heart_rate = 0 
-last_ecg_data = "Connecting..."
+
+# --- Startup ---
+# Futures of the init steps started in parallel by start_subsystems()
+STARTUP = {}
+# Set by --profile-startup: print the startup breakdown at the first listen
+PROFILE_STARTUP = False
 
 # --- CAR SERIAL COMMUNICATION ---
 def init_car_serial():
@@ -92,8 +194,11 @@ def _send_command_to_serial(command):
     """(Internal) Sends the actual command string to the Arduino."""
     if car_serial_port and car_serial_port.is_open:
         try:
-            full_command = command + '\n'
-            car_serial_port.write(full_command.encode())
+            full_command = (command + '\n').encode()
+            with nexo_metrics.span("serial_write"):
+                car_serial_port.write(full_command)
+            nexo_metrics.inc("car_commands")
+            nexo_metrics.inc("serial_bytes_written", len(full_command))
             print(f"[Car Control Sent]: {command}")
         except serial.SerialException as e:
             print(f"[Car Control ERROR]: Error writing to serial port: {e}")
@@ -106,61 +211,87 @@ def send_car_command(command):
     This prevents flooding the Arduino with duplicate commands.
     """
     global last_car_command
-    if command == last_car_command:
-        return
-    
-    _send_command_to_serial(command)
-    last_car_command = command
-
-def clamp(value, min_val=-255, max_val=255):
-    """Clamps a value between a min and max."""
-    return max(min_val, min(value, max_val))
+    with CAR_COMMAND_LOCK:
+        if command == last_car_command:
+            return
+        
+        _send_command_to_serial(command)
+        last_car_command = command
 
+def stop_car_and_close_port():
+    """
+    Sends "S" and closes the car port. Safe to call twice and from any thread:
+    once the port is closed, commands from a still-running motor thread only
+    reach the mock print, so the Arduino (which has no command timeout) stays stopped.
+    """
+    global last_car_command
+    with CAR_COMMAND_LOCK:
+        if car_serial_port and car_serial_port.is_open:
+            _send_command_to_serial("S")
+            car_serial_port.close()
+        last_car_command = "S"
 
 # --- NEW: ECG/HRV MONITOR FUNCTIONS ---
 
 def init_ecg_serial():
     """Tries to connect to the ECG sensor on its specified port."""
-    global ecg_serial_port, last_ecg_data
+    global ecg_serial_port
     try:
         ecg_serial_port = serial.Serial(ECG_SERIAL_PORT, ECG_BAUD_RATE, timeout=1)
         time.sleep(2) 
         print(f"[ECG Monitor]: Successfully connected to ECG on {ECG_SERIAL_PORT}")
-        last_ecg_data = "Connected"
+        STATE.publish(ecg_raw="Connected")
         return True
     except serial.SerialException as e:
         print(f"[ECG Monitor ERROR]: Could not open serial port {ECG_SERIAL_PORT}.")
         print("[ECG Monitor]: Please check connection/port. Running without ECG.")
-        last_ecg_data = "Disconnected"
+        STATE.publish(ecg_raw="Disconnected")
         return False
 
+# Every line would be a new snapshot: at 250 Hz the STATE history ring (256
+# snapshots) would only cover the last second. The HUD and the LLM prompt only
+# need the latest line, so it is published at most this often.
+ECG_RAW_PUBLISH_SEC = 0.1
+_last_ecg_raw_publish = 0.0
+
+def handle_ecg_line(line):
+    """Publishes one raw line (bytes) from the ECG. Shared by the thread and async readers."""
+    global _last_ecg_raw_publish
+    if line:
+        nexo_metrics.inc("ecg_lines")
+        nexo_metrics.inc("serial_bytes_read", len(line))
+        decoded_line = line.decode('utf-8').strip()
+        
+        if decoded_line:
+            now = time.monotonic()
+            if now - _last_ecg_raw_publish >= ECG_RAW_PUBLISH_SEC:
+                _last_ecg_raw_publish = now
+                STATE.publish(ecg_raw=decoded_line)
+            if STREAM is not None:
+                sample = decoded_line.split(",")[0]
+                if sample.isdigit():
+                    STREAM.push_sample(int(sample))
+            # print(f"[ECG Raw]: {decoded_line}") 
+            
+            # --- FUTURE STEP ---
+            # Here we will add code to parse the line,
+            # e.g., if decoded_line.startswith("BPM:"):
+            #    STATE.publish(heart_rate=int(decoded_line.split(":")[1]))
+            # ---------------------
+
 def ecg_data_reader_thread():
     """
     Runs in a separate thread, constantly reading data from the ECG.
     This prevents blocking the main (video) thread.
     """
-    global last_ecg_data, current_heart_rate
-    
-    while global_running_flag:
+    while STATE.running:
         if ecg_serial_port and ecg_serial_port.is_open:
             try:
-                line = ecg_serial_port.readline()
-                if line:
-                    decoded_line = line.decode('utf-8').strip()
-                    
-                    if decoded_line:
-                        last_ecg_data = decoded_line
-                        # print(f"[ECG Raw]: {decoded_line}") 
-                        
-                        # --- FUTURE STEP ---
-                        # Here we will add code to parse the line,
-                        # e.g., if decoded_line.startswith("BPM:"):
-                        #    current_heart_rate = int(decoded_line.split(":")[1])
-                        # ---------------------
+                handle_ecg_line(ecg_serial_port.readline())
             
             except serial.SerialException as e:
                 print(f"[ECG Thread ERROR]: {e}")
-                last_ecg_data = "Error"
+                STATE.publish(ecg_raw="Error")
                 time.sleep(1) 
             except UnicodeDecodeError:
                 pass
@@ -172,28 +303,109 @@ def ecg_data_reader_thread():
 
 # --- NEXO VOICE ASSISTANT CORE FUNCTIONS ---
 
+# Shared recognizer: the room noise is measured once at startup (a parallel
+# init step, done long before the greeting), after that
+# dynamic_energy_threshold keeps adjusting it while listening.
+RECOGNIZER = None
+# speech_recognition needs at least 0.5 s for a representative noise sample
+MIC_CALIBRATION_SEC = 0.5
+
+def calibrate_microphone():
+    """Creates the shared recognizer and measures the ambient noise level (MIC_CALIBRATION_SEC)."""
+    global RECOGNIZER
+    r = sr.Recognizer()
+    try:
+        with sr.Microphone() as source:
+            r.adjust_for_ambient_noise(source, duration=MIC_CALIBRATION_SEC)
+        return True
+    except Exception as e:
+        print(f"[ERROR - SR]: Could not calibrate the microphone: {e}")
+        return False
+    finally:
+        RECOGNIZER = r
+
+# pyttsx3 only keeps weak references to its engines: without this one the
+# warmed-up engine would be collected and every speak() would init again.
+TTS_ENGINE = None
+
+def warm_up_tts():
+    """Loads the TTS engine and its driver, so the first speak() doesn't pay for it."""
+    global TTS_ENGINE
+    TTS_ENGINE = pyttsx3.init()
+    return TTS_ENGINE
+
+def get_tts_engine():
+    """The shared TTS engine, from the startup step (or loaded now)."""
+    if TTS_ENGINE is None:
+        startup_result("tts", warm_up_tts)
+    return TTS_ENGINE
+
+def greet():
+    """
+    Short greeting, spoken once. Waits for the rest of the microphone
+    calibration (started at startup), which must not hear Nexo.
+    """
+    if not STARTUP_PROFILE.mark("greeting"):
+        return
+    try:
+        startup_result("stt", calibrate_microphone)
+    except Exception as e:
+        print(f"[ERROR - SR]: {e}")
+    speak("Hi, I'm Nexo.")
+
 def speak(text):
     """Nexo speaks the given text using local TTS."""
     try:
-        engine = pyttsx3.init()
+        engine = get_tts_engine()
         engine.setProperty('rate', 160)
         print(f"\n[Nexo]: {text}")
-        engine.say(text)
-        engine.runAndWait()
+        with nexo_metrics.span("tts"):
+            engine.say(text)
+            engine.runAndWait()
     except Exception as e:
         print(f"[ERROR - TTS]: Could not speak: {text}. Error: {e}")
 
+# What background work (e.g. a click on the browser worker) has to tell the
+# user. Only the voice thread speaks: it says these before listening again,
+# so pyttsx3 never runs on two threads at once.
+ANNOUNCEMENTS = queue.Queue()
+
+def announce(text):
+    """Queues text for the voice thread to speak. Safe from any thread."""
+    ANNOUNCEMENTS.put(text)
+
+def speak_announcements():
+    """(Voice thread) Speaks everything announce()d since the last call."""
+    while True:
+        try:
+            text = ANNOUNCEMENTS.get_nowait()
+        except queue.Empty:
+            return
+        speak(text)
+
 def listen():
     """Listens for the user's command."""
-    r = sr.Recognizer()
+    speak_announcements()
     try:
+        if RECOGNIZER is None:
+            startup_result("stt", calibrate_microphone)
+        r = RECOGNIZER
         with sr.Microphone() as source:
-            r.adjust_for_ambient_noise(source, duration=1)
-            speak("Listening...")
+            # Printed only: speaking it cost every turn ~1 s before the mic opened
             print("\n[Listening...]")
+            if STARTUP_PROFILE.mark("first_listen"):
+                print(f"[System]: Listening {STARTUP_PROFILE.elapsed('first_listen') * 1000:.0f} ms after start.")
+                if PROFILE_STARTUP:
+                    print(STARTUP_PROFILE.report())
+            text = None
             try:
-                audio = r.listen(source, timeout=5, phrase_time_limit=10)
-                text = r.recognize_google(audio)
+                with nexo_metrics.span("stt_listen"):
+                    if SPECULATOR is not None:
+                        audio = listen_streaming(r, source)
+                    else:
+                        audio = r.listen(source, timeout=5, phrase_time_limit=10)
+                with nexo_metrics.span("stt"):
+                    text = r.recognize_google(audio)
                 print(f"[User]: {text}")
                 return text
             except sr.WaitTimeoutError:
@@ -205,6 +417,10 @@ def listen():
             except sr.RequestError as e:
                 print(f"[System]: Google Speech Recognition service failed; {e}")
                 return None
+            finally:
+                # Keeps the speculative request for this transcript, cancels the rest
+                if SPECULATOR is not None:
+                    SPECULATOR.finalize(text)
     except AttributeError:
         print("[ERROR - SR]: No microphone found. Please check your audio input devices.")
         speak("I can't seem to find a microphone. Please check your audio settings.")
@@ -213,86 +429,95 @@ def listen():
         print(f"[System Error - listen()]: {e}")
         return None
 
-def execute_pc_command(command_text, driver):
+def listen_streaming(r, source):
+    """
+    Same as r.listen(), but every chunk of the phrase is transcribed while the
+    user is still speaking and the partial text goes to SPECULATOR.
+    Returns the whole phrase as one AudioData. Plain r.listen() when there is
+    no partial source (e.g. the Vosk model failed to load).
+    """
+    partials = partial_transcriber(r, sr, source.SAMPLE_RATE, source.SAMPLE_WIDTH, VOSK_MODEL_PATH,
+                                   allow_google=SPECULATE_WITH_GOOGLE_PARTIALS)
+    if partials is None:
+        return r.listen(source, timeout=5, phrase_time_limit=10)
+    chunks = []
+    try:
+        for chunk in r.listen(source, timeout=5, phrase_time_limit=10, stream=True):
+            chunks.append(chunk.frame_data)
+            partial = partials.feed(chunk.frame_data)
+            if partial:
+                SPECULATOR.on_partial(partial)
+    finally:
+        partials.close()
+    return sr.AudioData(b"".join(chunks), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+def _click_element(driver, element_name):
+    """(Browser worker) Finds a clickable element by its text/label/id and clicks it."""
+    ELEMENT_RESOLVER.click(driver, element_name)
+
+
+def _report_click(element_name):
+    """Builds the callback (browser worker) that queues how a background click went for the voice thread."""
+    def report(future):
+        error = future.exception()
+        if error is None:
+            announce(f"Clicked on {element_name}.")
+        else:
+            print(f"[ERROR - Selenium Click]: {error}")
+            announce(f"Sorry, I couldn't find a clickable element called '{element_name}'.")
+    return report
+
+
+def execute_pc_command(command_text, browser):
     """
     Executes local PC commands based on the LLM's instruction.
-    NOW uses Selenium to control a web driver.
-    Returns the (potentially modified) driver object.
+    Web commands go to the shared, pre-launched BrowserSession (nexo_browser.py),
+    which runs every Selenium call on its own worker thread, so this never
+    waits for Chrome.
+    Returns the browser session, or "EXIT" to shut the assistant down.
     """
-    global global_running_flag
     command_text = command_text.lower().replace("action: ", "").strip()
     
     try:
-        # --- NEW: Check if driver exists, if not, create it ---
-        if driver is None and any(cmd in command_text for cmd in ["open", "spotify_play", "spotify_nature"]):
-            if not os.path.exists(DRIVER_PATH):
-                speak(f"Error: ChromeDriver not found. Please download chromedriver.exe and place it in the same folder as me.")
-                print(f"[ERROR]: ChromeDriver not found at {DRIVER_PATH}")
-                return None
-            
-            print("[System]: Starting Chrome web driver...")
-            service = Service(executable_path=DRIVER_PATH)
-            options = webdriver.ChromeOptions()
-            driver = webdriver.Chrome(service=service, options=options)
-            driver.implicitly_wait(5) 
-            speak("I've opened a new browser window for you.")
-
         if "open youtube" in command_text:
-            driver.get("https://www.youtube.com")
+            browser.open_url("https://www.youtube.com")
             speak("I've opened YouTube for you.")
             
         elif "open google" in command_text:
-            driver.get("https://www.google.com")
+            browser.open_url("https://www.google.com")
             speak("I've opened Google for you.")
         
         elif "spotify_play" in command_text:
             song_name = command_text.replace("spotify_play", "").strip()
             if song_name:
-                driver.get(f"https://open.spotify.com/search/{song_name}") # Corrected URL
+                browser.open_url(f"https://open.spotify.com/search/{song_name}") # Corrected URL
                 speak(f"Opening Spotify search for {song_name}.")
             else:
                 speak("You need to tell me the name of the song.")
                 
         elif "spotify_nature" in command_text:
-            driver.get("https://open.spotify.com/playlist/37i9dQZF1DX4PP3e4LmMJU") 
+            browser.open_url("https://open.spotify.com/playlist/37i9dQZF1DX4PP3e4LmMJU") 
             speak("Opening a calming nature playlist.")
 
         elif "click" in command_text:
-            if driver is None:
+            if not browser.is_open:
                 speak("I don't have a browser open to click in. Please open something first.")
-                return driver
+                return browser
                 
-            try:
-                element_name = command_text.replace("click", "").strip()
-                if not element_name:
-                    speak("What would you like me to click?")
-                    return driver
+            element_name = command_text.replace("click", "").strip()
+            if not element_name:
+                speak("What would you like me to click?")
+                return browser
 
-                speak(f"Trying to click on '{element_name}'...")
-                
-                wait = WebDriverWait(driver, 10)
-                target_element = wait.until(
-                    EC.element_to_be_clickable(
-                        (By.XPATH, f"//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{element_name}')] | "
-                                   f"//a[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{element_name}')] | "
-                                   f"//div[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{element_name}')] | "
-                                   f"//*[contains(@aria-label, '{element_name}')] | "
-                                   f"//*[contains(@id, '{element_name}')]")
-                    )
-                )
-                
-                target_element.click()
-                speak(f"Clicked on {element_name}.")
-                
-            except Exception as e:
-                print(f"[ERROR - Selenium Click]: {e}")
-                speak(f"Sorry, I couldn't find a clickable element called '{element_name}'.")
+            speak(f"Trying to click on '{element_name}'...")
+            # Runs on the browser worker; the voice thread speaks the result before it listens again.
+            browser.submit(_click_element, element_name).add_done_callback(_report_click(element_name))
 
         elif "close browser" in command_text:
-            if driver:
+            if browser.is_open:
                 speak("Closing the browser.")
-                driver.quit()
-                driver = None
+                # Only hides the window; the driver stays warm for the next "open".
+                browser.hide()
             else:
                 speak("I don't have a browser open to close.")
         
@@ -310,63 +535,83 @@ def execute_pc_command(command_text, driver):
 
         elif "close assistant" in command_text or "stop listening" in command_text:
             speak("Understood. Shutting down the assistant now. Goodbye!")
-            if driver:
-                driver.quit() 
             return "EXIT"
 
     except Exception as e:
         print(f"[ERROR - execute_pc_command]: {e}")
         speak("I ran into an error trying to do that.")
 
-    return driver
+    return browser
 
 
 # --- NEXO BRAIN (ROUTER) ---
 
-def nexo_brain(chat_history, stress_level):
+# Fallback replies used when the LLM call itself failed.
+# These are spoken to the user but never stored in the response cache.
+REPLY_NO_GEMINI_KEY = "I am running without a Gemini API key. I can only process PC commands."
+REPLY_GEMINI_EMPTY = "I'm sorry, I couldn't formulate a response. Please try again."
+REPLY_GEMINI_NETWORK_ERROR = "I am currently unable to connect to my brain. Please check your internet connection or API key."
+REPLY_GEMINI_ERROR = "I received an unexpected response from my server. Could you please try asking again?"
+REPLY_OLLAMA_EMPTY = "I'm sorry, I couldn't formulate a response from Ollama."
+REPLY_OLLAMA_CONNECTION_ERROR = "I cannot connect to the Ollama server. Please make sure it is running on your computer."
+REPLY_OLLAMA_ERROR = "I had an unknown error while talking to Ollama."
+BRAIN_ERROR_REPLIES = {
+    REPLY_NO_GEMINI_KEY,
+    REPLY_GEMINI_EMPTY,
+    REPLY_GEMINI_NETWORK_ERROR,
+    REPLY_GEMINI_ERROR,
+    REPLY_OLLAMA_EMPTY,
+    REPLY_OLLAMA_CONNECTION_ERROR,
+    REPLY_OLLAMA_ERROR,
+}
+
+def nexo_brain(chat_history, snapshot, cancel=None, history=None):
     """
     Routes the request to either Gemini or Ollama based on the USE_OLLAMA flag.
+    `snapshot` is one STATE snapshot, so stress level and heart rate are
+    always from the same moment.
+    `cancel` (a threading.Event) aborts a speculative request: the reply is None.
+    `history` is the '[Biometric history]' line for questions about past days.
     """
-    if USE_OLLAMA:
-        print("[Nexo Brain]: Routing to Ollama...")
-        return nexo_brain_ollama(chat_history, stress_level)
-    else:
-        print("[Nexo Brain]: Routing to Gemini...")
-        return nexo_brain_gemini(chat_history, stress_level)
+    nexo_metrics.inc("llm_requests")
+    chat_history, recalled = select_chat_context(chat_history)
+    with nexo_metrics.span("llm"):
+        if USE_OLLAMA:
+            print("[Nexo Brain]: Routing to Ollama...")
+            return nexo_brain_ollama(chat_history, snapshot, cancel, history, recalled)
+        else:
+            print("[Nexo Brain]: Routing to Gemini...")
+            return nexo_brain_gemini(chat_history, snapshot, cancel, history, recalled)
+
+def select_chat_context(chat_history):
+    """
+    (messages to send in full, recalled older turns or None). With
+    USE_CHAT_RETRIEVAL only the recent window is sent; the older turns that
+    match the last message come from the chat index.
+    """
+    start = nexo_chat_index.recent_window_start(len(chat_history), CHAT_RECENT_MESSAGES) if USE_CHAT_RETRIEVAL else 0
+    if start == 0:
+        return chat_history, None
+    index = get_chat_index()
+    with nexo_metrics.span("recall"):
+        index.sync(chat_history[:start])
+        recalled = index.recall(nexo_chat_index.message_text(chat_history[-1]), CHAT_RECALL_TOP_K, before=start)
+    if recalled:
+        print(f"[Chat Index]: Recalled {len(recalled)} older messages.")
+    return chat_history[start:], recalled or None
 
 # --- (HELPER) GEMINI BRAIN ---
-def nexo_brain_gemini(chat_history, stress_level):
+def nexo_brain_gemini(chat_history, snapshot, cancel=None, history=None, recalled=None):
     """
     Communicates with the Gemini API for intelligent responses.
+    A cancelled request still completes, its reply is just dropped.
     """
     if not GEMINI_API_KEY or GEMINI_API_KEY == "YOUR_NEW_API_KEY_GOES_HERE":
-        return "I am running without a Gemini API key. I can only process PC commands."
-
-    system_prompt = f"""
-    You are Nexo, a friendly, non-GUI, face-to-face voice assistant and stress relief coach. This is an ongoing conversation. Use the previous messages for context (e.g., if the user just opened Spotify, 'click search' refers to Spotify). Your primary goal is to converse naturally, teach subjects, and offer stress relief.
-    The user's current stress level, determined by real-time blink analysis, is: **{stress_level}**.
-    # --- NEW: Heart Rate Data ---
-    The user's current Heart Rate (Beats Per Minute) is: **{current_heart_rate}**.
-    The raw data from the ECG is: **{last_ecg_data}**.
-    **Rules:**
-    1.  **PC/Web Control:** If the user conversationally asks to open, click, or close something, you MUST respond with a single line containing only the keyword 'ACTION:' followed by the command. You must not add any other words.
-        * Example for opening YouTube: `ACTION: OPEN YOUTUBE`
-        * Example for playing nature sounds: `ACTION: SPOTIFY_NATURE`
-        * Example for playing a song: `ACTION: SPOTIFY_PLAY <song_name_and_artist>`
-        * **NEW:** Example for clicking an element: `ACTION: CLICK <element_text_or_name>` (e.g., ACTION: CLICK search, ACTION: CLICK play button)
-        * **NEW:** Example for closing the browser: `ACTION: CLOSE BROWSER`
-    2.  **Conversational/Teaching:** For all other queries, respond naturally and concisely, as if speaking.
-        * **Stress Relief:** If the stress level is 'Moderate Stress' or 'High Stress', gently suggest a quick, simple stress relief technique (like a deep breath) BEFORE answering their actual query.
-        * **Do NOT** include the 'ACTION:' prefix in conversational responses.
-    3.  **Stress Reporting:** Do not tell the user their stress level or heart rate unless they explicitly ask, for example, "How stressed am I?" or "What is my heart rate?"
-    4.  **Tone:** Always maintain a helpful, friendly, and non-judgmental tone.
-    """
-    
-    payload = {
-        "contents": chat_history,
-        "systemInstruction": {"parts": [{"text": system_prompt}]},
-        "tools": [{"google_search": {}}] 
-    }
+        return REPLY_NO_GEMINI_KEY
+
+    # Static system prompt + biometrics appended at the end (see nexo_prompt.py)
+    payload = build_gemini_payload(chat_history, snapshot.stress_level, snapshot.heart_rate, snapshot.ecg_raw,
+                                   history=history, recalled=recalled)
 
     try:
         response = requests.post(
@@ -377,10 +622,12 @@ def nexo_brain_gemini(chat_history, stress_level):
         )
         response.raise_for_status()
         result = response.json()
+        if cancel is not None and cancel.is_set():
+            return None
         
         if 'candidates' not in result or not result['candidates']:
             print(f"[ERROR - Gemini Response]: No candidates found. Response: {result}")
-            return "I'm sorry, I couldn't formulate a response. Please try again."
+            return REPLY_GEMINI_EMPTY
             
         text = result['candidates'][0]['content']['parts'][0]['text']
         return text
@@ -391,74 +638,81 @@ def nexo_brain_gemini(chat_history, stress_level):
         print("The connection to Google's server failed. This is a network, firewall, or connection issue.")
         print(f"Full Error: {e}")
         print("="*60 + "\n")
-        return "I am currently unable to connect to my brain. Please check your internet connection or API key."
+        return REPLY_GEMINI_NETWORK_ERROR
     except Exception as e:
         print("\n" + "="*60)
         print("--- REAL GEMINI ERROR (API KEY / OTHER) ---")
         print("The request failed. This might be a bad API key, permissions problem, or other issue.")
         print(f"Full Error: {e}")
         print("="*60 + "\n")
-        return "I received an unexpected response from my server. Could you please try asking again?"
+        return REPLY_GEMINI_ERROR
 
 # --- (HELPER) NEW OLLAMA BRAIN ---
-def nexo_brain_ollama(chat_history, stress_level):
+def _post_ollama_chat(payload, cancel=None, timeout=30):
     """
-    Communicates with a LOCAL OLLAMA server for intelligent responses.
+    POSTs to /api/chat and returns the reply JSON. With a `cancel` event (or
+    a MODEL_MANAGER CancelToken) the reply is streamed, so a cancelled request
+    closes the connection (Ollama stops generating) as soon as the next token
+    arrives, and returns None.
     """
-    print(f"[Nexo Brain]: Connecting to Ollama at {OLLAMA_API_URL} with model {OLLAMA_MODEL}...")
+    if cancel is not None and cancel.is_set():
+        return None     # cancelled before it was sent: Ollama never starts the prefill
+    url = f"{OLLAMA_API_URL}/api/chat"
+    headers = {"Content-Type": "application/json"}
+    if cancel is None:
+        response = requests.post(url, headers=headers, data=json.dumps(payload), timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    parts, last = [], {}
+    with requests.post(url, headers=headers, data=json.dumps(dict(payload, stream=True)),
+                       stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if cancel.is_set():
+                return None
+            if not line:
+                continue
+            last = json.loads(line)
+            parts.append(last.get('message', {}).get('content', ''))
+            if last.get('done'):
+                break
+    return dict(last, message={"role": "assistant", "content": "".join(parts)})
 
-    # 1. Re-create the same system prompt
-    system_prompt = f"""
-    You are Nexo, a friendly, non-GUI, face-to-face voice assistant and stress relief coach. This is an ongoing conversation. Use the previous messages for context (e.g., if the user just opened Spotify, 'click search' refers to Spotify). Your primary goal is to converse naturally, teach subjects, and offer stress relief.
-    The user's current stress level, determined by real-time blink analysis, is: **{stress_level}**.
-    # --- NEW: Heart Rate Data ---
-    The user's current Heart Rate (Beats Per Minute) is: **{current_heart_rate}**.
-    The raw data from the ECG is: **{last_ecg_data}**.
-    **Rules:**
-    1.  **PC/Web Control:** If the user conversationally asks to open, click, or close something, you MUST respond with a single line containing only the keyword 'ACTION:' followed by the command. You must not add any other words.
-        * Example for opening YouTube: `ACTION: OPEN YOUTUBE`
-        * Example for playing nature sounds: `ACTION: SPOTIFY_NATURE`
-        * Example for playing a song: `ACTION: SPOTIFY_PLAY <song_name_and_artist>`
-        * **NEW:** Example for clicking an element: `ACTION: CLICK <element_text_or_name>` (e.g., ACTION: CLICK search, ACTION: CLICK play button)
-        * **NEW:** Example for closing the browser: `ACTION: CLOSE BROWSER`
-    2.  **Conversational/Teaching:** For all other queries, respond naturally and concisely, as if speaking.
-        * **Stress Relief:** If the stress level is 'Moderate Stress' or 'High Stress', gently suggest a quick, simple stress relief technique (like a deep breath) BEFORE answering their actual query.
-        * **Do NOT** include the 'ACTION:' prefix in conversational responses.
-    3.  **Stress Reporting:** Do not tell the user their stress level or heart rate unless they explicitly ask, for example, "How stressed am I?" or "What is my heart rate?"
-    4.  **Tone:** Always maintain a helpful, friendly, and non-judgmental tone.
+def nexo_brain_ollama(chat_history, snapshot, cancel=None, history=None, recalled=None):
     """
+    Communicates with a LOCAL OLLAMA server for intelligent responses.
+    """
+    print(f"[Nexo Brain]: Connecting to Ollama at {OLLAMA_API_URL} with model {OLLAMA_MODEL}...")
 
-    # 2. Format chat history for Ollama
-    # We will combine the entire history into a single prompt string
-    full_prompt_string = ""
-    for message in chat_history:
-        role = "User" if message['role'] == 'user' else 'Nexo'
-        full_prompt_string += f"{role}: {message['parts'][0]['text']}\n"
-    
-    # 3. Create the Ollama payload
-    payload = {
-        "model": OLLAMA_MODEL,
-        "system": system_prompt,
-        "prompt": full_prompt_string, # Send the whole conversation history
-        "stream": False # We want the full response at once
-    }
+    # 1. Build the /api/chat payload.
+    # The system prompt is static so Ollama can reuse its prompt cache;
+    # the live biometrics go in a small message at the end.
+    payload = build_ollama_chat_payload(OLLAMA_MODEL, chat_history, snapshot.stress_level,
+                                        snapshot.heart_rate, snapshot.ecg_raw, history=history, recalled=recalled)
 
-    # 4. Make the request to the local Ollama server
+    # 2. Make the request to the local Ollama server, through the model
+    # manager's queue when it runs (the timeout is longer while the model may
+    # still be loading). A speculative request can be preempted by a user turn.
     try:
-        response = requests.post(
-            OLLAMA_API_URL,
-            headers={"Content-Type": "application/json"},
-            data=json.dumps(payload),
-            timeout=30 # Give Ollama more time, local models can be slower
-        )
-        response.raise_for_status()
-        result = response.json()
+        if MODEL_MANAGER is not None:
+            priority = PRIORITY_USER if cancel is None else PRIORITY_SPECULATIVE
+            result = MODEL_MANAGER.run(
+                lambda token: _post_ollama_chat(payload, token, MODEL_MANAGER.request_timeout()),
+                priority, cancel=cancel, name="chat")
+        else:
+            result = _post_ollama_chat(payload, cancel)
+        if result is None:
+            print("[Nexo Brain]: Speculative Ollama request cancelled.")
+            return None
         
-        # 5. Parse Ollama's response
-        text = result.get('response')
+        # 3. Parse Ollama's response
+        text = result.get('message', {}).get('content')
+        prompt_tokens, prompt_eval_ms = record_prefill_stats(result)
+        print(f"[Ollama Prefill]: {prompt_tokens} prompt tokens evaluated in {prompt_eval_ms:.0f} ms")
         if not text:
             print("[ERROR - Ollama Response]: Response was empty.")
-            return "I'm sorry, I couldn't formulate a response from Ollama."
+            return REPLY_OLLAMA_EMPTY
 
         print(f"[Ollama Response]: {text.strip()}")
         # Clean up the response: Ollama might add its own role prefix
@@ -474,14 +728,14 @@ def nexo_brain_ollama(chat_history, stress_level):
         print(">>> Are you sure Ollama is running? Start it on your computer. <<<")
         print(f"Full Error: {e}")
         print("="*60 + "\n")
-        return "I cannot connect to the Ollama server. Please make sure it is running on your computer."
+        return REPLY_OLLAMA_CONNECTION_ERROR
     except Exception as e:
         print("\n" + "="*60)
         print(f"--- OLLAMA GENERAL ERROR ---")
         print(f"This could be a problem with the model name ('{OLLAMA_MODEL}') or the request.")
         print(f"Full Error: {e}")
         print("="*60 + "\n")
-        return "I had an unknown error while talking to Ollama."
+        return REPLY_OLLAMA_ERROR
 
 
 # --- STRESS DETECTION (VIDEO PROCESSING) FUNCTIONS ---
@@ -535,16 +789,114 @@ def load_chat_history():
         return []
 
 def save_chat_history():
-    """Saves the current chat history to the JSON file."""
+    """Saves the current chat history to the JSON file (and indexes the new messages)."""
     global CHAT_HISTORY
     try:
         with open(CHAT_LOG_FILE, 'w') as f:
             json.dump(CHAT_HISTORY, f, indent=4)
     except Exception as e:
         print(f"[ERROR - Chat History]: Could not save chat history. {e}")
+    if CHAT_INDEX is not None:
+        CHAT_INDEX.sync(CHAT_HISTORY)
+
+def open_chat_index():
+    """Opens the chat index (loads the stored vectors into the ANN index)."""
+    embed = nexo_chat_index.sentence_embedding(CHAT_EMBED_MODEL) if CHAT_EMBED_MODEL else None
+    if embed is None:
+        return nexo_chat_index.ChatIndex(CHAT_INDEX_FILE)
+    return nexo_chat_index.ChatIndex(CHAT_INDEX_FILE, embed=embed, embed_name=CHAT_EMBED_MODEL)
+
+def get_chat_index():
+    """The chat index, opened by the startup step (or now). Shared by the voice and speculative threads."""
+    global CHAT_INDEX
+    with CHAT_INDEX_LOCK:
+        if CHAT_INDEX is None:
+            index = startup_result("chat_index", open_chat_index)
+            if index.count > len(CHAT_HISTORY):
+                print("[Chat Index]: The chat log is shorter than the index, re-indexing.")
+                index.clear()
+            CHAT_INDEX = index
+        return CHAT_INDEX
+
+def open_analytics():
+    """Opens the analytics database; a new one gets the events of the old JSON stress log."""
+    analytics = BiometricAnalytics(ANALYTICS_DB_FILE)
+    if analytics.is_empty():
+        imported = analytics.import_stress_events(load_stress_data()["stress_events"])
+        if imported:
+            print(f"[Analytics]: Imported {imported} events from {STRESS_DATA_FILE}.")
+    return analytics
+
+def get_analytics():
+    """The analytics store, opened by the startup step (or now). Shared by the video and voice threads."""
+    global ANALYTICS
+    with ANALYTICS_LOCK:
+        if ANALYTICS is None:
+            ANALYTICS = startup_result("analytics", open_analytics)
+        return ANALYTICS
+
+def get_response_cache():
+    """The response cache, loaded by the startup step (or now)."""
+    global RESPONSE_CACHE
+    with RESPONSE_CACHE_LOCK:
+        if RESPONSE_CACHE is None:
+            RESPONSE_CACHE = startup_result("response_cache", ResponseCache)
+        return RESPONSE_CACHE
+
+
+# --- PARALLEL STARTUP ---
+def open_camera():
+    """Opens the webcam (and loads the vision code while at it)."""
+    preload(nexo_vision)
+    cap = cv2.VideoCapture(0)
+    if not cap.isOpened():
+        raise IOError("Cannot open webcam. Is it in use by another app?")
+    return cap
+
+def check_llm_backend():
+    """Checks that the configured LLM can be reached, without blocking the assistant."""
+    preload(requests)
+    if not USE_OLLAMA:
+        return bool(GEMINI_API_KEY) and GEMINI_API_KEY != "YOUR_NEW_API_KEY_GOES_HERE"
+    try:
+        requests.get(f"{OLLAMA_API_URL}/api/tags", timeout=2).raise_for_status()
+        print(f"[System]: Ollama server is up at {OLLAMA_API_URL}")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"[ERROR - Ollama]: Server not reachable at {OLLAMA_API_URL}: {e}")
+        return False
+
+def start_subsystems():
+    """Starts the slow init steps all at once; each subsystem waits only for its own."""
+    steps = {
+        "camera": open_camera,
+        "car_serial": init_car_serial,
+        "llm": check_llm_backend,
+        "tts": warm_up_tts,
+        "stt": calibrate_microphone,
+        "analytics": open_analytics,
+        "response_cache": ResponseCache,
+    }
+    if USE_CHAT_RETRIEVAL:
+        steps["chat_index"] = open_chat_index
+    # With pyserial-asyncio installed, the async ECG task opens the port itself.
+    if not USE_ASYNC_RUNTIME or importlib.util.find_spec("serial_asyncio") is None:
+        steps["ecg_serial"] = init_ecg_serial
+    STARTUP.update(start_parallel(steps))
+
+def startup_result(name, init_fn):
+    """
+    Waits for a parallel init step and returns its result (re-raising its error).
+    Each step is used once; if it wasn't started (or a task restarts), init_fn runs now.
+    """
+    future = STARTUP.pop(name, None)
+    if future is None:
+        return init_fn()
+    return future.result()
 
 
 # --- Constants for EAR (Eye Aspect Ratio) ---
+# Frames without eyes that make a blink at 30 fps (scaled to the real frame rate, nexo_vision.py)
 EYE_AR_CONSEC_FRAMES = 2 
 
 def main_video_and_car_loop():
@@ -552,46 +904,63 @@ def main_video_and_car_loop():
     MERGED LOOP:
     Runs the main video capture for Stress Detection AND Car Control logic.
     """
-    global STRESS_LEVEL, BLINK_RATE, global_running_flag
-    global car_currentState, car_tracker, car_serial_port, last_car_command
-    global last_ecg_data
+    global car_serial_port, last_car_command
 
-    try:
-        print("[System]: Loading OpenCV face and eye detectors...")
-        face_cascade_path = os.path.join(cv2.data.haarcascades, 'haarcascade_frontalface_default.xml')
-        eye_cascade_path = os.path.join(cv2.data.haarcascades, 'haarcascade_eye.xml')
+    # Local copy of the car state; published to STATE whenever it changes.
+    car_currentState = STATE.snapshot.car_state
 
-        if not os.path.exists(face_cascade_path):
-            raise FileNotFoundError(f"Could not find face cascade: {face_cascade_path}")
-        if not os.path.exists(eye_cascade_path):
-            raise FileNotFoundError(f"Could not find eye cascade: {eye_cascade_path}")
-
-        face_cascade = cv2.CascadeClassifier(face_cascade_path)
-        eye_cascade = cv2.CascadeClassifier(eye_cascade_path)
-        
-        print("[System]: OpenCV cascades loaded successfully.")
+    vision = None
+    governor = None
+    motor = None
 
+    try:
         # --- CAR: Attempt to connect to Arduino ---
-        init_car_serial()
+        startup_result("car_serial", init_car_serial)
         send_car_command("S") 
 
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
-            raise IOError("Cannot open webcam. Is it in use by another app?")
+        cap = startup_result("camera", open_camera)
+        if USE_FRAME_GOVERNOR:
+            # At low frame rates, don't let the driver hand us old buffered frames
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            governor = nexo_governor.FrameRateGovernor()
         
         ret, frame = cap.read()
         if not ret:
             raise IOError("Cannot read frame from webcam.")
             
         frame_height, frame_width = frame.shape[:2]
-        frame_center_x = frame_width // 2
+        # Reused capture/display frames and the persistent status overlay
+        buffers = nexo_frames.FrameBuffers(frame.shape)
+        hud = nexo_frames.HudOverlay(frame_width)
         max_safe_area = (frame_width * frame_height) * (MAX_TARGET_AREA_PERCENT / 100.0)
 
+        # --- VISION: face/eye detection + target tracking (nexo_vision.py) ---
+        print("[System]: Loading OpenCV face and eye detectors...")
+        vision_args = dict(base_speed=BASE_SPEED, kp_turn=KP_TURN, dead_zone=TURN_DEAD_ZONE,
+                           blink_consec_frames=EYE_AR_CONSEC_FRAMES,
+                           tracker_kind=TRACKER_KIND, verify_every=TRACKER_VERIFY_EVERY)
+        if VISION_OUT_OF_PROCESS:
+            print("[System]: Starting the vision process (shared memory frames)...")
+            vision = nexo_vision.ProcessVision(frame.shape, slots=VISION_RING_SLOTS, **vision_args)
+        else:
+            vision = nexo_vision.InProcessVision(frame.shape, **vision_args)
+        print("[System]: OpenCV cascades loaded successfully.")
+
+        # --- CAR: fixed-rate PID steering from the predicted target position ---
+        if USE_CONTROL_THREAD:
+            motor = nexo_tracking.MotorControlLoop(
+                nexo_tracking.BBoxPredictor(), send_car_command, frame_width // 2, BASE_SPEED,
+                nexo_tracking.PIDController(KP_TURN, KI_TURN, KD_TURN), dead_zone=TURN_DEAD_ZONE)
+            motor.start()
+
+        dropped_frames = 0   # vision.dropped_frames already counted in the metrics
+        last_result = None   # latest detection result (faces/eyes to draw)
+        last_track = None    # latest result that came from the tracker
+
         # Stress Monitor Constants
         MINUTE_INTERVAL = 60 
         current_minute_blinks = 0
         minute_start_time = time.time()
-        BLINK_COUNTER = 0 
 
         print("\n[System]: Starting Main Video Loop (Stress Monitor & Car Control)...")
         print("--- Autonomous Car Controls ---")
@@ -601,33 +970,55 @@ def main_video_and_car_loop():
         print("  q - Quit (shared with assistant)")
         print("---------------------------------")
         
-        while cap.isOpened() and global_running_flag:
-            ret, frame = cap.read()
+        while cap.isOpened() and STATE.running:
+            if car_currentState != STATE.snapshot.car_state:
+                STATE.publish(car_state=car_currentState)
+
+            with nexo_metrics.span("capture"):
+                ret, frame = buffers.read(cap)   # mirrored, into a reused buffer
             if not ret:
                 time.sleep(0.1) 
                 continue
-            
-            frame = cv2.flip(frame, 1)
+            frame_time = time.monotonic()
+
+            # --- Governor: capture rate and whether this frame gets detection ---
+            detect = True
+            if governor is not None:
+                detect = governor.decide(frame, car_currentState).detect
+
+            # Hand the clean frame to the vision pipeline before we draw on it
+            if detect:
+                vision.submit(frame, frame_time)
+            else:
+                nexo_metrics.inc("frames_skipped")
             
             # --- Handle Key Presses (Car + Quit) ---
-            key = cv2.waitKey(30) & 0xFF
+            key = cv2.waitKey(governor.wait_ms() if governor is not None else 30) & 0xFF
 
             if key == ord('q'):
                 print("[System]: 'q' pressed. Shutting down.")
-                global_running_flag = False
+                STATE.request_shutdown()
+                if motor is not None:
+                    motor.pause()
                 send_car_command("S") 
                 break
             
             elif key == ord('s'):
                 print("[Car Control]: State change: STOPPED -> SPINNING")
                 car_currentState = "SPINNING"
-                car_tracker = None 
+                if motor is not None:
+                    motor.pause()
+                vision.stop_tracking()
+                last_track = None
                 send_car_command("R") 
             
             elif key == ord('r'):
                 print("[Car Control]: State change: RESET -> IDLE")
                 car_currentState = "IDLE"
-                car_tracker = None
+                if motor is not None:
+                    motor.pause()
+                vision.stop_tracking()
+                last_track = None
                 send_car_command("S") 
             
             elif key == ord('f') and car_currentState == "IDLE":
@@ -639,22 +1030,39 @@ def main_video_and_car_loop():
                 bbox = cv2.selectROI("Nexo Assistant and Car Control", frame, fromCenter=False, showCrosshair=True)
                 
                 if bbox[2] > 0 and bbox[3] > 0:
-                    car_tracker = cv2.TrackerCSRT_create()
-                    car_tracker.init(frame, bbox)
+                    vision.start_tracking(frame, bbox)
+                    last_track = None
+                    if motor is not None:
+                        motor.predictor.reset()
                     car_currentState = "FOLLOWING"
                     print("[Car Control]: State change: SELECTING -> FOLLOWING")
                 else:
                     print("[Car Control]: Selection cancelled.")
                     car_currentState = "IDLE"
 
+            # --- Collect vision results (every processed frame counts for blinks) ---
+            if vision.dropped_frames != dropped_frames:
+                nexo_metrics.inc("frames_dropped", vision.dropped_frames - dropped_frames)
+                dropped_frames = vision.dropped_frames
+            for result in vision.poll():
+                nexo_metrics.inc("frames_processed")
+                nexo_metrics.observe("detection", result.detection_ms / 1000)
+                if result.track_ok is not None:
+                    nexo_metrics.observe("tracking", result.tracking_ms / 1000)
+                if result.blink:
+                    current_minute_blinks += 1
+                if result.track_ok is not None:
+                    last_track = result
+                    if result.track_ok and motor is not None:
+                        motor.predictor.update(result.track_bbox, result.timestamp)
+                if result.faces and governor is not None:
+                    governor.face_seen()
+                last_result = result
+
             # --- 1. CAR: State Machine Logic ---
             if car_currentState == "FOLLOWING":
-                if car_tracker is None:
-                    car_currentState = "IDLE"
-                    continue
-
-                ok, bbox = car_tracker.update(frame)
-                if ok:
+                if last_track is not None and last_track.track_ok:
+                    bbox = last_track.track_bbox
                     p1 = (int(bbox[0]), int(bbox[1]))
                     p2 = (int(bbox[0] + bbox[2]), int(bbox[1] + bbox[3]))
                     cv2.rectangle(frame, p1, p2, (0, 255, 0), 2, 1)
@@ -663,218 +1071,367 @@ def main_video_and_car_loop():
                     if box_area > max_safe_area:
                         car_currentState = "AVOIDING"
                         print("[Car Control]: State change: FOLLOWING -> AVOIDING")
+                        if motor is not None:
+                            motor.pause()
                         send_car_command("S") 
+                    elif motor is not None:
+                        # The control thread steers; just make sure it is running
+                        if not motor.following:
+                            motor.follow()
+                        hud.set_line("car", f"Car: FOLLOWING ({motor.last_command or 'waiting'})", (10, 90), (0, 255, 0))
                     else:
-                        target_center_x = int(bbox[0] + bbox[2] / 2)
-                        error = target_center_x - frame_center_x
-                        
-                        command_to_send = ""
-                        left_speed = BASE_SPEED
-                        right_speed = BASE_SPEED
-
-                        if abs(error) < TURN_DEAD_ZONE:
-                            command_to_send = f"M,{int(left_speed)},{int(right_speed)}"
-                        else:
-                            turn = KP_TURN * error
-                            left_speed = clamp(BASE_SPEED + turn)
-                            right_speed = clamp(BASE_SPEED - turn)
-                            command_to_send = f"M,{int(left_speed)},{int(right_speed)}"
-                        
-                        send_car_command(command_to_send)
-                        cv2.putText(frame, f"Car: FOLLOWING (L:{int(left_speed)}, R:{int(right_speed)})", (10, 90), 
-                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                else:
+                        send_car_command(last_track.car_command)
+                        hud.set_line("car", f"Car: FOLLOWING (L:{int(last_track.left_speed)}, R:{int(last_track.right_speed)})", (10, 90), (0, 255, 0))
+                elif (last_track is not None and last_track.track_ok is False) or not vision.tracking:
                     print("[Car Control]: Tracking failed, returning to IDLE")
                     car_currentState = "IDLE"
-                    car_tracker = None
+                    if motor is not None:
+                        motor.pause()
+                    vision.stop_tracking()
+                    last_track = None
                     send_car_command("S")
+                else:
+                    # the first tracking result hasn't arrived yet
+                    hud.set_line("car", "Car: FOLLOWING (starting)", (10, 90), (0, 255, 0))
 
             elif car_currentState == "AVOIDING":
-                cv2.putText(frame, "Car: AVOIDING (Target too close!)", (10, 90), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                hud.set_line("car", "Car: AVOIDING (Target too close!)", (10, 90), (0, 0, 255))
                 send_car_command("S") 
                 
-                if car_tracker is not None:
-                    ok, bbox = car_tracker.update(frame)
-                    if ok:
+                if last_track is not None:
+                    if last_track.track_ok:
+                        bbox = last_track.track_bbox
                         box_area = bbox[2] * bbox[3]
                         if box_area < (max_safe_area * 0.8):
                             print("[Car Control]: State change: AVOIDING -> FOLLOWING")
                             car_currentState = "FOLLOWING"
                     else:
                         car_currentState = "IDLE" 
-                        car_tracker = None
+                        vision.stop_tracking()
+                        last_track = None
                         send_car_command("S")
 
             elif car_currentState == "SPINNING":
-                cv2.putText(frame, "Car: SPINNING", (10, 90), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
+                hud.set_line("car", "Car: SPINNING", (10, 90), (255, 0, 0))
                 send_car_command("R") 
 
             elif car_currentState == "IDLE":
-                cv2.putText(frame, "Car: IDLE (Press 'f' to select)", (10, 90), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
-            # --- 2. STRESS: Detection Logic (on the same frame) ---
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(50, 50))
-            
-            eyes_detected = False
-            detected_faces = [] 
-            detected_eyes = [] 
-
-            for (x, y, w, h) in faces:
-                detected_faces.append((x, y, w, h)) 
-                if w > 0:
-                    roi_gray = gray[y:y+h, x:x+w]
-                    eyes = eye_cascade.detectMultiScale(roi_gray, scaleFactor=1.1, minNeighbors=4, minSize=(20, 20))
-                    
-                    if len(eyes) > 0:
-                        eyes_detected = True
-                        for (ex, ey, ew, eh) in eyes:
-                            detected_eyes.append((x+ex, y+ey, ew, eh))
-                    break 
-            
-            if eyes_detected:
-                BLINK_COUNTER = 0
-            else:
-                BLINK_COUNTER += 1
-
-            if BLINK_COUNTER == EYE_AR_CONSEC_FRAMES:
-                current_minute_blinks += 1
+                hud.set_line("car", "Car: IDLE (Press 'f' to select)", (10, 90), (0, 255, 255))
 
+            # --- 2. STRESS: Blink rate -> stress level, once a minute ---
             elapsed_time = time.time() - minute_start_time
 
             if elapsed_time >= MINUTE_INTERVAL:
-                BLINK_RATE = current_minute_blinks
+                blink_rate = current_minute_blinks
                 
-                if BLINK_RATE < 12: 
-                    STRESS_LEVEL = "High Stress" 
-                elif BLINK_RATE > 25: 
-                    STRESS_LEVEL = "Moderate Stress"
+                if blink_rate < 12: 
+                    stress_level = "High Stress" 
+                elif blink_rate > 25: 
+                    stress_level = "Moderate Stress"
                 else:
-                    STRESS_LEVEL = "Normal"
+                    stress_level = "Normal"
+                
+                # Both values are published together in one snapshot
+                STATE.publish(stress_level=stress_level, blink_rate=blink_rate)
+                get_analytics().record_minute(stress_level, blink_rate)
                     
-                if STRESS_LEVEL != "Normal":
-                    save_stress_event(STRESS_LEVEL, BLINK_RATE)
+                if stress_level != "Normal":
+                    save_stress_event(stress_level, blink_rate)
                     
-                print(f"\n[Monitor]: 1-Min BPM: {BLINK_RATE} | Status: {STRESS_LEVEL}")
+                print(f"\n[Monitor]: 1-Min BPM: {blink_rate} | Status: {stress_level}")
                 current_minute_blinks = 0
                 minute_start_time = time.time()
 
             # --- 3. COMBINED Drawing logic ---
-            for (x, y, w, h) in detected_faces:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
-            for (x, y, w, h) in detected_eyes:
-                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+            if last_result is not None:
+                for (x, y, w, h) in last_result.faces:
+                    cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 0, 0), 2)
+                for (x, y, w, h) in last_result.eyes:
+                    cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
                 
+            snapshot = STATE.snapshot
             color = (0, 255, 0) # Green for Normal
-            if STRESS_LEVEL == "Moderate Stress":
+            if snapshot.stress_level == "Moderate Stress":
                 color = (0, 165, 255) # Orange
-            elif STRESS_LEVEL == "High Stress":
+            elif snapshot.stress_level == "High Stress":
                 color = (0, 0, 255) # Red
                 
-            cv2.putText(frame, f"Status: {STRESS_LEVEL}", (10, 30), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
-            cv2.putText(frame, f"Blink Rate (BPM): {BLINK_RATE}", (10, 60), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            # HUD lines are only re-rendered when their text changes
+            hud.set_line("status", f"Status: {snapshot.stress_level}", (10, 30), color)
+            hud.set_line("blink", f"Blink Rate (BPM): {snapshot.blink_rate}", (10, 60), (255, 255, 255))
 
             # --- NEW: Draw ECG Data ---
-            cv2.putText(frame, f"ECG Raw: {last_ecg_data}", (10, 120), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200, 200, 0), 2) 
+            hud.set_line("ecg", f"ECG Raw: {snapshot.ecg_raw}", (10, 120), (200, 200, 0))
+            if governor is not None:
+                hud.set_line("rate", f"Rate: {governor.mode}", (10, 150), (180, 180, 180), scale=0.6, thickness=1)
+            hud.apply(frame)
 
             # --- 4. Show the one, combined frame ---
-            cv2.imshow('Nexo Assistant and Car Control', frame)
+            with nexo_metrics.span("display"):
+                cv2.imshow('Nexo Assistant and Car Control', frame)
 
     except Exception as e:
         print(f"[ERROR - OpenCV]: Could not initialize camera or load cascades: {e}")
         print("[System]: Main video loop FAILED to start. Assistant will run without it.")
-        global_running_flag = False 
+        STATE.request_shutdown()
         return
     
     finally:
+        STATE.publish(car_state=car_currentState)
+        if vision is not None:
+            vision.close()
+        if governor is not None:
+            print(f"[Governor]: {governor.metrics()}")
+        if motor is not None:
+            motor.stop()
         if 'cap' in locals() and cap.isOpened():
             cap.release()
         cv2.destroyAllWindows()
         print("[System]: Main Video Loop Stopped.")
         
         print("[System]: Shutting down car...")
-        if car_serial_port and car_serial_port.is_open:
-            _send_command_to_serial("S") 
-            car_serial_port.close()
+        stop_car_and_close_port()
             
         print("[System]: Shutting down ECG...")
         if ecg_serial_port and ecg_serial_port.is_open:
             ecg_serial_port.close()
 
 
+# --- Speculative LLM calls (see USE_SPECULATIVE_LLM) ---
+def worth_speculating(text):
+    """Local intents and cached replies are instant anyway."""
+    if route_intent(text, browser_open=BROWSER_SESSION is not None and BROWSER_SESSION.is_open) or history_range(text):
+        return False
+    snapshot = STATE.snapshot
+    return get_response_cache().peek(text, snapshot.stress_level, snapshot.heart_rate,
+                                     response_cache_context(CHAT_HISTORY)) is None
+
+def speculative_reply(text, cancel):
+    """(Speculator worker) The LLM reply to a partial transcript, None when cancelled."""
+    nexo_metrics.inc("llm_speculative_requests")
+    history = CHAT_HISTORY + [{"role": "user", "parts": [{"text": text}]}]
+    return nexo_brain(history, STATE.snapshot, cancel)
+
+SPECULATOR = None
+if USE_SPECULATIVE_LLM and (SPECULATE_WITH_GOOGLE_PARTIALS or vosk_available(VOSK_MODEL_PATH)):
+    SPECULATOR = Speculator(speculative_reply, accept=worth_speculating)
+
+def report_llm_requests():
+    if SPECULATOR is not None and SPECULATOR.turns:
+        print(f"[Speculator]: {SPECULATOR.report()}")
+    if MODEL_MANAGER is not None:
+        print(f"[Ollama Manager]: {MODEL_MANAGER.report()}")
+
+def response_cache_context(history):
+    """Texts of the last RESPONSE_CACHE_CONTEXT_MESSAGES messages of `history` (keys cached follow-ups)."""
+    recent = history[-RESPONSE_CACHE_CONTEXT_MESSAGES:] if RESPONSE_CACHE_CONTEXT_MESSAGES else []
+    return [message['parts'][0]['text'] for message in recent]
+
 # --- Voice Assistant Loop Function ---
+def handle_user_input(user_input, browser):
+    """
+    One voice turn: route / think / act / speak.
+    Returns False when the assistant should shut down.
+    """
+    global CHAT_HISTORY
+
+    if any(phrase in user_input.lower() for phrase in ["goodbye nexo", "exit nexo", "shut down", "stop nexo"]):
+        response = "Understood. Shutting down now. Goodbye!"
+        speak(response)
+        STATE.request_shutdown()
+        return False
+        
+    cache_context = response_cache_context(CHAT_HISTORY)
+    CHAT_HISTORY.append({"role": "user", "parts": [{"text": user_input}]})
+    # One consistent view of the user's state for this whole turn
+    snapshot = STATE.snapshot
+    
+    # --- Fast path: known PC commands are resolved locally ---
+    response = route_intent(user_input, browser_open=browser is not None and browser.is_open)
+    if response:
+        nexo_metrics.inc("intent_hits")
+        print(f"[Intent Router]: Handled locally -> {response}")
+    else:
+        # --- Questions about past days get the analytics rollups (never cached: "yesterday" moves) ---
+        history = get_analytics().history_context(user_input)
+        if history:
+            print(f"[Analytics]: {history}")
+        # --- Repeated questions are answered from the response cache ---
+        # (exact repeats after the same previous exchange; never time/date questions)
+        cache = get_response_cache()
+        response = None if history else cache.get(user_input, snapshot.stress_level, snapshot.heart_rate, cache_context)
+        if response:
+            nexo_metrics.inc("cache_hits")
+            print(f"[Response Cache]: Hit -> {cache.stats()}")
+        else:
+            nexo_metrics.inc("cache_misses")
+            # --- Already asked while the user was speaking? ---
+            response = SPECULATOR.take() if SPECULATOR is not None else None
+            if response is not None:
+                nexo_metrics.inc("speculation_wins")
+                print("[Speculator]: Using the reply started from the partial transcript.")
+            else:
+                # --- THIS NOW CALLS THE ROUTER ---
+                response = nexo_brain(CHAT_HISTORY, snapshot, history=history)
+            if response and response not in BRAIN_ERROR_REPLIES and not history:
+                cache.put(user_input, snapshot.stress_level, snapshot.heart_rate, response, cache_context)
+    
+    if response:
+        if response.startswith("ACTION:"):
+            action_result = execute_pc_command(response, browser)
+            
+            if action_result == "EXIT":
+                STATE.request_shutdown()
+                return False
+                
+            CHAT_HISTORY.append({"role": "model", "parts": [{"text": response}]})
+            
+        else:
+            speak(response)
+            CHAT_HISTORY.append({"role": "model", "parts": [{"text": response}]})
+            save_chat_history()
+    else:
+        speak("I'm sorry, I had trouble processing that. Could you try again?")
+        if CHAT_HISTORY:
+            CHAT_HISTORY.pop() 
+    return True
+
+
 def voice_assistant_loop():
     """
     Runs the main voice assistant logic (listen, think, speak) in a thread.
     """
-    global global_running_flag, CHAT_HISTORY
-    
-    driver = None 
+    browser = BROWSER_SESSION
     
     try:
-        while global_running_flag:
+        greet()
+        while STATE.running:
             user_input = listen()
 
-            if not global_running_flag: 
+            if not STATE.running: 
                 break
 
-            if user_input:
-                if any(phrase in user_input.lower() for phrase in ["goodbye nexo", "exit nexo", "shut down", "stop nexo"]):
-                    response = "Understood. Shutting down now. Goodbye!"
-                    speak(response)
-                    global_running_flag = False
-                    break
-                    
-                CHAT_HISTORY.append({"role": "user", "parts": [{"text": user_input}]})
-                
-                # --- THIS NOW CALLS THE ROUTER ---
-                response = nexo_brain(CHAT_HISTORY, STRESS_LEVEL)
-                
-                if response:
-                    if response.startswith("ACTION:"):
-                        action_result = execute_pc_command(response, driver)
-                        
-                        if action_result == "EXIT":
-                            global_running_flag = False 
-                            driver = None 
-                            break
-                        else:
-                            driver = action_result 
-                            
-                        CHAT_HISTORY.append({"role": "model", "parts": [{"text": response}]})
-                        
-                    else:
-                        speak(response)
-                        CHAT_HISTORY.append({"role": "model", "parts": [{"text": response}]})
-                        save_chat_history()
-                else:
-                    speak("I'm sorry, I had trouble processing that. Could you try again?")
-                    if CHAT_HISTORY:
-                        CHAT_HISTORY.pop() 
-            else:
-                pass 
+            if user_input and not handle_user_input(user_input, browser):
+                break
                 
     except KeyboardInterrupt:
         print("\n[System]: Shutdown initiated by user (Ctrl+C).")
         speak("Shutting down. Goodbye!")
-        global_running_flag = False
+        STATE.request_shutdown()
     
     finally:
-        if driver:
-            print("[System]: Voice assistant shutting down, closing browser...")
-            driver.quit()
+        print("[System]: Voice assistant shutting down, closing browser...")
+        browser.shutdown(wait=False)
+        report_llm_requests()
     
     print("[System]: Voice Assistant loop stopped.")
 
 
+# --- ASYNC RUNTIME (one event loop for every subsystem, see nexo_runtime.py) ---
+SUPERVISOR = Supervisor()
+
+async def ecg_reader_task():
+    """ECG serial reader. Uses pyserial-asyncio when installed, else the blocking reader on a thread."""
+    try:
+        import serial_asyncio
+    except ImportError:
+        serial_asyncio = None
+
+    if serial_asyncio is None:
+        if not await SUPERVISOR.run_blocking(startup_result, "ecg_serial", init_ecg_serial):
+            raise IOError(f"Could not open ECG port {ECG_SERIAL_PORT}")
+        await SUPERVISOR.run_blocking(ecg_data_reader_thread)
+        return
+
+    try:
+        reader, writer = await serial_asyncio.open_serial_connection(url=ECG_SERIAL_PORT, baudrate=ECG_BAUD_RATE)
+    except serial.SerialException:
+        STATE.publish(ecg_raw="Disconnected")
+        raise
+    print(f"[ECG Monitor]: Successfully connected to ECG on {ECG_SERIAL_PORT} (asyncio)")
+    STATE.publish(ecg_raw="Connected")
+    try:
+        while STATE.running:
+            line = await reader.readline()
+            if not line:
+                # EOF (device unplugged): readline() would return b'' forever
+                if not STATE.running:
+                    break
+                raise IOError(f"ECG port {ECG_SERIAL_PORT} closed")
+            try:
+                handle_ecg_line(line)
+            except UnicodeDecodeError:
+                pass
+    finally:
+        writer.close()
+        print("[ECG Monitor]: ECG reader task stopped.")
+
+async def voice_task():
+    """Listen -> think -> speak. STT, the LLM call and TTS run on daemon threads."""
+    await SUPERVISOR.run_blocking(greet)
+    while STATE.running:
+        user_input = await SUPERVISOR.run_blocking(listen)
+        if not STATE.running:
+            break
+        if user_input and not await SUPERVISOR.run_blocking(handle_user_input, user_input, BROWSER_SESSION):
+            break
+    report_llm_requests()
+
+async def video_task():
+    """The OpenCV video + car loop, bridged in through run_in_executor."""
+    await SUPERVISOR.run_blocking(main_video_and_car_loop)
+
+def on_runtime_stop():
+    """Supervisor stop path: the car stops first, whatever the video thread is doing."""
+    STATE.request_shutdown()
+    stop_car_and_close_port()
+    stop_model_manager()
+
+def stop_model_manager():
+    """Cancels queued/running LLM requests and ends the keep-alive pings."""
+    if MODEL_MANAGER is not None:
+        MODEL_MANAGER.stop()
+
+async def run_nexo_async():
+    """Starts every subsystem under the supervisor and waits for shutdown."""
+    SUPERVISOR.add("voice", voice_task, restart=RESTART_ON_FAILURE, backoff_sec=1.0)
+    SUPERVISOR.add("ecg", ecg_reader_task, restart=RESTART_ON_FAILURE, max_restarts=3, backoff_sec=2.0)
+    # Once STATE.running goes False the video loop releases the camera, joins
+    # the motor thread and closes the ECG port in its finally; its daemon
+    # thread dies at exit, so wait for it (cap.release and the motor join
+    # can take a while) before cancelling.
+    SUPERVISOR.add("video", video_task, restart=RESTART_NEVER, critical=True, grace_sec=VIDEO_STOP_GRACE_SEC)
+
+    await SUPERVISOR.run(stop_when=lambda: not STATE.running, on_stop=on_runtime_stop)
+
+
 # --- MAIN EXECUTION (MODIFIED) ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Nexo assistant, car controller and stress monitor")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print import/init times per subsystem and the time to first listen")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record per-stage spans and write a Chrome trace JSON here on exit")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    cli_args = parser.parse_args()
+    PROFILE_STARTUP = cli_args.profile_startup
+    if cli_args.trace or cli_args.metrics_port:
+        nexo_metrics.enable(trace_path=cli_args.trace, http_port=cli_args.metrics_port)
+
+    # 0. Camera, serial ports, LLM check, TTS and microphone all start now, in parallel
+    start_subsystems()
+    if USE_STREAM_SERVER:
+        STREAM = BiometricStreamServer(port=STREAM_SERVER_PORT, allowed_origins=STREAM_ALLOWED_ORIGINS)
+        if STREAM.start():
+            STREAM.follow_state(STATE)
+        else:
+            print("="*50)
+            print(f"WARNING: Live streaming is OFF, port {STREAM_SERVER_PORT} is in use (ECGFEELU.py?).")
+            print("Set NEXO_STREAM_PORT to another port to stream from both.")
+            print("="*50)
+            STREAM = None
+    STARTUP_PROFILE.mark("subsystems_started")
     
     # 1. Check if we are using Gemini and if the key is missing
     if not USE_OLLAMA and (not GEMINI_API_KEY or GEMINI_API_KEY == "YOUR_NEW_API_KEY_GOES_HERE"):
@@ -889,22 +1446,39 @@ if __name__ == "__main__":
          print(f"Using model: {OLLAMA_MODEL}")
          print(">>> Make sure your Ollama server is running! <<<")
          print("="*50)
+         # Load the model now, in the background, and keep it loaded
+         MODEL_MANAGER = OllamaModelManager(OLLAMA_API_URL, OLLAMA_MODEL, max_concurrent=OLLAMA_MAX_CONCURRENT)
+         MODEL_MANAGER.start()
 
-    # 2. Check for WebDriver
+    # 2. WebDriver: a chromedriver.exe next to this file is used if present,
+    # otherwise Selenium Manager finds (or downloads) a matching driver.
     if not os.path.exists(DRIVER_PATH):
-        print("="*50)
-        print(f"ERROR: ChromeDriver not found at {DRIVER_PATH}")
-        print("Please download chromedriver.exe and place it in the same folder.")
-        print("Web automation features will be disabled.")
-        print("="*50)
+        print(f"[System]: No ChromeDriver at {DRIVER_PATH}; Selenium will find a matching driver.")
         
+    # 2b. Start Chrome in the background so the first "open" is instant
+    BROWSER_SESSION = BrowserSession(DRIVER_PATH if os.path.exists(DRIVER_PATH) else None,
+                                     on_navigate=ELEMENT_RESOLVER.clear)
+    BROWSER_SESSION.prelaunch()
+
     # 3. Load chat history on startup
     CHAT_HISTORY = load_chat_history()
 
-    # 4. Initial greeting
+    # 4. Async runtime: every subsystem under one event loop
+    if USE_ASYNC_RUNTIME:
+        print("[System]: Initializing Nexo (asyncio runtime)...")
+        try:
+            asyncio.run(run_nexo_async())
+        except KeyboardInterrupt:
+            print("\n[System]: Shutdown initiated by user (Ctrl+C).")
+            on_runtime_stop()
+        BROWSER_SESSION.shutdown(wait=False)
+        if PROFILE_STARTUP:
+            print(STARTUP_PROFILE.report())
+        print("[System]: Shutdown complete.")
+        sys.exit(0)
+
+    # 4. Threaded runtime (the voice thread greets the user itself)
     print("[System]: Initializing Nexo...")
-    speak("Hello! I am Nexo, your personal assistant. I am also initializing the car controller and stress monitor. How can I help you today?")
-    time.sleep(2) 
 
     # 5. Start the voice assistant in a separate daemon thread
     print("[System]: Starting Voice Assistant Thread...")
@@ -913,7 +1487,7 @@ if __name__ == "__main__":
     
     # 6. Start the ECG Monitor Thread
     print("[System]: Starting ECG Monitor Thread...")
-    if init_ecg_serial(): 
+    if startup_result("ecg_serial", init_ecg_serial): 
         ecg_thread = threading.Thread(target=ecg_data_reader_thread, daemon=True)
         ecg_thread.start()
         print("[System]: ECG Monitor thread started.")
@@ -925,6 +1499,9 @@ if __name__ == "__main__":
 
     # Main thread has finished (video loop exited)
     print("[System]: Main thread finished. Nexo assistant shutting down.")
-    global_running_flag = False 
-    voice_thread.join(timeout=2)  
+    STATE.request_shutdown()
+    stop_model_manager()
+    voice_thread.join(timeout=2)
+    if PROFILE_STARTUP:
+        print(STARTUP_PROFILE.report())  
     print("[System]: Shutdown complete.") 
\ No newline at end of file
@@ -0,0 +1,57 @@
+from nexo_element_resolver import INDEX_SCRIPT, STATE_SCRIPT, ElementResolver
+
+
+class FakeDriver:
+    """Runs the resolver's scripts against fake documents; navigate() loads a new one."""
+
+    def __init__(self):
+        self.documents = 0
+        self.navigate()
+
+    def navigate(self, entries=None):
+        self.documents += 1
+        self.token = None      # set by the index script, like window.__nexoDoc
+        self.dirty = True
+        self.entries = entries or [[0, "Search", "", "search-button", "button", ""]]
+
+    def execute_script(self, script, *args):
+        if script == STATE_SCRIPT:
+            return [self.token, self.dirty]
+        if script == INDEX_SCRIPT:
+            self.token = self.token or f"doc{self.documents}"
+            self.dirty = False
+            return [self.token, self.entries]
+        return f"element {args[0]} of {self.token}"
+
+
+def test_index_is_reused_on_the_same_document():
+    driver, resolver = FakeDriver(), ElementResolver()
+    assert resolver.find(driver, "search") == "element 0 of doc1"
+    resolver.find(driver, "search")
+    assert resolver.metrics["index_builds"] == 1
+    assert resolver.metrics["index_reuses"] == 1
+
+
+def test_reload_of_the_same_url_rebuilds_the_index():
+    driver, resolver = FakeDriver(), ElementResolver()
+    resolver.find(driver, "search")
+    driver.navigate([[0, "Play", "", "", "button", ""]])
+    assert resolver.find(driver, "play") == "element 0 of doc2"
+    assert resolver.metrics["index_builds"] == 2
+
+
+def test_cache_is_capped_least_recently_used_first():
+    driver, resolver = FakeDriver(), ElementResolver(max_documents=2)
+    for _ in range(5):
+        resolver.find(driver, "search")
+        driver.navigate()
+    assert len(resolver._cache) == 2
+    assert resolver.metrics["evictions"] == 3
+
+
+def test_clear_forgets_every_document():
+    driver, resolver = FakeDriver(), ElementResolver()
+    resolver.find(driver, "search")
+    resolver.clear()
+    resolver.find(driver, "search")
+    assert resolver.metrics["index_builds"] == 2
@@ -0,0 +1,65 @@
+import pytest
+
+from nexo_intent import route_intent
+
+
+@pytest.mark.parametrize("utterance", [
+    "tap water or bottled water which is better",
+    "press releases are boring",
+    "press the issue with your manager",
+    "tap into your inner calm",
+    "click bait headlines are really annoying these days",
+    "tell me what to click on to sign up for a course",
+])
+def test_conversational_sentences_go_to_the_llm(utterance):
+    assert route_intent(utterance, browser_open=True) is None
+    assert route_intent(utterance, browser_open=False) is None
+
+
+@pytest.mark.parametrize("utterance, action", [
+    ("click search", "ACTION: CLICK search"),
+    ("click on the play button", "ACTION: CLICK play"),
+    ("press the accept all button", "ACTION: CLICK accept all"),
+    ("Hey Nexo, tap the sign in button", "ACTION: CLICK sign in"),
+])
+def test_click_commands_with_a_browser_open(utterance, action):
+    assert route_intent(utterance, browser_open=True) == action
+
+
+@pytest.mark.parametrize("utterance", ["click search", "press the accept all button"])
+def test_click_commands_need_an_open_browser(utterance):
+    assert route_intent(utterance) is None
+
+
+def test_click_target_is_at_most_four_words():
+    assert route_intent("click the big red subscribe button now please", browser_open=True) is None
+
+
+@pytest.mark.parametrize("utterance, action", [
+    ("open youtube", "ACTION: OPEN YOUTUBE"),
+    ("close the browser", "ACTION: CLOSE BROWSER"),
+    ("play the song shape of you", "ACTION: SPOTIFY_PLAY shape of you"),
+])
+def test_other_commands_dont_need_a_browser(utterance, action):
+    assert route_intent(utterance) == action
+
+
+@pytest.mark.parametrize("utterance", [
+    "don't open youtube",
+    "i don't want to watch youtube",
+    "never close the browser",
+    "how do i close the browser",
+    "should i play some nature sounds",
+    "tell me about nature sounds on spotify",
+])
+def test_negations_and_questions_are_not_commands(utterance):
+    assert route_intent(utterance) is None
+
+
+@pytest.mark.parametrize("utterance, action", [
+    ("Hey Nexo, can you open youtube please?", "ACTION: OPEN YOUTUBE"),
+    ("i want to watch youtube", "ACTION: OPEN YOUTUBE"),
+    ("get rid of the browser", "ACTION: CLOSE BROWSER"),
+])
+def test_tfidf_still_catches_other_wordings(utterance, action):
+    assert route_intent(utterance) == action
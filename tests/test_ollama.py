@@ -0,0 +1,29 @@
+import threading
+
+from nexo_ollama import PRIORITY_SPECULATIVE, OllamaModelManager
+
+
+def test_job_cancelled_while_queued_is_never_run():
+    manager = OllamaModelManager("http://127.0.0.1:9", "stub")
+    worker = threading.Thread(target=manager._worker, daemon=True)
+    worker.start()
+    release, started, calls = threading.Event(), threading.Event(), []
+
+    def busy(token):
+        started.set()
+        release.wait(5)
+        return "reply"
+
+    first = manager.submit(busy)
+    started.wait(5)
+    cancel = threading.Event()
+    stale = manager.submit(lambda token: calls.append("ran"), PRIORITY_SPECULATIVE, cancel=cancel)
+    cancel.set()
+    release.set()
+
+    assert first.result(5) == "reply"
+    assert stale.result(5) is None
+    assert calls == []
+    assert manager.stats["skipped"] == 1
+    manager.stop()
+    worker.join(5)
@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from nexo_response_cache import ResponseCache, is_cacheable
+
+STATE = ("Normal", 72)
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(path=None)
+    cache.put("what is 12 times 13", *STATE, "156")
+    return cache
+
+
+def test_exact_repeat_hits(cache):
+    assert cache.get("What is 12 times 13?", *STATE) == "156"
+
+
+@pytest.mark.parametrize("prompt", ["what is 12 times 14", "what is 13 times 12", "what is 2 times 13"])
+def test_different_numbers_miss(cache, prompt):
+    assert cache.get(prompt, *STATE) is None
+
+
+@pytest.mark.parametrize("prompt", ["what is 12 times 14", "what is 13 times 12", "what is 2 times 13"])
+def test_different_numbers_miss_with_semantic_lookup(prompt):
+    cache = ResponseCache(path=None, similarity=0.8)
+    cache.put("what is 12 times 13", *STATE, "156")
+    assert cache.get(prompt, *STATE) is None
+
+
+def test_different_names_miss_with_semantic_lookup():
+    cache = ResponseCache(path=None, similarity=0.6)
+    cache.put("Tell me about Paris", *STATE, "Paris is the capital of France.")
+    assert cache.get("Tell me about London", *STATE) is None
+
+
+def test_near_identical_wording_hits_with_semantic_lookup():
+    cache = ResponseCache(path=None, similarity=0.9)
+    cache.put("give me a breathing exercise", *STATE, "Breathe in for four seconds...")
+    assert cache.get("give me a breathing exercise please", *STATE) == "Breathe in for four seconds..."
+
+
+@pytest.mark.parametrize("prompt", ["what time is it now", "what's the date today", "what day is it",
+                                    "what's the weather like", "any news this morning"])
+def test_moment_dependent_prompts_are_never_cached(prompt):
+    cache = ResponseCache(path=None)
+    cache.put(prompt, *STATE, "It is 3pm")
+    assert not is_cacheable(prompt)
+    assert cache.get(prompt, *STATE) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_follow_up_only_hits_after_the_same_exchange():
+    cache = ResponseCache(path=None)
+    tea = ["tell me about green tea", "Green tea is rich in antioxidants."]
+    cache.put("tell me more", *STATE, "It also contains L-theanine.", context=tea)
+    assert cache.get("tell me more", *STATE, context=tea) == "It also contains L-theanine."
+    assert cache.get("tell me more", *STATE, context=["tell me about rome", "Rome is in Italy."]) is None
+    assert cache.get("tell me more", *STATE) is None
+
+
+def test_repeat_question_hits_after_other_turns():
+    cache = ResponseCache(path=None)
+    calm = "what is a good way to calm down"
+    cache.put(calm, *STATE, "Try slow breathing.", context=[])
+    assert cache.get("tell me something nice", *STATE, context=[calm, "Try slow breathing."]) is None
+    cache.put("tell me something nice", *STATE, "You're doing great.", context=[calm, "Try slow breathing."])
+    later = ["tell me something nice", "You're doing great."]
+    assert cache.get(calm, *STATE, context=later) == "Try slow breathing."
+
+
+def test_other_biometric_state_misses(cache):
+    assert cache.get("what is 12 times 13", "High Stress", 120) is None
+
+
+def test_entries_saved_without_context_are_dropped_on_load(tmp_path):
+    path = tmp_path / "response_cache.json"
+    path.write_text(json.dumps({"entries": [
+        {"prompt": "tell me more", "bucket": "Normal|60", "response": "old reply", "created": 1e12},
+    ]}))
+    cache = ResponseCache(path=str(path))
+    assert cache.get("tell me more", *STATE) is None
+
+
+def test_saved_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "response_cache.json")
+    ResponseCache(path=path).put("what is 12 times 13", *STATE, "156")
+    assert ResponseCache(path=path).get("what is 12 times 13", *STATE) == "156"
+
+
+def test_peek_answers_like_get_without_counting(cache):
+    assert cache.peek("what is 12 times 13", *STATE) == "156"
+    assert cache.peek("what is 12 times 14", *STATE) is None
+    stats = cache.stats()
+    assert stats["exact_hits"] == stats["misses"] == 0
+
+
+def test_peek_keeps_the_lru_order():
+    cache = ResponseCache(path=None, max_entries=2)
+    cache.put("what is 1 plus 1", *STATE, "2")
+    cache.put("what is 2 plus 2", *STATE, "4")
+    cache.peek("what is 1 plus 1", *STATE)
+    cache.put("what is 3 plus 3", *STATE, "6")
+    assert cache.get("what is 1 plus 1", *STATE) is None
+    assert cache.get("what is 2 plus 2", *STATE) == "4"
@@ -0,0 +1,13 @@
+from nexo_speculative import GooglePartials, partial_transcriber, vosk_available
+
+
+def test_no_vosk_model_means_no_partials_by_default(tmp_path):
+    missing = str(tmp_path / "no-model")
+    assert not vosk_available(missing)
+    assert partial_transcriber(object(), object(), 16000, 2, missing) is None
+
+
+def test_google_partials_are_opt_in(tmp_path):
+    partials = partial_transcriber(object(), object(), 16000, 2, str(tmp_path / "no-model"), allow_google=True)
+    assert isinstance(partials, GooglePartials)
+    partials.close()
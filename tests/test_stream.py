@@ -0,0 +1,52 @@
+import socket
+import struct
+
+import pytest
+
+from nexo_stream import MAX_CLIENT_FRAME, BiometricStreamServer
+
+DASHBOARD = "https://dashboard.example"
+
+
+@pytest.fixture
+def server():
+    server = BiometricStreamServer(port=0, allowed_origins=[DASHBOARD])
+    assert server.start()
+    yield server
+    server.stop()
+
+
+def request(server, path, host, origin=None, extra=""):
+    sock = socket.create_connection(("127.0.0.1", server.port), timeout=5)
+    head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n" + (f"Origin: {origin}\r\n" if origin else "") + extra
+    sock.sendall((head + "\r\n").encode())
+    return sock, sock.recv(4096).split(b"\r\n", 1)[0]
+
+
+@pytest.mark.parametrize("host, origin, status", [
+    ("127.0.0.1:{port}", None, b"200"),
+    ("localhost:{port}", DASHBOARD, b"200"),
+    ("[::1]:{port}", None, b"200"),
+    ("attacker.example:{port}", None, b"403"),     # DNS rebinding: same origin, so no Origin header
+    ("127.0.0.1:1", None, b"403"),
+    ("127.0.0.1:{port}", "https://evil.example", b"403"),
+])
+def test_status_needs_a_local_host_and_an_allowed_origin(server, host, origin, status):
+    sock, line = request(server, "/status", host.format(port=server.port), origin)
+    sock.close()
+    assert status in line
+
+
+def test_oversized_client_frame_closes_the_websocket(server):
+    upgrade = "Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: dGhlIHNhbXBsZSBub25jZQ==\r\n"
+    sock, line = request(server, "/ws", f"127.0.0.1:{server.port}", extra=upgrade)
+    assert b"101" in line
+    sock.sendall(struct.pack("!BBQ", 0x81, 0xFF, MAX_CLIENT_FRAME + 1) + bytes(4))
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    sock.close()
+    assert b"\x88\x02\x03\xf1" in data      # close frame, code 1009
@@ -0,0 +1,39 @@
+import pytest
+
+nexo_tracking = pytest.importorskip("nexo_tracking", exc_type=ImportError)   # needs cv2
+
+
+class FixedPredictor:
+    def __init__(self, bbox):
+        self.bbox = bbox
+
+    def predict(self, timestamp):
+        return self.bbox
+
+
+def make_loop(bbox, dead_zone=0):
+    sent = []
+    pid = nexo_tracking.PIDController(0.5, ki=0.1)
+    loop = nexo_tracking.MotorControlLoop(FixedPredictor(bbox), sent.append, 320, 150, pid, dead_zone=dead_zone)
+    return loop, sent
+
+
+def test_stale_prediction_stops_the_car_once():
+    loop, sent = make_loop((400, 100, 80, 80))
+    loop._tick(0.0)
+    loop.predictor.bbox = None
+    loop._tick(0.1)
+    loop._tick(0.2)
+    assert sent[1:] == ["S"]
+    assert loop.last_command == "S"
+    assert loop.pid.integral == 0.0
+
+
+def test_dead_zone_does_not_wind_up_the_integral():
+    loop, sent = make_loop((400, 100, 80, 80), dead_zone=30)
+    loop._tick(0.0)
+    assert loop.pid.integral != 0.0
+    loop.predictor.bbox = (285, 100, 80, 80)     # 5 px off centre
+    loop._tick(0.1)
+    assert loop.pid.integral == 0.0
+    assert sent[-1] == "M,150,150"